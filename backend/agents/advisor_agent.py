@@ -17,6 +17,8 @@ from dotenv import load_dotenv
 from groq import Groq
 from langchain_core.messages import AIMessage
 from graph.state import AgentState
+from graph.state_update import StateUpdate
+from utils.offer_optimizer import format_counter_offers
 
 # Load environment variables
 load_dotenv()
@@ -48,7 +50,7 @@ class AdvisorAgent:
         credit_score = state.get("credit_score", "unknown")
         rejection_reason = state.get("rejection_reason", "Unknown")
         customer_name = state.get("customer_name", "User")
-        requested_amount = state.get("requested_loan_amount", "N/A")
+        requested_amount = state.get("requested_loan_amount") or 0
         
         prompt = f"""You are a friendly financial advisor helping someone improve their financial health.
 
@@ -85,7 +87,7 @@ Be empathetic, practical, and specific. Include estimated credit score improveme
         Generate debt consolidation suggestions if applicant has existing loans
         """
         current_loans = state.get("current_loan_details")
-        monthly_salary = state.get("monthly_salary", 0)
+        monthly_salary = state.get("monthly_salary") or 0
         customer_name = state.get("customer_name", "User")
         
         if not current_loans:
@@ -125,10 +127,18 @@ Be encouraging but realistic about the process."""
         """
         Suggest alternative loan products or financial solutions
         """
-        requested_amount = state.get("requested_loan_amount", 0)
+        requested_amount = state.get("requested_loan_amount") or 0
         credit_score = state.get("credit_score", 0)
-        monthly_salary = state.get("monthly_salary", 0)
+        monthly_salary = state.get("monthly_salary") or 0
         customer_name = state.get("customer_name", "User")
+        counter_offers = state.get("counter_offers")
+        
+        if counter_offers:
+            smaller_loan = f"""1. One of these pre-computed personal loan offers they already qualify for
+   (quote the figures exactly, do not invent other amounts):
+{format_counter_offers(counter_offers)}"""
+        else:
+            smaller_loan = "1. Smaller personal loan with lower amount"
         
         prompt = f"""You are a financial product advisor at CredSaathi.
 
@@ -138,7 +148,7 @@ Credit Score: {credit_score}
 Monthly Salary: ₹{monthly_salary:,.0f}
 
 Suggest 2-3 alternative financial products or solutions they might qualify for:
-1. Smaller personal loan with lower amount
+{smaller_loan}
 2. Secured loan options (gold, property-backed)
 3. Group lending or peer-to-peer options
 4. Government schemes they might be eligible for
@@ -220,18 +230,20 @@ We're here to support your financial journey. You've got this! 💪"""
     def process_post_rejection_guidance(self, state: Dict) -> Dict:
         """
         Main advisor process for rejected applicants.
-        Generates comprehensive guidance and updates state.
+        Generates comprehensive guidance; returns the state update.
         """
         
         # Only process if application was rejected
         if state.get("loan_status") != "rejected":
-            return state
+            return {}
+        
+        state = StateUpdate(state)
         
         # Generate comprehensive guidance
         guidance = self.generate_comprehensive_guidance(state)
         
         # Add guidance to chat messages
-        state["messages"].append(AIMessage(content=guidance))
+        state.add_message(AIMessage(content=guidance))
         
         # Store advisor recommendations in state
         state["advisor_guidance_provided"] = True
@@ -245,11 +257,11 @@ We're here to support your financial journey. You've got this! 💪"""
         state["current_agent"] = "advisor"
         state["workflow_complete"] = True
         
-        return state
+        return state.changes()
 
 
 # Main advisor agent node for workflow
-def advisor_agent_node(state: AgentState) -> AgentState:
+def advisor_agent_node(state: AgentState) -> dict:
     """
     Financial advisor node for LangGraph workflow.
     Triggers after rejection to provide coaching and guidance.
@@ -9,15 +9,24 @@ Fraud Detection Rules:
 3. Document mismatch: KYC name ≠ Salary slip extracted name
 4. Duplicate applications: Same phone across multiple rejections
 5. Suspicious patterns: Fake address, inconsistent credit history
+6. Fraud rings: Clusters of applicants sharing addresses or employers
+7. Document reuse: The same salary slip file (by SHA-256) submitted by another customer
 """
 
-from typing import Dict
+from typing import Dict, Optional
+from pathlib import Path
 import json
 import os
+import threading
 from dotenv import load_dotenv
 from groq import Groq
 from langchain_core.messages import AIMessage
 from graph.state import AgentState
+from graph.state_update import StateUpdate
+from utils.fraud_ring import FraudRingIndex
+from utils.policy import CompiledPolicy, policy_for
+from utils.shadow import shadow_evaluator
+from utils.slip_store import slip_store
 
 # Load environment variables
 load_dotenv()
@@ -37,6 +46,28 @@ fraud_database = {
     "suspicious_addresses": set()
 }
 
+# Entity-link graph over applications, rebuilt from the history log on first use
+FRAUD_HISTORY_PATH = Path(__file__).parent.parent / "data" / "fraud_history" / "applications.jsonl"
+fraud_ring_index: Optional[FraudRingIndex] = None
+_fraud_ring_lock = threading.Lock()
+
+# A cluster is a ring once it has this many applicants and this share of rejections
+FRAUD_RING_MIN_SIZE = 3
+FRAUD_RING_MIN_REJECTION_RATE = 0.5
+
+
+def get_fraud_ring_index() -> FraudRingIndex:
+    """
+    Fraud ring index, replaying the history log the first time it is needed,
+    so importers that never check rings (e.g. batch re-scoring) skip the replay.
+    """
+    global fraud_ring_index
+    if fraud_ring_index is None:
+        with _fraud_ring_lock:
+            if fraud_ring_index is None:
+                fraud_ring_index = FraudRingIndex.rebuild(FRAUD_HISTORY_PATH)
+    return fraud_ring_index
+
 
 class FraudAgent:
     """
@@ -44,8 +75,9 @@ class FraudAgent:
     Implements compliance-grade fraud checks for loan applications
     """
     
-    def __init__(self) -> None:
-        self.client = Groq(api_key=_get_api_key())
+    def __init__(self, use_llm: bool = True) -> None:
+        # Batch re-scoring runs without an LLM client (alerts fall back to plain text)
+        self.client = Groq(api_key=_get_api_key()) if use_llm else None
         self.fraud_checks = {
             "salary_anomalies": [],
             "document_mismatches": [],
@@ -123,12 +155,18 @@ class FraudAgent:
         """
         mismatches = []
         
-        kyc_name = state.get("customer_name", "").lower().strip()
-        kyc_phone = state.get("phone", "")
-        kyc_address = state.get("verified_address", "").lower().strip()
+        kyc_name = (state.get("customer_name") or "").lower().strip()
+        slip = state.get("salary_slip") or {}
+        slip_name = (slip.get("employee_name") or "").lower().strip()
         
-        # Note: In real implementation, we'd extract name from salary slip OCR
-        # For now, this is a placeholder structure
+        # Names match when they share a word ("Priya Sharma" / "Sharma Priya K")
+        if kyc_name and slip_name and not set(kyc_name.split()) & set(slip_name.split()):
+            mismatches.append({
+                "type": "name_mismatch",
+                "message": f"Salary slip is issued to '{slip['employee_name']}', KYC name is '{state['customer_name']}'.",
+                "severity": "medium",
+                "action": "manual_review"
+            })
         
         return {
             "mismatches": mismatches,
@@ -189,6 +227,60 @@ class FraudAgent:
             "has_patterns": len(patterns) > 0
         }
     
+    def detect_document_reuse(self, state: Dict, live: bool = True) -> Dict:
+        """
+        Detect if the uploaded salary slip (same content hash) was also
+        submitted by other customers. live=False uses the count recorded at
+        upload time (salary_slip_reuse_count) instead of the slip store,
+        which keeps growing after the application.
+        """
+        if live:
+            digest = state.get("salary_slip_hash")
+            other_customers = slip_store.other_customers(digest, state.get("phone", "")) if digest else 0
+        else:
+            other_customers = state.get("salary_slip_reuse_count") or 0
+        is_reused = other_customers > 0
+        
+        return {
+            "is_reused": is_reused,
+            "other_customers": other_customers,
+            "message": f"This salary slip document was also submitted by {other_customers} other customer(s)." if is_reused else None,
+            "severity": "high" if is_reused else "low"
+        }
+    
+    def link_application(self, state: Dict) -> Dict:
+        """
+        Add the application to the fraud ring graph, linking it to earlier
+        applications that share an address or employer (from the salary slip).
+        """
+        slip = state.get("salary_slip") or {}
+        return get_fraud_ring_index().add_application(
+            state.get("phone", ""),
+            {
+                "address": state.get("verified_address"),
+                "employer": slip.get("employer"),
+            }
+        )
+    
+    def detect_fraud_ring(self, state: Dict) -> Dict:
+        """
+        Detect if the applicant belongs to a cluster of linked applications
+        with a high share of rejections.
+        Flags if cluster has 3+ applicants and 50%+ of them were rejected.
+        """
+        signal = get_fraud_ring_index().cluster_signal(state.get("phone", ""))
+        is_ring = (
+            signal["cluster_size"] >= FRAUD_RING_MIN_SIZE
+            and signal["cluster_rejection_rate"] >= FRAUD_RING_MIN_REJECTION_RATE
+        )
+        
+        return {
+            **signal,
+            "is_fraud_ring": is_ring,
+            "message": f"Applicant linked to {signal['cluster_size']} applications sharing address/employer details, {signal['cluster_rejection_rate']:.0%} of them rejected." if is_ring else None,
+            "severity": "high" if is_ring else "low"
+        }
+    
     def calculate_fraud_risk_score(self, state: Dict) -> float:
         """
         Calculate overall fraud risk score (0-100).
@@ -196,6 +288,21 @@ class FraudAgent:
         30-60: Medium risk ⚠️ (manual review)
         60-100: High risk ✗ (reject)
         """
+        return self.assess(state)["fraud_risk_score"]
+    
+    def assess(self, state: Dict, include_fraud_ring: bool = True, policy: CompiledPolicy = None,
+               live_document_reuse: bool = True) -> Dict:
+        """
+        Run every deterministic fraud check once and score the application.
+        Makes no LLM calls and does not modify state, so batch re-scoring can reuse it.
+        Batch re-scoring turns off the checks that read live, growing stores
+        (fraud ring graph, slip store links), so a historical application is
+        only scored on what was known when it was made.
+        
+        Returns:
+            Dictionary with fraud_risk_score, fraud_flags, fraud_detected,
+            ring_check and the loan_status the fraud layer routes to
+        """
         risk_score = 0.0
         
         # Salary anomalies (40 points max)
@@ -215,12 +322,61 @@ class FraudAgent:
         pattern_check = self.detect_suspicious_patterns(state)
         risk_score += len(pattern_check["patterns"]) * 10
         
-        return min(risk_score, 100.0)
+        # Salary slip reused across customers (20 points max)
+        reuse_check = self.detect_document_reuse(state, live=live_document_reuse)
+        if reuse_check["is_reused"]:
+            risk_score += 20
+        
+        # Fraud ring membership (20 points max)
+        if include_fraud_ring:
+            ring_check = self.detect_fraud_ring(state)
+        else:
+            ring_check = {"cluster_size": None, "cluster_rejection_rate": None, "is_fraud_ring": False}
+        if ring_check["is_fraud_ring"]:
+            risk_score += 20
+        
+        fraud_risk = min(risk_score, 100.0)
+        
+        # Aggregate all fraud findings
+        all_fraud_flags = (
+            salary_check["anomalies"] +
+            doc_check["mismatches"] +
+            ([] if not dup_check["is_repeat_applicant"] else [{
+                "type": "duplicate_application",
+                "message": dup_check["message"],
+                "severity": dup_check["severity"],
+                "action": "manual_review"
+            }]) +
+            pattern_check["patterns"] +
+            ([] if not reuse_check["is_reused"] else [{
+                "type": "document_reuse",
+                "message": reuse_check["message"],
+                "severity": reuse_check["severity"],
+                "action": "manual_review"
+            }]) +
+            ([] if not ring_check["is_fraud_ring"] else [{
+                "type": "fraud_ring",
+                "message": ring_check["message"],
+                "severity": ring_check["severity"],
+                "action": "manual_review"
+            }])
+        )
+        
+        return {
+            "fraud_risk_score": fraud_risk,
+            "fraud_flags": all_fraud_flags,
+            "fraud_detected": len(all_fraud_flags) > 0,
+            "ring_check": ring_check,
+            "loan_status": decide_fraud_status(fraud_risk, state.get("loan_status"), policy or policy_for(state))
+        }
     
     def generate_fraud_alert(self, state: Dict, fraud_flags: list, fraud_risk: float) -> str:
         """
         Generate professional fraud alert using Groq LLM
         """
+        if self.client is None:
+            return f"Fraud alert: Risk score {fraud_risk:.0f}/100. Manual review recommended."
+        
         fraud_summary = "\n".join([f"- {flag['message']}" for flag in fraud_flags])
         
         prompt = f"""You are a BFSI fraud detection analyst. Review the following fraud flags detected in a loan application and provide a professional fraud alert summary.
@@ -255,55 +411,55 @@ Provide a brief professional summary (3-4 sentences) with:
     def process_fraud_check(self, state: Dict) -> Dict:
         """
         Main fraud detection process.
-        Returns updated state with fraud flags and routing decision.
+        Returns the state update: fraud flags, new messages and routing decision.
         """
-        # Run all fraud detection checks
-        salary_check = self.detect_salary_anomalies(state)
-        doc_check = self.detect_document_mismatches(state)
-        dup_check = self.detect_duplicate_applications(state.get("phone", ""), state)
-        pattern_check = self.detect_suspicious_patterns(state)
+        state = StateUpdate(state)
         
-        # Calculate fraud risk score
-        fraud_risk = self.calculate_fraud_risk_score(state)
+        # Link application into the fraud ring graph before checking clusters
+        self.link_application(state)
         
-        # Aggregate all fraud findings
-        all_fraud_flags = (
-            salary_check["anomalies"] +
-            doc_check["mismatches"] +
-            ([] if not dup_check["is_repeat_applicant"] else [{
-                "type": "duplicate_application",
-                "message": dup_check["message"],
-                "severity": dup_check["severity"],
-                "action": "manual_review"
-            }]) +
-            pattern_check["patterns"]
-        )
+        # Run all fraud detection checks and calculate fraud risk score
+        assessment = self.assess(state)
+        fraud_risk = assessment["fraud_risk_score"]
+        all_fraud_flags = assessment["fraud_flags"]
+        ring_check = assessment["ring_check"]
         
         # Update state with fraud detection results
         state["fraud_risk_score"] = fraud_risk
         state["fraud_flags"] = all_fraud_flags
-        state["fraud_detected"] = len(all_fraud_flags) > 0
+        state["fraud_detected"] = assessment["fraud_detected"]
+        state["fraud_cluster_size"] = ring_check["cluster_size"]
+        state["fraud_cluster_rejection_rate"] = ring_check["cluster_rejection_rate"]
         
         # Generate fraud alert message using LLM if issues found
         if all_fraud_flags:
             alert_message = self.generate_fraud_alert(state, all_fraud_flags, fraud_risk)
-            state["messages"].append(AIMessage(content=alert_message))
+            state.add_message(AIMessage(content=alert_message))
         else:
             # No fraud detected - proceed normally
-            state["messages"].append(AIMessage(
+            state.add_message(AIMessage(
                 content="✓ Fraud check passed. No suspicious patterns detected."
             ))
         
+        route = policy_for(state).fraud_route(fraud_risk)
+        
+        # Candidate policies re-decide off the request path
+        shadow_evaluator.submit(
+            "fraud",
+            {"fraud_risk_score": fraud_risk, "loan_status": state.get("loan_status")},
+            {"loan_status": assessment["loan_status"], "reason_code": f"FRAUD_{route.upper()}"}
+        )
+        
         # Determine routing based on fraud risk and current status
-        if fraud_risk >= 70:
+        state["loan_status"] = assessment["loan_status"]
+        
+        if route == "reject":
             # High risk - reject application
-            state["loan_status"] = "rejected"
             state["rejection_reason"] = f"Application rejected due to fraud detection. Risk score: {fraud_risk:.0f}/100"
             state["current_agent"] = "master"
         
-        elif fraud_risk >= 40:
+        elif route == "manual_review":
             # Medium risk - flag for manual review
-            state["loan_status"] = "manual_review_fraud"
             state["current_agent"] = "master"
         
         else:
@@ -315,11 +471,23 @@ Provide a brief professional summary (3-4 sentences) with:
                 # Otherwise, return to master for next steps
                 state["current_agent"] = "master"
         
-        return state
+        # Keep cluster rejection rates current for later applicants
+        get_fraud_ring_index().record_outcome(state.get("phone", ""), state.get("loan_status"))
+        
+        return state.changes()
+
+
+def decide_fraud_status(fraud_risk: float, loan_status: str, policy: CompiledPolicy) -> str:
+    """
+    Loan status after the fraud layer.
+    High risk (>= 70 by default) rejects, medium risk (>= 40) goes to manual review,
+    low risk keeps the underwriting decision.
+    """
+    return policy.fraud_status(fraud_risk, loan_status)
 
 
 # Main fraud agent node for workflow
-def fraud_agent_node(state: AgentState) -> AgentState:
+def fraud_agent_node(state: AgentState) -> dict:
     """
     Fraud detection node for LangGraph workflow.
     Integrates FraudAgent into the workflow pipeline.
@@ -357,5 +525,7 @@ def get_fraud_statistics() -> Dict:
         "repeat_applicants": len(fraud_database["rejected_phones"]),
         "known_suspicious_addresses": len(fraud_database["suspicious_addresses"]),
         "rejection_counts": fraud_database["rejected_phones"],
+        "fraud_rings": get_fraud_ring_index().statistics(),
+        "salary_slips": slip_store.statistics(),
         "timestamp": datetime.now().isoformat()
     }
@@ -2,9 +2,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import AIMessage, SystemMessage
 from graph.state import AgentState
+from graph.state_update import StateUpdate
 from services.data_services import crm_service, customer_service  
+from utils.eligibility_index import eligibility_index
+from utils.offer_optimizer import format_counter_offers
+from utils.policy import policy_store
 import os
 
 llm = ChatGroq(
@@ -14,8 +18,13 @@ llm = ChatGroq(
 )
 
 
-def master_agent_node(state: AgentState) -> AgentState:    
-    user_messages = [msg for msg in state["messages"] if isinstance(msg, HumanMessage)]
+def master_agent_node(state: AgentState) -> dict:    
+    # Writes are collected and returned as a partial update (graph.state_update)
+    state = StateUpdate(state)
+    
+    # Every turn enters here: pin the policy version so a hot reload
+    # cannot change the rules halfway through this turn
+    state["policy_version"] = policy_store.current().version
     
     if state["loan_status"] == "initial":
         # Verify customer with error handling
@@ -40,9 +49,9 @@ What you can do:
 3. Contact our support team for assistance
 
 We apologize for the inconvenience."""
-            state["messages"].append(AIMessage(content=error_message))
+            state.add_message(AIMessage(content=error_message))
             state["workflow_complete"] = True
-            return state
+            return state.changes()
         
         # Fetch customer details with error handling
         customer = None
@@ -63,27 +72,41 @@ We apologize for the inconvenience."""
             state["credit_score"] = customer.credit_score
             state["pre_approved_limit"] = customer.pre_approved_limit
         
+        # Pre-qualification from the nightly eligibility index (O(1) lookup)
+        eligibility = eligibility_index.lookup(state["phone"])
+        pre_qualified = ""
+        if eligibility and eligibility["eligible"]:
+            emi_examples = ", ".join(
+                f"₹{emi:,} for {tenure} months" for tenure, emi in eligibility["emi_table"].items()
+            )
+            pre_qualified = f"""
+Pre-qualified offer (quote these exact figures):
+- Instant approval up to ₹{eligibility['instant_approval_limit']:,} at {eligibility['interest_rate']}% p.a.
+- Up to ₹{eligibility['max_loan_with_salary_slip']:,} with a salary slip
+- EMI at the instant approval amount: {emi_examples}
+"""
+        
         greeting_prompt = f"""You are a friendly loan officer at a bank in India.
 
 Customer Details:
 - Name: {crm_data.name}
 - City: {state.get('city', 'N/A')}
 - Existing loans: {state.get('current_loan_details', 'None')}
-
+{pre_qualified}
 Write a warm, professional greeting (2-3 sentences):
 1. Welcome them by name
-2. Say you can help with personal loans
+2. Say you can help with personal loans{" and mention their pre-qualified instant approval amount" if pre_qualified else ""}
 3. Ask what loan amount they need
 
 Keep it natural and conversational."""
         
         response = llm.invoke([SystemMessage(content=greeting_prompt)])
         
-        state["messages"].append(AIMessage(content=response.content))
+        state.add_message(AIMessage(content=response.content))
         state["loan_status"] = "negotiating"
         state["current_agent"] = "sales"
         
-        return state
+        return state.changes()
     
     elif state["loan_status"] == "approved":
         success_message = f"""🎉 Congratulations {state['customer_name']}!
@@ -100,16 +123,23 @@ Your sanction letter is ready for download!
 
 Thank you for choosing our services! 🙏"""
         
-        state["messages"].append(AIMessage(content=success_message))
+        state.add_message(AIMessage(content=success_message))
         state["workflow_complete"] = True
-        return state
+        return state.changes()
     
     elif state["loan_status"] == "rejected":
+        counter_offers = ""
+        if state.get("counter_offers"):
+            counter_offers = f"""
+
+Offers you can still get approved for:
+{format_counter_offers(state['counter_offers'])}"""
+        
         rejection_message = f"""Dear {state['customer_name']},
 
 We regret to inform you that we cannot approve your loan application at this time. ❌
 
-Reason: {state['rejection_reason']}
+Reason: {state['rejection_reason']}{counter_offers}
 
 What you can do:
 • Improve your credit score (current: {state.get('credit_score', 'N/A')}/900)
@@ -121,9 +151,9 @@ For assistance, contact our support team.
 
 Thank you for your interest."""
         
-        state["messages"].append(AIMessage(content=rejection_message))
+        state.add_message(AIMessage(content=rejection_message))
         state["workflow_complete"] = True
-        return state
+        return state.changes()
     
     elif state["loan_status"] == "awaiting_salary_slip":
         salary_message = f"""📄 Document Required
@@ -134,18 +164,18 @@ Please upload your latest salary slip (last 1 month).
 
 Why we need this:
 • Your requested loan is {state['requested_loan_amount'] / state['pre_approved_limit']:.1f}x your pre-approved limit
-• We need to ensure EMI (₹{state['calculated_emi']:,.0f}) is within 50% of your salary
+• We need to ensure EMI (₹{state['calculated_emi']:,.0f}) is within {policy_store.get(state['policy_version']).max_emi_ratio:g}% of your salary
 
 Accepted formats: PDF, JPG, PNG
 Max file size: 5MB
 
 Once uploaded, approval is instant! ⚡"""
         
-        state["messages"].append(AIMessage(content=salary_message))
-        return state
+        state.add_message(AIMessage(content=salary_message))
+        return state.changes()
     
     else:
-        return state
+        return state.changes()
 
 
 __all__ = ["master_agent_node"]
\ No newline at end of file
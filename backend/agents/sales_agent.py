@@ -243,12 +243,14 @@ JSON FORMAT:
 
 # ====== LANGGRAPH INTEGRATION ======
 from graph.state import AgentState
+from graph.state_update import StateUpdate
 from langchain_core.messages import AIMessage
-from utils.emi import calculate_emi
+from utils.emi import affordable_terms, calculate_emi
+from utils.policy import policy_for
 from services.data_services import offer_service
 
 
-def sales_agent_node(state: AgentState) -> AgentState:
+def sales_agent_node(state: AgentState) -> dict:
     """
     Sales Agent node for LangGraph workflow.
     Extracts loan details, calculates EMI, and negotiates interest rate.
@@ -259,13 +261,14 @@ def sales_agent_node(state: AgentState) -> AgentState:
     3. Calculate EMI using extracted amount/tenure
     4. Set negotiated interest rate
     5. Generate persuasive response
-    6. Update AgentState
+    6. Return the changed AgentState keys
     """
+    state = StateUpdate(state)
     agent = SalesAgent()
     
     # Get last user message
     if not state["messages"]:
-        return state
+        return {}
     
     user_message = state["messages"][-1].content
     result = agent._process_message(user_message)
@@ -309,16 +312,45 @@ def sales_agent_node(state: AgentState) -> AgentState:
             print(f"⚠️ EMI calculation error: {e}")
             state['calculated_emi'] = None
     
+    # Salary already known (e.g. slip uploaded, then terms changed): solve
+    # affordable terms up front instead of letting underwriting reject
+    max_emi_ratio = policy_for(state).max_emi_ratio / 100
+    if state['calculated_emi'] and state.get('monthly_salary') and \
+            state['calculated_emi'] > state['monthly_salary'] * max_emi_ratio:
+        state['affordability'] = affordable_terms(
+            principal=state['requested_loan_amount'],
+            annual_rate=state['negotiated_interest_rate'],
+            tenure_months=state['requested_tenure'],
+            monthly_salary=state['monthly_salary'],
+            max_emi_ratio=max_emi_ratio,
+        )
+    else:
+        state['affordability'] = None
+    
     # ========== GENERATE SALES RESPONSE ==========
     
     sales_response = _generate_sales_response(state, result)
-    state["messages"].append(AIMessage(content=sales_response))
+    state.add_message(AIMessage(content=sales_response))
     
     # ========== UPDATE STATUS ==========
     state['loan_status'] = 'negotiating'
     state['current_agent'] = 'sales'
     
-    return state
+    return state.changes()
+
+
+def _affordability_note(state: AgentState) -> str:
+    """Prompt lines with solved counter-offer terms, if the EMI is over the cap."""
+    terms = state.get('affordability')
+    if not terms:
+        return ""
+    lines = [f"\nAffordability (EMI cap ₹{terms['max_emi']:,.0f} from their salary):"]
+    if terms['affordable_tenure_months']:
+        lines.append(f"- Same amount fits over {terms['affordable_tenure_months']} months "
+                     f"(EMI ₹{terms['affordable_tenure_emi']:,.0f})")
+    lines.append(f"- Maximum amount at {state['requested_tenure']} months: ₹{terms['max_principal']:,.0f}")
+    lines.append("Suggest one of these instead of the current EMI.\n")
+    return "\n".join(lines)
 
 
 def _generate_sales_response(state: AgentState, extracted_data: dict) -> str:
@@ -348,7 +380,7 @@ Loan Offer:
 - Tenure: {state['requested_tenure']} months
 - Interest Rate: {state['negotiated_interest_rate']}% p.a.
 - Monthly EMI: ₹{state['calculated_emi']:,.0f}
-
+{_affordability_note(state)}
 Task: Generate a CONCISE, persuasive pitch (3-4 sentences) that:
 1. Confirms the loan offer with clear numbers
 2. Highlights EMI affordability
@@ -1,170 +1,373 @@
 from langchain_core.messages import AIMessage
 from graph.state import AgentState
+from graph.state_update import StateUpdate
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib import colors
-from pathlib import Path
+from typing import Optional
+from utils.emi import iter_amortization_schedule
+from utils.job_pool import JobPoolUnavailable, JobQueueFull, sanction_pool
+from utils.letter_store import letter_key, letter_store
+from utils.schedule_export import loan_terms
+from copy import copy
 from datetime import datetime
-import uuid
+import io
 
 
-def generate_sanction_letter_pdf(state: AgentState) -> str:
+TERMS = (
+    "This sanction is valid for 30 days from the date of issue.",
+    "The loan is subject to verification of all submitted documents.",
+    "EMI payments must be made on or before the due date each month.",
+    "Prepayment charges: 2% of outstanding principal (if prepaid before 12 months).",
+    "Late payment charges: 2% per month on overdue amount.",
+    "The bank reserves the right to recall the loan in case of default.",
+)
+
+
+class _StaticParagraph(Paragraph):
+    """
+    Paragraph whose line breaks are computed once per width; shallow copies
+    share the cache, so only the first letter pays for breaking the text.
     """
-    Generate a professional loan sanction letter PDF.
     
-    Returns:
-        Path to generated PDF file
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._wrap_cache = {}
+    
+    def wrap(self, availWidth, availHeight):
+        cached = self._wrap_cache.get(availWidth)
+        if cached is None:
+            size = super().wrap(availWidth, availHeight)
+            self._wrap_cache[availWidth] = (size, self.blPara, self._wrapWidths)
+            return size
+        size, self.blPara, self._wrapWidths = cached
+        self.width, self.height = size
+        return size
+
+
+class SanctionLetterTemplate:
     """
-    # Create output directory
-    output_dir = Path(__file__).parent.parent / "data" / "sanction_letters"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    Styles, table styles and the static flowables of the sanction letter,
+    built once per process.
     
-    filename = f"sanction_letter_{state['customer_id']}_{uuid.uuid4().hex[:8]}.pdf"
-    filepath = output_dir / filename
+    Paragraph markup is parsed when a Paragraph is created; the static ones
+    (title, headings, terms, closing) are parsed and line-broken once and
+    every letter gets shallow copies, so layout state set during a build
+    never leaks between letters or threads. Only the date, reference,
+    borrower and loan tables and the repayment schedule are built per letter.
+    """
     
-    doc = SimpleDocTemplate(str(filepath), pagesize=A4)
-    story = []
-    styles = getSampleStyleSheet()
+    def __init__(self) -> None:
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#1a237e'),
+            spaceAfter=30,
+            alignment=1  # Center
+        )
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=12,
+            textColor=colors.HexColor('#1a237e'),
+            spaceAfter=12
+        )
+        self.congrats_style = ParagraphStyle(
+            'Congrats',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#2e7d32'),
+            spaceAfter=12
+        )
+        
+        details_commands = [
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ]
+        self.customer_table_style = TableStyle(details_commands)
+        self.loan_table_style = TableStyle(
+            details_commands + [('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f5f5f5'))]
+        )
+        self.schedule_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8eaf6')),
+            ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.HexColor('#1a237e')),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+        ])
+        
+        self.header = [
+            _StaticParagraph("LOAN SANCTION LETTER", self.title_style),
+            Spacer(1, 0.2 * inch),
+        ]
+        self.borrower_heading = [
+            Spacer(1, 0.3 * inch),
+            _StaticParagraph("BORROWER DETAILS", self.heading_style),
+        ]
+        self.loan_heading = [
+            Spacer(1, 0.3 * inch),
+            _StaticParagraph("LOAN DETAILS", self.heading_style),
+        ]
+        closing = [Spacer(1, 0.3 * inch), _StaticParagraph("TERMS & CONDITIONS", self.heading_style)]
+        for i, term in enumerate(TERMS, 1):
+            closing.append(_StaticParagraph(f"{i}. {term}", self.normal_style))
+            closing.append(Spacer(1, 0.1 * inch))
+        closing += [
+            Spacer(1, 0.3 * inch),
+            _StaticParagraph("Congratulations on your loan approval! We look forward to serving you.",
+                             self.congrats_style),
+            Spacer(1, 0.3 * inch),
+            _StaticParagraph("<b>Authorized Signatory</b>", self.normal_style),
+            _StaticParagraph("Loan Department", self.normal_style),
+            _StaticParagraph("CredSaathi Bank", self.normal_style),
+        ]
+        self.closing = closing
+        self.schedule_heading = [
+            PageBreak(),
+            _StaticParagraph("ANNEXURE: REPAYMENT SCHEDULE (amounts in INR)", self.heading_style),
+        ]
     
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1a237e'),
-        spaceAfter=30,
-        alignment=1  # Center
-    )
+    def story(self, state: AgentState, issued_at: datetime) -> list:
+        """The letter's flowables: copies of the static parts plus the variable fields."""
+        story = [copy(flowable) for flowable in self.header]
+        story.append(Paragraph(f"<b>Date:</b> {issued_at.strftime('%B %d, %Y')}", self.normal_style))
+        story.append(Paragraph(f"<b>Reference No:</b> {reference_number(state, issued_at)}", self.normal_style))
+        
+        story.extend(copy(flowable) for flowable in self.borrower_heading)
+        customer_data = [
+            ['Name:', state['customer_name']],
+            ['Address:', state['verified_address']],
+            ['Phone:', state['verified_phone']],
+            ['Customer ID:', str(state['customer_id'])]
+        ]
+        story.append(Table(customer_data, colWidths=[2*inch, 4*inch], style=self.customer_table_style))
+        
+        story.extend(copy(flowable) for flowable in self.loan_heading)
+        total_repayment = state['calculated_emi'] * state['requested_tenure']
+        total_interest = total_repayment - state['requested_loan_amount']
+        loan_data = [
+            ['Loan Amount:', f"₹{state['requested_loan_amount']:,.2f}"],
+            ['Interest Rate:', f"{state['negotiated_interest_rate']}% per annum"],
+            ['Loan Tenure:', f"{state['requested_tenure']} months"],
+            ['Monthly EMI:', f"₹{state['calculated_emi']:,.2f}"],
+            ['Total Interest:', f"₹{total_interest:,.2f}"],
+            ['Total Repayment:', f"₹{total_repayment:,.2f}"],
+        ]
+        story.append(Table(loan_data, colWidths=[2*inch, 4*inch], style=self.loan_table_style))
+        
+        story.extend(copy(flowable) for flowable in self.closing)
+        
+        schedule_terms = loan_terms(state)
+        if schedule_terms:
+            story.extend(copy(flowable) for flowable in self.schedule_heading)
+            story.extend(_schedule_tables(*schedule_terms, style=self.schedule_table_style))
+        return story
+
+
+sanction_template = SanctionLetterTemplate()
+
+
+def reference_number(state: AgentState, issued_at: datetime) -> str:
+    return f"SL/{state['customer_id']}/{issued_at.strftime('%Y%m%d')}"
+
+
+def render_sanction_letter(state: AgentState, output, issued_at: Optional[datetime] = None) -> int:
+    """
+    Render the sanction letter PDF to a path or binary file object.
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=colors.HexColor('#1a237e'),
-        spaceAfter=12
-    )
+    Invariant mode leaves out the creation timestamp and random document
+    id, so the same letter fields and issue date always give the same bytes.
     
-    story.append(Paragraph("LOAN SANCTION LETTER", title_style))
-    story.append(Spacer(1, 0.2 * inch))
-    
-    date_str = datetime.now().strftime("%B %d, %Y")
-    ref_number = f"SL/{state['customer_id']}/{datetime.now().strftime('%Y%m%d')}"
-    
-    story.append(Paragraph(f"<b>Date:</b> {date_str}", styles['Normal']))
-    story.append(Paragraph(f"<b>Reference No:</b> {ref_number}", styles['Normal']))
-    story.append(Spacer(1, 0.3 * inch))
-    
-    story.append(Paragraph("BORROWER DETAILS", heading_style))
-    customer_data = [
-        ['Name:', state['customer_name']],
-        ['Address:', state['verified_address']],
-        ['Phone:', state['verified_phone']],
-        ['Customer ID:', str(state['customer_id'])]
-    ]
-    
-    customer_table = Table(customer_data, colWidths=[2*inch, 4*inch])
-    customer_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
-    story.append(customer_table)
-    story.append(Spacer(1, 0.3 * inch))
-    
-    story.append(Paragraph("LOAN DETAILS", heading_style))
-    
-    total_repayment = state['calculated_emi'] * state['requested_tenure']
-    total_interest = total_repayment - state['requested_loan_amount']
-    
-    loan_data = [
-        ['Loan Amount:', f"₹{state['requested_loan_amount']:,.2f}"],
-        ['Interest Rate:', f"{state['negotiated_interest_rate']}% per annum"],
-        ['Loan Tenure:', f"{state['requested_tenure']} months"],
-        ['Monthly EMI:', f"₹{state['calculated_emi']:,.2f}"],
-        ['Total Interest:', f"₹{total_interest:,.2f}"],
-        ['Total Repayment:', f"₹{total_repayment:,.2f}"],
-    ]
-    
-    loan_table = Table(loan_data, colWidths=[2*inch, 4*inch])
-    loan_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f5f5f5')),
-    ]))
-    story.append(loan_table)
-    story.append(Spacer(1, 0.3 * inch))
-    
-    # Terms and conditions
-    story.append(Paragraph("TERMS & CONDITIONS", heading_style))
-    
-    terms = [
-        "This sanction is valid for 30 days from the date of issue.",
-        "The loan is subject to verification of all submitted documents.",
-        "EMI payments must be made on or before the due date each month.",
-        "Prepayment charges: 2% of outstanding principal (if prepaid before 12 months).",
-        "Late payment charges: 2% per month on overdue amount.",
-        "The bank reserves the right to recall the loan in case of default.",
-    ]
-    
-    for i, term in enumerate(terms, 1):
-        story.append(Paragraph(f"{i}. {term}", styles['Normal']))
-        story.append(Spacer(1, 0.1 * inch))
-    
-    story.append(Spacer(1, 0.3 * inch))
-    
-    congrats_style = ParagraphStyle(
-        'Congrats',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#2e7d32'),
-        spaceAfter=12
-    )
-    story.append(Paragraph(
-        "Congratulations on your loan approval! We look forward to serving you.",
-        congrats_style
-    ))
+    Returns:
+        Number of pages
+    """
+    doc = SimpleDocTemplate(output if hasattr(output, "write") else str(output), pagesize=A4, invariant=1)
+    doc.build(sanction_template.story(state, issued_at or datetime.now()))
+    return doc.page
+
+
+# Session fields the letter is rendered from (sent to the worker process)
+SANCTION_LETTER_FIELDS = (
+    'customer_id', 'customer_name', 'verified_address', 'verified_phone',
+    'requested_loan_amount', 'negotiated_interest_rate', 'requested_tenure', 'calculated_emi',
+)
+
+
+def letter_fields(state: AgentState) -> dict:
+    return {field: state.get(field) for field in SANCTION_LETTER_FIELDS}
+
+
+def session_letter_key(state: AgentState) -> str:
+    """
+    Letter store key: the letter fields of this session. A new session with
+    the same terms (e.g. the customer reapplies) gets a newly dated letter.
+    """
+    return letter_key({**letter_fields(state), "session_id": state.get('session_id')})
+
+
+def store_sanction_letter(letter: dict, issued_at: Optional[datetime] = None) -> str:
+    """
+    Render a letter into memory and add it to the letter store.
+    
+    Returns:
+        Document hash (letter_store.path() gives the file)
+    """
+    buffer = io.BytesIO()
+    render_sanction_letter(letter, buffer, issued_at)
+    digest, _, _ = letter_store.put(buffer.getvalue())
+    return digest
+
+
+def mark_sanction_letter_ready(state: AgentState, digest: str, issued_at: Optional[datetime] = None) -> None:
+    """Record a stored letter on the session and link it to the letter's key."""
+    letter_store.link(session_letter_key(state), digest, issued_at.isoformat() if issued_at else None)
+    state['sanction_letter_hash'] = digest
+    if issued_at:
+        state['sanction_letter_issued_at'] = issued_at.isoformat()
+    state['sanction_letter_path'] = str(letter_store.path(digest))
+    state['sanction_letter_status'] = 'ready'
+
+
+def generate_sanction_letter_pdf(state: AgentState, issued_at: Optional[datetime] = None) -> str:
+    """
+    Generate a professional loan sanction letter PDF.
     
-    story.append(Spacer(1, 0.3 * inch))
+    A letter already stored for the same session and fields is reused, not rendered again.
     
-    story.append(Paragraph("<b>Authorized Signatory</b>", styles['Normal']))
-    story.append(Paragraph("Loan Department", styles['Normal']))
-    story.append(Paragraph("CredSaathi Bank", styles['Normal']))
+    Returns:
+        Path to generated PDF file
+    """
+    letter = letter_fields(state)
+    key = session_letter_key(state)
+    stored = letter_store.lookup(key)
+    if stored is None:
+        issued_at = issued_at or datetime.now()
+        digest = store_sanction_letter(letter, issued_at)
+        letter_store.link(key, digest, issued_at.isoformat())
+    else:
+        digest = stored["sha256"]
+    return str(letter_store.path(digest))
+
+
+def _render_sanction_letter_job(letter: dict, issued_at: datetime) -> dict:
+    """
+    sanction_pool worker entry point.
     
-    doc.build(story)
+    The key → document link is made by the caller (mark_sanction_letter_ready),
+    in the process that serves downloads.
+    """
+    return {"sha256": store_sanction_letter(letter, issued_at), "issued_at": issued_at.isoformat()}
+
+
+def submit_sanction_letter(state: AgentState, issued_at: Optional[datetime] = None) -> str:
+    """
+    Queue the letter on sanction_pool.
+    
+    Returns:
+        Letter (job) id to poll with sanction_pool.status()
+    
+    Raises:
+        JobQueueFull, JobPoolUnavailable: see utils.job_pool
+    """
+    return sanction_pool.submit(
+        _render_sanction_letter_job, letter_fields(state), issued_at or datetime.now(),
+        kind="sanction_letter", meta={"customer_id": state.get('customer_id')},
+    )
+
+
+SCHEDULE_ROWS_PER_TABLE = 40
+
+
+def _schedule_tables(principal: float, annual_rate: float, tenure_months: int, style: TableStyle):
+    """
+    Repayment schedule as page-sized tables, built from the month generator
+    so long tenures never materialize one huge table.
+    """
+    header = ['Month', 'EMI', 'Interest', 'Principal', 'Balance']
     
-    return str(filepath)
+    rows = [header]
+    for month in iter_amortization_schedule(principal, annual_rate, tenure_months):
+        rows.append([
+            str(month['month']),
+            f"{month['emi']:,.2f}",
+            f"{month['interest']:,.2f}",
+            f"{month['principal']:,.2f}",
+            f"{month['balance']:,.2f}",
+        ])
+        if len(rows) > SCHEDULE_ROWS_PER_TABLE:
+            yield Table(rows, colWidths=[0.8*inch] + [1.3*inch] * 4, style=style)
+            rows = [header]
+    if len(rows) > 1:
+        yield Table(rows, colWidths=[0.8*inch] + [1.3*inch] * 4, style=style)
 
 
-def sanction_generator_node(state: AgentState) -> AgentState:
+def sanction_generator_node(state: AgentState) -> dict:
     """
     Sanction Letter Generator Agent.
     
-    Generates PDF sanction letter for approved loans.
+    Queues the PDF sanction letter for approved loans on the background
+    render pool; the download endpoint answers 202 until it is ready.
     """
+    state = StateUpdate(state)
     
-    pdf_path = generate_sanction_letter_pdf(state)
+    issued_at = datetime.now()
+    stored = letter_store.lookup(session_letter_key(state))
+    if stored is not None:
+        # Same letter already issued in this session (e.g. the approval ran again): reuse it
+        if stored["issued_at"]:
+            issued_at = datetime.fromisoformat(stored["issued_at"])
+        state['sanction_letter_id'] = None
+        mark_sanction_letter_ready(state, stored["sha256"], issued_at)
+    else:
+        try:
+            state['sanction_letter_id'] = submit_sanction_letter(state, issued_at)
+            state['sanction_letter_status'] = 'pending'
+            state['sanction_letter_hash'] = None
+            state['sanction_letter_path'] = None
+            state['sanction_letter_issued_at'] = issued_at.isoformat()
+        except (JobQueueFull, JobPoolUnavailable) as e:
+            # Render queue unavailable: render here rather than lose the letter
+            print(f"⚠️ Rendering sanction letter inline: {e}")
+            state['sanction_letter_id'] = None
+            mark_sanction_letter_ready(state, store_sanction_letter(letter_fields(state), issued_at), issued_at)
     
     state['sanction_letter_generated'] = True
-    state['sanction_letter_path'] = pdf_path
     
     # Inform user
-    message = f"""Your loan sanction letter has been generated successfully!
+    message = f"""Your loan sanction letter has been issued!
 
  Document: Sanction Letter
- Reference: SL/{state['customer_id']}/{datetime.now().strftime('%Y%m%d')}
+ Reference: {reference_number(state, issued_at)}
 
 You can download your sanction letter from the link below."""
     
-    state["messages"].append(AIMessage(content=message))
+    state.add_message(AIMessage(content=message))
     
     state['loan_status'] = 'approved'
     state['workflow_complete'] = True
     
-    return state
+    return state.changes()
 
 
-__all__ = ["sanction_generator_node"]
\ No newline at end of file
+__all__ = [
+    "SANCTION_LETTER_FIELDS",
+    "SanctionLetterTemplate",
+    "generate_sanction_letter_pdf",
+    "letter_fields",
+    "mark_sanction_letter_ready",
+    "reference_number",
+    "render_sanction_letter",
+    "sanction_generator_node",
+    "sanction_template",
+    "store_sanction_letter",
+    "submit_sanction_letter",
+]
\ No newline at end of file
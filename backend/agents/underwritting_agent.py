@@ -1,7 +1,13 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, SystemMessage
 from graph.state import AgentState
-from services.data_services import credit_bureau_service
+from graph.state_update import StateUpdate
+from services.data_services import credit_bureau_service, offer_service
+from utils.emi import affordable_terms
+from utils.offer_optimizer import counter_offers_for
+from utils.policy import policy_for
+from utils.shadow import shadow_evaluator
+from utils.underwriting import evaluate_underwriting
 import os
 
 llm = ChatGroq(
@@ -11,38 +17,59 @@ llm = ChatGroq(
 )
 
 
-def underwriting_agent_node(state: AgentState) -> AgentState:
+def underwriting_agent_node(state: AgentState) -> dict:
     """
     Underwriting Agent - Credit check and eligibility validation.
     
-    Business Rules:
+    Business Rules (thresholds from the pinned policy, defaults shown):
     1. Credit score must be >= 700 (reject if less)
     2. If loan amount <= pre-approved limit → Instant approval
     3. If loan amount <= 2x pre-approved limit → Need salary slip
        - Approve only if EMI <= 50% of monthly salary
     4. If loan amount > 2x pre-approved limit → Reject
     """
+    state = StateUpdate(state)
     
     if not state['credit_score']:
         credit_score = credit_bureau_service.get_credit_score(state['phone'])
         state['credit_score'] = credit_score
     
-    # Rule 1: Check credit score
-    if state['credit_score'] < 700:
-        state['loan_status'] = 'rejected'
-        state['rejection_reason'] = f"Credit score ({state['credit_score']}/900) is below minimum requirement of 700"
+    decision_inputs = {
+        "credit_score": state['credit_score'],
+        "requested_loan_amount": state['requested_loan_amount'],
+        "pre_approved_limit": state['pre_approved_limit'],
+        "salary_slip_uploaded": state['salary_slip_uploaded'],
+        "monthly_salary": state['monthly_salary'],
+        "calculated_emi": state['calculated_emi'],
+    }
+    policy = policy_for(state)
+    decision = evaluate_underwriting(**decision_inputs, policy=policy)
+    state['loan_status'] = decision['loan_status']
+    
+    # Candidate policies re-decide off the request path
+    shadow_evaluator.submit("underwriting", decision_inputs, decision)
+    
+    if decision['loan_status'] == 'rejected':
+        state['rejection_reason'] = decision['rejection_reason']
+        if decision['reason_code'] == 'EMI_EXCEEDS_LIMIT':
+            _add_affordable_terms(state, policy.max_emi_ratio / 100)
+        if decision['reason_code'] in ('EXCEEDS_MAX_LIMIT', 'EMI_EXCEEDS_LIMIT'):
+            state['counter_offers'] = counter_offers_for(
+                state, offer_service.get_offer(state['phone']), policy=policy
+            )
         state['current_agent'] = 'master'
         state['workflow_complete'] = True
-        return state
+        return state.changes()
+    
+    if decision['loan_status'] == 'awaiting_salary_slip':
+        # Need salary slip upload
+        state['salary_slip_required'] = True
+        state['current_agent'] = 'master'
+        return state.changes()
     
-    # Calculate loan ratio
-    loan_ratio = state['requested_loan_amount'] / state['pre_approved_limit']
+    state['current_agent'] = 'sanction'
     
-    # Rule 2: Instant approval if within pre-approved limit
-    if loan_ratio <= 1.0:
-        state['loan_status'] = 'approved'
-        state['current_agent'] = 'sanction'
-        
+    if decision['reason_code'] == 'INSTANT_APPROVAL':
         approval_prompt = f"""You are an underwriting agent approving a loan.
 
 Customer: {state['customer_name']}
@@ -58,28 +85,13 @@ Generate a brief approval message (2-3 sentences):
 3. Say the sanction letter is being generated
 
 Keep it enthusiastic and professional."""
-        
-        response = llm.invoke([SystemMessage(content=approval_prompt)])
-        state["messages"].append(AIMessage(content=response.content))
-        
-        return state
-    
-    elif loan_ratio <= 2.0:
-        # Check if salary slip already uploaded
-        if state['salary_slip_uploaded'] and state['monthly_salary']:
-            # Verify EMI is within 50% of salary
-            emi_ratio = (state['calculated_emi'] / state['monthly_salary']) * 100
-            
-            if emi_ratio <= 50:
-                state['loan_status'] = 'approved'
-                state['current_agent'] = 'sanction'
-                
-                approval_prompt = f"""You are an underwriting agent approving a loan after salary verification.
+    else:
+        approval_prompt = f"""You are an underwriting agent approving a loan after salary verification.
 
 Customer: {state['customer_name']}
 Monthly Salary: ₹{state['monthly_salary']:,.0f}
 Monthly EMI: ₹{state['calculated_emi']:,.0f}
-EMI Ratio: {emi_ratio:.1f}% of salary 
+EMI Ratio: {decision['emi_ratio']:.1f}% of salary 
 
 Status: APPROVED (EMI is affordable)
 
@@ -87,30 +99,34 @@ Generate a brief approval message (2-3 sentences):
 1. Confirm salary verification is complete
 2. Mention EMI is well within affordable limits
 3. Say the sanction letter is being generated"""
-                
-                response = llm.invoke([SystemMessage(content=approval_prompt)])
-                state["messages"].append(AIMessage(content=response.content))
-                
-                return state
-            else:
-                state['loan_status'] = 'rejected'
-                state['rejection_reason'] = f"Monthly EMI (₹{state['calculated_emi']:,.0f}) exceeds 50% of your salary (₹{state['monthly_salary']:,.0f})"
-                state['current_agent'] = 'master'
-                state['workflow_complete'] = True
-                return state
-        else:
-            # Need salary slip upload
-            state['loan_status'] = 'awaiting_salary_slip'
-            state['salary_slip_required'] = True
-            state['current_agent'] = 'master'
-            return state
     
-    else:
-        state['loan_status'] = 'rejected'
-        state['rejection_reason'] = f"Requested amount (₹{state['requested_loan_amount']:,.0f}) exceeds 2x pre-approved limit (₹{state['pre_approved_limit'] * 2:,.0f})"
-        state['current_agent'] = 'master'
-        state['workflow_complete'] = True
-        return state
+    response = llm.invoke([SystemMessage(content=approval_prompt)])
+    state.add_message(AIMessage(content=response.content))
+    
+    return state.changes()
+
+
+def _add_affordable_terms(state: StateUpdate, max_emi_ratio: float) -> None:
+    """Attach solved counter-offer terms to an EMI rejection."""
+    terms = affordable_terms(
+        principal=state['requested_loan_amount'],
+        annual_rate=state['negotiated_interest_rate'] or 10.5,
+        tenure_months=state['requested_tenure'],
+        monthly_salary=state['monthly_salary'],
+        max_emi_ratio=max_emi_ratio,
+    )
+    state['affordability'] = terms
+    
+    options = []
+    if terms['affordable_tenure_months']:
+        options.append(
+            f"the same amount over {terms['affordable_tenure_months']} months "
+            f"(EMI ₹{terms['affordable_tenure_emi']:,.0f})"
+        )
+    if terms['max_principal'] > 0:
+        options.append(f"up to ₹{terms['max_principal']:,.0f} over {state['requested_tenure']} months")
+    if options:
+        state['rejection_reason'] += ". You could qualify for " + " or ".join(options)
 
 
 _all_ = ["underwriting_agent_node"]
\ No newline at end of file
@@ -1,6 +1,8 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, SystemMessage
 from graph.state import AgentState
+from graph.state_update import StateUpdate
+from utils.policy import policy_for
 import os
 
 llm = ChatGroq(
@@ -10,7 +12,7 @@ llm = ChatGroq(
 )
 
 
-def verification_agent_node(state: AgentState) -> AgentState:
+def verification_agent_node(state: AgentState) -> dict:
     """
     Verification Agent - Verifies KYC details and requests salary slip if needed.
     
@@ -21,6 +23,7 @@ def verification_agent_node(state: AgentState) -> AgentState:
     4. Inform customer about verification
     5. Move to underwriting stage
     """
+    state = StateUpdate(state)
     
     if state['verified_phone'] and state['verified_address']:
         state['kyc_verified'] = True
@@ -30,11 +33,7 @@ def verification_agent_node(state: AgentState) -> AgentState:
     # If requested loan is between 1-2x pre-approved limit, need salary slip for EMI check
     if state['requested_loan_amount'] and state['pre_approved_limit']:
         loan_ratio = state['requested_loan_amount'] / state['pre_approved_limit']
-        
-        if 1.0 < loan_ratio <= 2.0:
-            state['salary_slip_required'] = True
-        else:
-            state['salary_slip_required'] = False
+        state['salary_slip_required'] = policy_for(state).salary_slip_required(loan_ratio)
     
     # ========== GENERATE KYC MESSAGE ==========
     
@@ -56,14 +55,14 @@ Generate a brief verification message (2-3 sentences):
 Keep it professional and reassuring."""
     
     response = llm.invoke([SystemMessage(content=verification_prompt)])
-    state["messages"].append(AIMessage(content=response.content))
+    state.add_message(AIMessage(content=response.content))
     
     # ========== UPDATE STATUS & ROUTE ==========
     
     state["loan_status"] = "underwriting"
     state["current_agent"] = "underwriting"
     
-    return state
+    return state.changes()
 
 
 __all__ = ["verification_agent_node"]
\ No newline at end of file
@@ -0,0 +1,71 @@
+# scripts/bench_extraction_pool.py
+"""
+Salary slip extraction throughput through the job pool at increasing worker counts.
+
+Generates simple PDF salary slips, submits them all and waits for completion,
+once per worker count. Throughput should grow with the number of cores.
+
+Run from the backend directory:
+    python data/scripts/bench_extraction_pool.py --slips 200 --workers 1,2,4,8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from reportlab.pdfgen import canvas
+
+from utils.job_pool import JobPool
+from utils.scanpdf import extract_salary
+
+
+def make_slips(directory: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        path = directory / f"slip_{i}.pdf"
+        pdf = canvas.Canvas(str(path))
+        pdf.drawString(72, 760, "ACME Industries Pvt Ltd - Salary Slip")
+        pdf.drawString(72, 730, f"Employee ID: E{i:05d}")
+        pdf.drawString(72, 700, f"Basic Salary: {30000 + i * 10}")
+        pdf.drawString(72, 680, f"Net Pay: Rs. {45000 + i * 10:,}")
+        pdf.save()
+        paths.append(path)
+    return paths
+
+
+def run(paths: list, workers: int) -> float:
+    pool = JobPool(max_workers=workers, max_pending=len(paths))
+    pool.start()
+    start = time.perf_counter()
+    job_ids = [pool.submit(extract_salary, path, kind="salary_slip") for path in paths]
+    while pool.statistics()["pending"]:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    failed = sum(pool.status(job_id)["result"] is None for job_id in job_ids)
+    pool.shutdown()
+    if failed:
+        print(f"⚠️ {failed} slips without a salary")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled salary slip extraction")
+    parser.add_argument("--slips", type=int, default=100, help="Number of generated slips")
+    parser.add_argument("--workers", default=f"1,{os.cpu_count()}", help="Worker counts to compare")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_slips(Path(tmp), args.slips)
+        print(f"{len(paths)} slips, {os.cpu_count()} CPUs")
+        for workers in sorted({int(w) for w in args.workers.split(",")}):
+            elapsed = run(paths, workers)
+            print(f"   {workers:>3} workers: {elapsed:6.2f}s ({len(paths) / elapsed:7.1f} slips/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# scripts/bench_offer_optimizer.py
+"""
+Latency check for the counter-offer optimizer on random rejected applicants.
+Every returned offer is re-checked with evaluate_underwriting.
+
+Run from the backend directory:
+    python data/scripts/bench_offer_optimizer.py --applicants 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.offer_optimizer import optimize_offers
+from utils.policy import policy_store
+from utils.underwriting import evaluate_underwriting
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the counter-offer optimizer")
+    parser.add_argument("--applicants", type=int, default=2000, help="Random applicants to optimize")
+    parser.add_argument("--top", type=int, default=3, help="Offers per applicant")
+    args = parser.parse_args()
+
+    policy = policy_store.current()
+    rng = random.Random(7)
+    applicants = []
+    for _ in range(args.applicants):
+        limit = rng.choice([50000, 100000, 150000, 200000, 300000])
+        applicants.append({
+            "requested_amount": round(limit * rng.uniform(1.0, 3.0), -3),
+            "requested_tenure": rng.choice([12, 24, 36, 48, 60]),
+            "pre_approved_limit": limit,
+            "base_rate": round(rng.uniform(10.0, 15.0), 2),
+            "credit_score": rng.randint(700, 900),
+            "monthly_salary": rng.choice([None, round(rng.uniform(15000, 150000), -2)]),
+        })
+
+    start = time.perf_counter()
+    results = [optimize_offers(**a, policy=policy, top_n=args.top) for a in applicants]
+    elapsed = time.perf_counter() - start
+
+    invalid = empty = 0
+    for applicant, offers in zip(applicants, results):
+        empty += not offers
+        for offer in offers:
+            if offer["requires_salary_slip"]:
+                continue
+            decision = evaluate_underwriting(
+                applicant["credit_score"], offer["amount"], applicant["pre_approved_limit"],
+                bool(applicant["monthly_salary"]), applicant["monthly_salary"], offer["emi"],
+                policy=policy,
+            )
+            invalid += decision["loan_status"] != "approved"
+
+    print(f"Optimized {len(applicants):,} applicants in {elapsed:.2f}s "
+          f"({elapsed / len(applicants) * 1e3:.2f} ms/applicant)")
+    print(f"   Applicants without offers: {empty:,}")
+    print(f"{'✅' if invalid == 0 else '⚠️'} Offers failing underwriting: {invalid}")
+
+
+if __name__ == "__main__":
+    main()
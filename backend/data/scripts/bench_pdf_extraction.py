@@ -0,0 +1,83 @@
+# scripts/bench_pdf_extraction.py
+"""
+Full vs incremental PDF text extraction on multi-page uploads.
+
+Builds two documents: a salary slip followed by pages of bank statement
+transactions, and a bank statement with no slip at all. Each is extracted
+reading every page (the old behaviour) and incrementally with early stop
+and the page cap.
+
+Run from the backend directory:
+    python data/scripts/bench_pdf_extraction.py --pages 30 --repeat 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from utils.scanpdf import PDF_MAX_PAGES, extract_salary_from_pdf
+
+
+def statement_page(pdf: canvas.Canvas, page: int) -> None:
+    pdf.drawString(72, 800, f"Account Statement - page {page}")
+    for line in range(60):
+        pdf.drawString(72, 770 - line * 12,
+                       f"{line + 1:02d}/03/2024  UPI/{page:03d}{line:04d}/MERCHANT PAYMENT   {1000 + line * 37:>8}.00")
+    pdf.showPage()
+
+
+def make_document(path: Path, pages: int, with_slip: bool) -> Path:
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    if with_slip:
+        pdf.drawString(72, 800, "ACME Industries Pvt Ltd - Salary Slip for March 2024")
+        pdf.drawString(72, 780, "Employee Name: Priya Sharma")
+        pdf.drawString(72, 760, "Net Pay: Rs. 85,000")
+        for line in range(30):
+            pdf.drawString(72, 500 - line * 12, f"Allowance {line:02d}: {100 + line}")
+        pdf.showPage()
+        pages -= 1
+    for page in range(pages):
+        statement_page(pdf, page + 1)
+    pdf.save()
+    return path
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental PDF extraction")
+    parser.add_argument("--pages", type=int, default=30, help="Pages per document")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = {
+            "slip + statement": make_document(Path(tmp) / "slip.pdf", args.pages, with_slip=True),
+            "statement only": make_document(Path(tmp) / "statement.pdf", args.pages, with_slip=False),
+        }
+        print(f"{args.pages}-page documents, page cap {PDF_MAX_PAGES}")
+        for name, path in documents.items():
+            full, full_data = timed(lambda: extract_salary_from_pdf(path, max_pages=None, early_stop=False), args.repeat)
+            fast, fast_data = timed(lambda: extract_salary_from_pdf(path), args.repeat)
+            print(f"   {name:<17} full: {full * 1000:8.1f} ms ({full_data['pages_read']} pages)   "
+                  f"incremental: {fast * 1000:7.1f} ms ({fast_data['pages_read']} pages, "
+                  f"early stop {fast_data['stopped_early']})   {full / fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# scripts/bench_salary_extraction.py
+"""
+Salary extraction speed and accuracy against a ground-truth corpus.
+
+Runs extract_salary's pipeline (extract_salary_details, whose "salary" is
+what extract_salary returns) on every file of a corpus written by
+generate_salary_slips.py, and parse_salary_from_text on the rendered text of
+every slip. Reports per-call latency percentiles, throughput and field
+accuracy overall and per format, layout and currency style.
+
+Results can be saved as JSON and compared with an earlier run; the script
+exits with status 1 when accuracy drops or p95 latency grows beyond the
+tolerance, so it can guard parser changes.
+
+Images need the Tesseract binary; without it they are skipped.
+
+Run from the backend directory:
+    python data/scripts/bench_salary_extraction.py --slips 600
+    python data/scripts/bench_salary_extraction.py data/generated_data/salary_slips --save baseline.json
+    python data/scripts/bench_salary_extraction.py data/generated_data/salary_slips --baseline baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+sys.path.insert(0, BASE_DIR)
+
+from bench_ocr_preprocess import tesseract_available
+from generate_salary_slips import find_rupee_font, generate_corpus, load_ground_truth
+from utils.salary_parser import parse_salary_slip
+from utils.scanpdf import extract_salary_details, parse_salary_from_text
+
+FIELDS = ("salary", "net_pay", "gross_pay", "employee_name", "employer", "pay_period")
+GROUP_KEYS = ("format", "layout", "currency")
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def latency_summary(latencies_ms: list, elapsed: float) -> dict:
+    latencies_ms = sorted(latencies_ms)
+    return {
+        "count": len(latencies_ms),
+        "throughput": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 0.5), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "max_ms": round(latencies_ms[-1], 3) if latencies_ms else 0.0,
+    }
+
+
+def accuracy(rows: list, fields=FIELDS) -> dict:
+    """Share of rows whose extracted field equals the truth, per field."""
+    return {field: round(sum(row["fields"].get(field) == row["truth"][field] for row in rows) / len(rows), 4)
+            for field in fields} if rows else {}
+
+
+def group_accuracy(rows: list) -> dict:
+    groups = {}
+    for key in GROUP_KEYS:
+        buckets = defaultdict(list)
+        for row in rows:
+            buckets[row["truth"][key]].append(row)
+        groups[key] = {value: accuracy(bucket, ("salary",))["salary"] for value, bucket in sorted(buckets.items())}
+    return groups
+
+
+def bench_files(corpus_dir: Path, corpus: list) -> tuple:
+    rows, latencies = [], []
+    start = time.perf_counter()
+    for truth in corpus:
+        call_start = time.perf_counter()
+        details = extract_salary_details(corpus_dir / truth["file"])
+        latencies.append((time.perf_counter() - call_start) * 1000)
+        slip = (details or {}).get("slip") or {}
+        fields = {field: slip.get(field) for field in FIELDS}
+        rows.append({"truth": truth, "fields": fields})
+    return rows, latency_summary(latencies, time.perf_counter() - start)
+
+
+def bench_text(corpus: list) -> tuple:
+    latencies = []
+    start = time.perf_counter()
+    salaries = []
+    for truth in corpus:
+        call_start = time.perf_counter()
+        salaries.append(parse_salary_from_text(truth["text"]))
+        latencies.append((time.perf_counter() - call_start) * 1000)
+    summary = latency_summary(latencies, time.perf_counter() - start)
+
+    # Field accuracy from the structured parse parse_salary_from_text wraps
+    rows = []
+    for truth, salary in zip(corpus, salaries):
+        fields = parse_salary_slip(truth["text"]).model_dump()
+        fields["salary"] = salary
+        rows.append({"truth": truth, "fields": fields})
+    return rows, summary
+
+
+def print_section(title: str, summary: dict, rows: list) -> None:
+    print(f"\n{title}: {summary['count']:,} calls, {summary['throughput']:,.1f}/s")
+    print(f"   Latency ms: p50 {summary['p50_ms']:.3f}, p95 {summary['p95_ms']:.3f}, "
+          f"p99 {summary['p99_ms']:.3f}, max {summary['max_ms']:.3f}")
+    print("   Field accuracy:")
+    for field, share in accuracy(rows).items():
+        print(f"      {field:<14} {share:7.1%}")
+    for key, buckets in group_accuracy(rows).items():
+        print(f"   Salary accuracy by {key}: " + ", ".join(f"{value} {share:.1%}" for value, share in buckets.items()))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of the current results against a saved run."""
+    regressions = []
+    for section, current in results.items():
+        previous = baseline.get(section)
+        if not previous:
+            continue
+        for field, share in current["accuracy"].items():
+            before = previous["accuracy"].get(field)
+            if before is not None and share < before - 0.005:
+                regressions.append(f"{section} {field} accuracy {before:.1%} -> {share:.1%}")
+        before, after = previous["latency"]["p95_ms"], current["latency"]["p95_ms"]
+        if before and after > before * (1 + tolerance):
+            regressions.append(f"{section} p95 latency {before:.3f} ms -> {after:.3f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark salary extraction against ground truth")
+    parser.add_argument("corpus", type=Path, nargs="?", help="Corpus from generate_salary_slips.py "
+                                                             "(default: generate one in a temp directory)")
+    parser.add_argument("--slips", type=int, default=600, help="Slips to generate when no corpus is given")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 latency growth")
+    args = parser.parse_args()
+    logging.disable(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus
+        if corpus_dir is None:
+            corpus_dir = Path(tmp)
+            start = time.perf_counter()
+            generate_corpus(corpus_dir, args.slips, seed=args.seed, font_path=find_rupee_font())
+            print(f"Generated {args.slips:,} slips in {time.perf_counter() - start:.1f}s")
+        corpus = load_ground_truth(corpus_dir)
+
+        files = corpus
+        if not tesseract_available():
+            files = [truth for truth in corpus if truth["format"] == "pdf"]
+            print(f"⚠️ Tesseract not installed - {len(corpus) - len(files):,} images skipped")
+
+        results = {}
+        if files:
+            rows, summary = bench_files(corpus_dir, files)
+            print_section("extract_salary (files)", summary, rows)
+            results["extract_salary"] = {"latency": summary, "accuracy": accuracy(rows), "groups": group_accuracy(rows)}
+
+        rows, summary = bench_text(corpus)
+        print_section("parse_salary_from_text (rendered text)", summary, rows)
+        results["parse_salary_from_text"] = {"latency": summary, "accuracy": accuracy(rows),
+                                             "groups": group_accuracy(rows)}
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n✅ Results saved to {args.save}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\n⚠️ Regressions against baseline:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
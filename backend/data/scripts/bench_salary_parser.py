@@ -0,0 +1,165 @@
+# scripts/bench_salary_parser.py
+"""
+Single-pass salary slip parser vs the old per-keyword regex loop.
+
+Generates a synthetic corpus of salary slip texts in several layouts with
+known net pay, gross, name, employer and month, then reports throughput of
+the old salary-only loop, the same loop extended to one regex per field label,
+and the single-pass parser, plus field accuracy of the new parser.
+
+Run from the backend directory:
+    python data/scripts/bench_salary_parser.py --slips 20000
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.salary_parser import parse_salary_slip
+
+FIRST_NAMES = ["Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Meera", "Aditya"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Reddy", "Nair", "Gupta", "Patel", "Singh", "Das", "Menon"]
+EMPLOYERS = ["ACME Industries Pvt Ltd", "Zenith Software Private Limited", "Bharat Steel Limited",
+             "Orbit Analytics LLP", "Sunrise Retail Pvt. Ltd."]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+
+
+def indian(amount: int) -> str:
+    """1234567 -> 12,34,567"""
+    digits = str(amount)
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ",".join([head] + groups + [tail]) if head else ",".join(groups + [tail])
+
+
+def make_slip(rng: random.Random) -> tuple:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    employer = rng.choice(EMPLOYERS)
+    month = rng.randrange(12)
+    year = rng.choice([2023, 2024, 2025])
+    gross = rng.randrange(25000, 400000)
+    net = int(gross * rng.uniform(0.75, 0.92))
+    basic = int(gross * 0.4)
+    layout = rng.randrange(3)
+    if layout == 0:
+        text = (f"{employer}\nSalary Slip for {MONTHS[month]} {year}\n"
+                f"Employee Name: {name}   Employee ID: E{rng.randrange(99999):05d}\n"
+                f"Designation: Analyst   Bank Name: HDFC Bank\n"
+                f"Basic Salary: {indian(basic)}   HRA: {indian(basic // 2)}\n"
+                f"Gross Earnings: Rs. {indian(gross)}.00   Total Deductions: {indian(gross - net)}.00\n"
+                f"Net Pay: Rs. {indian(net)}.00\n")
+    elif layout == 1:
+        text = (f"PAYSLIP\nEmployer: {employer}\nPay Period: {month + 1:02d}/{year}\n"
+                f"Name of Employee - {name}\nEarnings\nBasic {basic}\nGross Salary {gross}\n"
+                f"Deductions {gross - net}\nTake Home Pay ₹{net}\n")
+    else:
+        text = (f"{employer}\nPay slip for the month of {MONTHS[month][:3]}-{year}\n"
+                f"Emp Name : {name}\nUAN: 1009{rng.randrange(10**8):08d}\n"
+                f"Gross Pay : INR {gross:,}\nNet Salary : INR {net:,}\n")
+    truth = {"net_pay": float(net), "gross_pay": float(gross), "employee_name": name,
+             "employer": employer, "pay_period": f"{year}-{month + 1:02d}"}
+    return text, truth
+
+
+LEGACY_KEYWORDS = ["salary", "net pay", "take home", "take-home", "ctc", "gross",
+                   "net salary", "monthly salary", "basic salary", "fixed salary"]
+
+
+def legacy_parse(text: str):
+    """The previous parse_salary_from_text: one regex per keyword, then a fallback scan."""
+    text_lower = text.lower()
+    cleaned_text = text.replace(",", "").replace("₹", "").replace("Rs", "").replace("Rs.", "")
+    for keyword in LEGACY_KEYWORDS:
+        pattern = rf"{keyword}\s*:?\s*[Rs.₹\s]*(\d{{5,7}})"
+        for match in re.findall(pattern, text_lower):
+            salary = int(match)
+            if 10000 <= salary <= 10000000:
+                return float(salary)
+    valid = [int(n) for n in re.findall(r"\b\d{5,7}\b", cleaned_text) if 10000 <= int(n) <= 10000000]
+    return float(max(valid)) if valid else None
+
+
+AMOUNT_LABELS = {
+    "net_pay": ["net pay", "net salary", "take home pay", "take home"],
+    "gross_pay": ["gross pay", "gross salary", "gross earnings", "gross"],
+}
+TEXT_LABELS = {
+    "employee_name": ["employee name", "emp name", "name of employee", "name"],
+    "employer": ["employer", "company name"],
+}
+
+
+def per_label_parse(text: str) -> dict:
+    """The keyword loop extended to every field: one regex search per label."""
+    text_lower = text.lower()
+    fields = {}
+    for field, labels in AMOUNT_LABELS.items():
+        for label in labels:
+            match = re.search(rf"\b{label}\b\s*[:\-]?\s*(?:rs\.?|inr|₹)?\s*(\d[\d,]*)", text_lower)
+            if match:
+                fields[field] = float(match.group(1).replace(",", ""))
+                break
+    for field, labels in TEXT_LABELS.items():
+        for label in labels:
+            match = re.search(rf"\b{label}\b\s*[:\-]\s*([^\n]+)", text, re.IGNORECASE)
+            if match:
+                fields[field] = match.group(1).strip()
+                break
+    match = re.search(r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*[ \-/]*(\d{4})", text_lower)
+    if match:
+        fields["pay_period"] = match.group(0)
+    return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the salary slip parser")
+    parser.add_argument("--slips", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(args.seed)
+    corpus = [make_slip(rng) for _ in range(args.slips)]
+    texts = [text for text, _ in corpus]
+
+    start = time.perf_counter()
+    legacy = [legacy_parse(text) for text in texts]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        per_label_parse(text)
+    per_label_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slips = [parse_salary_slip(text) for text in texts]
+    new_time = time.perf_counter() - start
+
+    print(f"{args.slips} synthetic slips, {sum(map(len, texts)) / 1e6:.1f} MB of text")
+    print(f"   legacy keyword loop (salary only): {legacy_time:6.2f}s ({args.slips / legacy_time:9.0f} slips/s)")
+    print(f"   per-label regex loop (all fields): {per_label_time:6.2f}s ({args.slips / per_label_time:9.0f} slips/s)")
+    print(f"   single-pass parser (all fields):   {new_time:6.2f}s ({args.slips / new_time:9.0f} slips/s)  "
+          f"{per_label_time / new_time:.1f}x vs per-label")
+
+    print("   accuracy (salary = net pay):")
+    print(f"      legacy salary      {sum(l == t['net_pay'] for l, (_, t) in zip(legacy, corpus)) / args.slips:7.1%}")
+    print(f"      salary             {sum(s.salary == t['net_pay'] for s, (_, t) in zip(slips, corpus)) / args.slips:7.1%}")
+    for field in ("net_pay", "gross_pay", "employee_name", "employer", "pay_period"):
+        correct = sum(getattr(slip, field) == truth[field] for slip, (_, truth) in zip(slips, corpus))
+        print(f"      {field:<18} {correct / args.slips:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# scripts/bench_sanction_letter.py
+"""
+Per-letter sanction letter rendering: rebuilt story vs cached template.
+
+The legacy renderer below is the previous generate_sanction_letter_pdf body:
+a fresh stylesheet, paragraph styles, table styles and static paragraphs on
+every letter. The template renderer reuses the ones SanctionLetterTemplate
+built at import. Reported per letter: time and tracemalloc bytes to
+assemble the page 1 story, then time, tracemalloc peak and PDF size of a
+full in-memory render with and without the repayment schedule annexure.
+
+Run from the backend directory:
+    python data/scripts/bench_sanction_letter.py --letters 200 --tenure 36
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from agents.sanction_generator import TERMS, _schedule_tables, render_sanction_letter, sanction_template
+from utils.schedule_export import loan_terms
+
+
+def make_state(i: int, tenure: int) -> dict:
+    return {
+        "customer_id": i,
+        "customer_name": f"Customer {i}",
+        "verified_address": f"House No {i % 300}, MG Road, Bengaluru",
+        "verified_phone": f"+9198{i:08d}",
+        "requested_loan_amount": 100000.0 + (i % 40) * 10000,
+        "negotiated_interest_rate": 11.5,
+        "requested_tenure": tenure,
+        "calculated_emi": 4500.0 + i % 100,
+    }
+
+
+def legacy_story(state: dict) -> list:
+    """The story as the previous renderer built it, styles included."""
+    story = []
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18,
+                                 textColor=colors.HexColor('#1a237e'), spaceAfter=30, alignment=1)
+    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=12,
+                                   textColor=colors.HexColor('#1a237e'), spaceAfter=12)
+    story.append(Paragraph("LOAN SANCTION LETTER", title_style))
+    story.append(Spacer(1, 0.2 * inch))
+    now = datetime.now()
+    story.append(Paragraph(f"<b>Date:</b> {now.strftime('%B %d, %Y')}", styles['Normal']))
+    story.append(Paragraph(f"<b>Reference No:</b> SL/{state['customer_id']}/{now.strftime('%Y%m%d')}",
+                           styles['Normal']))
+    story.append(Spacer(1, 0.3 * inch))
+    story.append(Paragraph("BORROWER DETAILS", heading_style))
+    customer_table = Table([
+        ['Name:', state['customer_name']],
+        ['Address:', state['verified_address']],
+        ['Phone:', state['verified_phone']],
+        ['Customer ID:', str(state['customer_id'])],
+    ], colWidths=[2*inch, 4*inch])
+    customer_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ]))
+    story.append(customer_table)
+    story.append(Spacer(1, 0.3 * inch))
+    story.append(Paragraph("LOAN DETAILS", heading_style))
+    total_repayment = state['calculated_emi'] * state['requested_tenure']
+    total_interest = total_repayment - state['requested_loan_amount']
+    loan_table = Table([
+        ['Loan Amount:', f"₹{state['requested_loan_amount']:,.2f}"],
+        ['Interest Rate:', f"{state['negotiated_interest_rate']}% per annum"],
+        ['Loan Tenure:', f"{state['requested_tenure']} months"],
+        ['Monthly EMI:', f"₹{state['calculated_emi']:,.2f}"],
+        ['Total Interest:', f"₹{total_interest:,.2f}"],
+        ['Total Repayment:', f"₹{total_repayment:,.2f}"],
+    ], colWidths=[2*inch, 4*inch])
+    loan_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f5f5f5')),
+    ]))
+    story.append(loan_table)
+    story.append(Spacer(1, 0.3 * inch))
+    story.append(Paragraph("TERMS & CONDITIONS", heading_style))
+    for i, term in enumerate(TERMS, 1):
+        story.append(Paragraph(f"{i}. {term}", styles['Normal']))
+        story.append(Spacer(1, 0.1 * inch))
+    story.append(Spacer(1, 0.3 * inch))
+    congrats_style = ParagraphStyle('Congrats', parent=styles['Normal'], fontSize=11,
+                                    textColor=colors.HexColor('#2e7d32'), spaceAfter=12)
+    story.append(Paragraph("Congratulations on your loan approval! We look forward to serving you.",
+                           congrats_style))
+    story.append(Spacer(1, 0.3 * inch))
+    story.append(Paragraph("<b>Authorized Signatory</b>", styles['Normal']))
+    story.append(Paragraph("Loan Department", styles['Normal']))
+    story.append(Paragraph("CredSaathi Bank", styles['Normal']))
+    schedule_terms = loan_terms(state)
+    if schedule_terms:
+        story.append(PageBreak())
+        story.append(Paragraph("ANNEXURE: REPAYMENT SCHEDULE (amounts in INR)", heading_style))
+        story.extend(_schedule_tables(*schedule_terms, style=sanction_template.schedule_table_style))
+    return story
+
+
+def legacy_render(state: dict, output) -> None:
+    SimpleDocTemplate(output, pagesize=A4).build(legacy_story(state))
+
+
+def run(render, states: list) -> tuple:
+    """(mean ms per letter, mean peak KiB per letter, mean PDF bytes)"""
+    for state in states[:5]:
+        render(state, io.BytesIO())
+
+    start = time.perf_counter()
+    size = 0
+    for state in states:
+        out = io.BytesIO()
+        render(state, out)
+        size += out.tell()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks = 0
+    for state in states[:50]:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        render(state, io.BytesIO())
+        peaks += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return elapsed / len(states) * 1000, peaks / min(50, len(states)) / 1024, size / len(states)
+
+
+def story_cost(build, states: list) -> tuple:
+    """(mean ms, mean allocated KiB) to assemble the page 1 story without laying it out."""
+    start = time.perf_counter()
+    for state in states:
+        build(state)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    stories = [build(state) for state in states[:50]]
+    allocated = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del stories
+    return elapsed / len(states) * 1000, allocated / min(50, len(states)) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sanction letter rendering")
+    parser.add_argument("--letters", type=int, default=200)
+    parser.add_argument("--tenure", type=int, default=36, help="Months (annexure rows per letter)")
+    args = parser.parse_args()
+
+    states = [make_state(i, args.tenure) for i in range(args.letters)]
+    now = datetime.now()
+    # Page 1 only: the schedule annexure is identical work in both renderers
+    no_schedule = [dict(state, negotiated_interest_rate=None) for state in states]
+    stories = {
+        "legacy": story_cost(legacy_story, no_schedule),
+        "template": story_cost(lambda state: sanction_template.story(state, now), no_schedule),
+    }
+    print(f"{args.letters} letters")
+    print("   story assembly (page 1):")
+    for name, (ms, kib) in stories.items():
+        print(f"      {name:<9} {ms:7.3f} ms  {kib:8.1f} KiB allocated per letter")
+    print(f"      {stories['legacy'][0] / stories['template'][0]:.1f}x faster, "
+          f"{1 - stories['template'][1] / stories['legacy'][1]:.0%} fewer bytes")
+
+    for label, batch in (("page 1 only", no_schedule), (f"with {args.tenure}-month annexure", states)):
+        print(f"   full render, {label}:")
+        results = {"legacy": run(legacy_render, batch), "template": run(render_sanction_letter, batch)}
+        for name, (ms, kib, size) in results.items():
+            print(f"      {name:<9} {ms:7.2f} ms  peak {kib:8.1f} KiB  {size / 1024:6.1f} KiB PDF")
+        print(f"      {results['legacy'][0] / results['template'][0]:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# scripts/bench_state_codec.py
+"""
+AgentState serialization: graph.state_codec vs pickle and JSON.
+
+Builds synthetic sessions shaped like a real application (the state
+main.initialize_state creates, negotiated terms, affordability and
+counter-offers, and a mix of plain and tool-calling messages), and reports
+snapshot size and mean encode/decode time per session length for the codec
+(msgpack, msgpack+zstd, JSON) against pickle, pickle+zstd and JSON
+(messages_to_dict + orjson), the formats persistence would otherwise use.
+
+Codec correctness (round trips, bad and forged snapshots) is covered by
+tests/test_state_codec.py.
+
+Run from the backend directory:
+    python data/scripts/bench_state_codec.py --lengths 20 200 1000
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+import orjson
+import zstandard
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, messages_from_dict, messages_to_dict
+from langgraph.graph.message import add_messages
+
+from graph.state_codec import decode_state, encode_state
+
+CUSTOMER_LINES = (
+    "Hi, I need a personal loan of 5 lakhs for my sister's wedding",
+    "Can you do 36 months? The EMI looks a bit high for me",
+    "My salary is 85000 per month, I work at Infosys in Pune",
+    "Okay that works, please go ahead",
+)
+AGENT_LINES = (
+    "Great! Based on your profile you are pre-approved for up to ₹6,00,000 at 11.5% p.a.",
+    "For ₹5,00,000 over 36 months your EMI would be ₹16,488. Shall I proceed with verification?",
+    "Thanks! Your KYC is verified against our records. Running the credit assessment now.",
+    "Congratulations! Your loan is approved. Your sanction letter is being prepared.",
+)
+
+
+def make_state(length: int) -> dict:
+    """A session with `length` messages; every 25th AI message carries a tool call."""
+    messages = [SystemMessage(content="You are CredSaathi, a loan sales assistant.")]
+    for i in range(1, length):
+        if i % 2:
+            messages.append(HumanMessage(content=CUSTOMER_LINES[i // 2 % len(CUSTOMER_LINES)]))
+        elif i % 25 == 0:
+            messages.append(AIMessage(content="", tool_calls=[
+                {"name": "calculate_emi", "args": {"principal": 500000, "rate": 11.5, "tenure": 36}, "id": f"call_{i}"}
+            ]))
+        else:
+            messages.append(AIMessage(content=AGENT_LINES[i // 2 % len(AGENT_LINES)]))
+
+    return {
+        "messages": add_messages([], messages),
+        "conversation_summary": "Customer: Hi, I need a personal loan\nAgent: Great! You are pre-approved",
+        "summarized_messages": 40,
+        "last_ai_message": AGENT_LINES[-1],
+        "session_id": "0b9e6a4c-3f1d-4d2e-9a57-6c1f0e8b2d41",
+        "phone": "+919876543210",
+        "customer_name": "Priya Sharma",
+        "customer_id": "CUST0042",
+        "age": 31,
+        "city": "Pune",
+        "current_loan_details": {"existing_emi": 4200, "loans": [{"type": "vehicle", "outstanding": 120000}]},
+        "requested_loan_amount": 500000.0,
+        "requested_tenure": 36,
+        "negotiated_interest_rate": 11.5,
+        "kyc_verified": True,
+        "verified_phone": "+919876543210",
+        "verified_address": "12 MG Road, Pune",
+        "credit_score": 782,
+        "pre_approved_limit": 600000.0,
+        "salary_slip_required": True,
+        "salary_slip_uploaded": True,
+        "monthly_salary": 85000.0,
+        "salary_slip_hash": "9f2c" * 16,
+        "salary_slip_reuse_count": 0,
+        "salary_slip": None,
+        "calculated_emi": 16488.0,
+        "affordability": {"max_emi": 38250.0, "foir": 0.45, "headroom": 17562.0},
+        "counter_offers": [{"amount": 450000.0, "tenure": 48, "emi": 11782.0}],
+        "fraud_risk_score": 0.12,
+        "fraud_flags": [],
+        "fraud_detected": False,
+        "fraud_cluster_size": 1,
+        "fraud_cluster_rejection_rate": 0.0,
+        "advisor_guidance_provided": False,
+        "advisor_recommendations": None,
+        "loan_status": "approved",
+        "rejection_reason": None,
+        "sanction_letter_generated": True,
+        "sanction_letter_path": None,
+        "sanction_letter_hash": "ab01" * 16,
+        "sanction_letter_issued_at": "2026-10-19T10:42:07",
+        "sanction_letter_id": "SL-20261019-0042",
+        "sanction_letter_status": "ready",
+        "current_agent": "master_final",
+        "workflow_complete": True,
+        "policy_version": "2026.10",
+        "loan_purpose": "wedding",
+    }
+
+
+def pickle_zstd_dumps(state):
+    return zstandard.ZstdCompressor(level=3).compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def pickle_zstd_loads(data):
+    return pickle.loads(zstandard.ZstdDecompressor().decompress(data))
+
+
+def json_dumps(state):
+    return orjson.dumps({**state, "messages": messages_to_dict(state["messages"])})
+
+
+def json_loads(data):
+    state = orjson.loads(data)
+    state["messages"] = messages_from_dict(state["messages"])
+    return state
+
+
+FORMATS = {
+    "codec": (lambda s: encode_state(s, compress=False), decode_state),
+    "codec+zstd": (encode_state, decode_state),
+    "codec json": (lambda s: encode_state(s, compress=False, binary=False), decode_state),
+    "pickle": (lambda s: pickle.dumps(s, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    "pickle+zstd": (pickle_zstd_dumps, pickle_zstd_loads),
+    "json": (json_dumps, json_loads),
+}
+
+
+def measure(dumps, loads, state, repeat: int):
+    """(size in bytes, mean encode ms, mean decode ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = dumps(state)
+    encode_ms = (time.perf_counter() - start) / repeat * 1000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loads(data)
+    decode_ms = (time.perf_counter() - start) / repeat * 1000
+    return len(data), encode_ms, decode_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AgentState serialization formats")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[20, 200, 1000],
+                        help="Session lengths (messages) to measure")
+    parser.add_argument("--repeat", type=int, default=50, help="Encode/decode runs per format and length")
+    args = parser.parse_args()
+
+    for length in args.lengths:
+        state = make_state(length)
+        print(f"\n{length} messages")
+        print(f"   {'format':<12}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}")
+        for name, (dumps, loads) in FORMATS.items():
+            size, encode_ms, decode_ms = measure(dumps, loads, state, args.repeat)
+            print(f"   {name:<12}{size:>10}{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
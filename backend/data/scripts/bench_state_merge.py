@@ -0,0 +1,118 @@
+# scripts/bench_state_merge.py
+"""
+LangGraph state merge overhead per node: whole-state returns vs partial updates.
+
+Builds a StateGraph over AgentState shaped like the approval path (master →
+sales → verification → underwriting → fraud → sanction → master_final) with
+nodes that do no work except write a few keys and add one AIMessage:
+
+    whole         mutate the input state and return all of it (previous nodes)
+    partial       return {"messages": [new], ...changed keys} by hand
+    state_update  the same through graph.state_update.StateUpdate (current nodes)
+
+and reports the mean time per node as the conversation history grows, so
+the cost LangGraph spends merging channels (add_messages over the whole
+history for whole-state returns) is visible on its own.
+
+Run from the backend directory:
+    python data/scripts/bench_state_merge.py --lengths 10 50 100 200 400 800
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, StateGraph
+from langgraph.graph.message import add_messages
+
+from graph.state import AgentState
+from graph.state_update import StateUpdate
+
+NODES = ("master", "sales", "verification", "underwriting", "fraud", "sanction", "master_final")
+
+
+def whole_node(name: str):
+    def node(state):
+        state["messages"].append(AIMessage(content=f"{name} reply"))
+        state["current_agent"] = name
+        state["loan_status"] = "approved"
+        return state
+    return node
+
+
+def partial_node(name: str):
+    def node(state):
+        return {"messages": [AIMessage(content=f"{name} reply")], "current_agent": name, "loan_status": "approved"}
+    return node
+
+
+def state_update_node(name: str):
+    def node(state):
+        state = StateUpdate(state)
+        state.add_message(AIMessage(content=f"{name} reply"))
+        state["current_agent"] = name
+        state["loan_status"] = "approved"
+        return state.changes()
+    return node
+
+
+def build_graph(make_node):
+    graph = StateGraph(AgentState)
+    for name in NODES:
+        graph.add_node(name, make_node(name))
+    graph.set_entry_point(NODES[0])
+    for current, following in zip(NODES, NODES[1:]):
+        graph.add_edge(current, following)
+    graph.add_edge(NODES[-1], END)
+    return graph.compile()
+
+
+def make_history(length: int) -> list:
+    """Stored session history: messages already carry ids from earlier turns."""
+    messages = [HumanMessage(content=f"message {i}") if i % 2 == 0 else AIMessage(content=f"reply {i}")
+                for i in range(length)]
+    return add_messages([], messages)
+
+
+def time_turn(workflow, history: list, turns: int) -> float:
+    """Mean ms per node over `turns` invocations from the same history."""
+    elapsed = 0.0
+    for _ in range(turns):
+        state = {"messages": list(history) + [HumanMessage(content="new turn")], "phone": "+919800000000",
+                 "loan_status": "negotiating", "current_agent": "master"}
+        start = time.perf_counter()
+        workflow.invoke(state)
+        elapsed += time.perf_counter() - start
+    return elapsed / turns / len(NODES) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-node state merge overhead")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 50, 100, 200, 400, 800],
+                        help="Conversation lengths (messages) to measure")
+    parser.add_argument("--turns", type=int, default=30, help="Invocations per length")
+    args = parser.parse_args()
+
+    workflows = {
+        "whole": build_graph(whole_node),
+        "partial": build_graph(partial_node),
+        "state_update": build_graph(state_update_node),
+    }
+    for workflow in workflows.values():
+        time_turn(workflow, make_history(10), 3)
+
+    print(f"Mean ms per node ({len(NODES)} nodes per turn, {args.turns} turns per length)")
+    print(f"   {'messages':>8}" + "".join(f"{name:>14}" for name in workflows) + f"{'speedup':>10}")
+    for length in args.lengths:
+        history = make_history(length)
+        results = {name: time_turn(workflow, history, args.turns) for name, workflow in workflows.items()}
+        print(f"   {length:>8}" + "".join(f"{ms:>14.3f}" for ms in results.values())
+              + f"{results['whole'] / results['state_update']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
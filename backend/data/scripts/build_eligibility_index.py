@@ -0,0 +1,119 @@
+# scripts/build_eligibility_index.py
+"""
+Batch job: precompute every customer's pre-qualification into the eligibility index.
+
+For each customer it stores the instant-approval ceiling, the salary-slip band
+ceiling, the offered tenure, the rate and the EMI at the instant ceiling for
+the standard tenures, using the active credit policy. Run it whenever
+customer, bureau or offer data is refreshed; the chat server picks up the new
+file without a restart.
+
+Run from the backend directory:
+    python data/scripts/build_eligibility_index.py
+    python data/scripts/build_eligibility_index.py --synthetic 10000000 -o /tmp/eligibility.idx
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.eligibility_index import (
+    DEFAULT_INDEX_PATH,
+    EligibilityIndex,
+    compute_eligibility,
+    phone_key,
+    place_records,
+    write_eligibility_index,
+)
+from utils.policy import policy_store
+
+DATA_DIR = os.path.join(BASE_DIR, "../generated_data")
+
+
+def load_customer_base() -> dict:
+    """Join offers with bureau scores (falling back to the customer profile)."""
+    with open(os.path.join(DATA_DIR, "offers.json")) as f:
+        offers = json.load(f)
+    with open(os.path.join(DATA_DIR, "credit_bureau.json")) as f:
+        bureau = json.load(f)
+    with open(os.path.join(DATA_DIR, "crm.json")) as f:
+        crm = json.load(f)
+    with open(os.path.join(DATA_DIR, "customers.json")) as f:
+        customers = {c["name"]: c for c in json.load(f)}
+
+    rows = []
+    for offer in offers:
+        phone = offer["phone"]
+        score = bureau.get(phone, {}).get("credit_score")
+        if score is None:
+            score = customers.get(crm.get(phone, {}).get("name"), {}).get("credit_score", 0)
+        rows.append((phone_key(phone), score, offer["offer_amount"],
+                     offer["interest_rate"], offer["tenure_months"]))
+
+    keys, score, limit, rate, tenure = zip(*rows)
+    return {
+        "keys": np.array(keys, dtype=np.uint64),
+        "credit_score": np.array(score, dtype=np.float64),
+        "pre_approved_limit": np.array(limit, dtype=np.float64),
+        "interest_rate": np.array(rate, dtype=np.float64),
+        "tenure_months": np.array(tenure, dtype=np.int64),
+    }
+
+
+def synthetic_customers(n: int, seed: int = 7) -> dict:
+    """Random customers shaped like generate_data.py output, with unique phones."""
+    rng = np.random.default_rng(seed)
+    return {
+        "keys": (917000000000 + rng.permutation(n)).astype(np.uint64),
+        "credit_score": rng.integers(550, 901, n).astype(np.float64),
+        "pre_approved_limit": rng.choice([50000, 100000, 150000, 200000, 300000], n).astype(np.float64),
+        "interest_rate": np.round(rng.uniform(10.0, 15.0, n), 2),
+        "tenure_months": rng.choice([12, 18, 24, 36, 48, 60], n),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the customer eligibility index")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_INDEX_PATH), help="Index file to write")
+    parser.add_argument("--synthetic", type=int, help="Index N synthetic customers instead of the customer base")
+    parser.add_argument("--lookups", type=int, default=100000, help="Random lookups to time after the build")
+    args = parser.parse_args()
+
+    policy = policy_store.current()
+    start = time.perf_counter()
+    customers = synthetic_customers(args.synthetic) if args.synthetic else load_customer_base()
+    loaded = time.perf_counter()
+
+    records = compute_eligibility(**customers, policy=policy)
+    computed = time.perf_counter()
+    table = place_records(records)
+    placed = time.perf_counter()
+    size = write_eligibility_index(args.output, table, policy.version)
+    written = time.perf_counter()
+
+    n = len(records)
+    print(f"✅ Indexed {n:,} customers with policy {policy.version} → {args.output}")
+    print(f"   {len(table):,} slots ({n / len(table):.0%} full), {size / 1e6:,.1f} MB")
+    print(f"   load {loaded - start:.2f}s | compute {computed - loaded:.2f}s | "
+          f"hash {placed - computed:.2f}s | write {written - placed:.2f}s | "
+          f"total {written - start:.2f}s")
+
+    index = EligibilityIndex(args.output)
+    keys = customers["keys"]
+    sample = [f"+{keys[random.randrange(n)]}" for _ in range(min(args.lookups, n * 10))]
+    lookup_start = time.perf_counter()
+    missing = sum(index.lookup(phone) is None for phone in sample)
+    lookup_time = time.perf_counter() - lookup_start
+    print(f"{'✅' if missing == 0 else '⚠️'} {len(sample):,} lookups, {missing} missing, "
+          f"{lookup_time / len(sample) * 1e6:.1f} µs/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# scripts/bulk_sanction_letters.py
+"""
+Render sanction letters for a batch of approved applications.
+
+For branch-assisted campaigns: instead of driving the conversational graph
+per customer, approved applications are read from JSONL and their letters
+rendered on a process pool straight from the letter fields
+(SANCTION_LETTER_FIELDS). Input is read in chunks and results come back in
+input order with a bounded number of chunks in flight, so memory stays flat
+for 10k-letter batches.
+
+Output directory:
+    letters/<line>-<application_id>.pdf   one file per input line
+    merged/volume_0001.pdf ...            optional (--merge), --volume-size letters each
+    manifest.jsonl                        one line per application, written as it completes
+
+Input records carry customer_id, customer_name, verified_address,
+verified_phone, requested_loan_amount, negotiated_interest_rate,
+requested_tenure and calculated_emi, plus an optional application_id
+(default: customer_id).
+
+File names start with the input line number, so no letter ever overwrites
+another, whatever the ids look like. An application_id seen on an earlier
+line is reported (duplicate_of_line in the manifest, and a count at the
+end). Merged volumes are built from the PDF bytes each worker returns, not
+by re-reading files from the letters directory.
+
+Run from the backend directory:
+    python data/scripts/bulk_sanction_letters.py approved.jsonl -o campaign_letters
+    python data/scripts/bulk_sanction_letters.py approved.jsonl -o campaign_letters --merge --volume-size 500
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from agents.sanction_generator import SANCTION_LETTER_FIELDS, reference_number, render_sanction_letter
+
+REQUIRED_FIELDS = ("customer_id", "customer_name", "requested_loan_amount", "requested_tenure", "calculated_emi")
+
+
+def _file_stem(application_id) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(application_id)) or "application"
+
+
+def render_record(record: dict, line_number: int, letters_dir: Path, issued_at: datetime,
+                  return_pdf: bool = False) -> dict:
+    """
+    Render one letter to letters_dir; returns its manifest entry
+    (plus the PDF bytes under "pdf" when return_pdf is set).
+    """
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    letter = {field: record.get(field) for field in SANCTION_LETTER_FIELDS}
+    application_id = record.get("application_id", letter["customer_id"])
+
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    pages = render_sanction_letter(letter, buffer, issued_at)
+    data = buffer.getvalue()
+    path = letters_dir / f"{line_number:06d}-{_file_stem(application_id)}.pdf"
+    path.write_bytes(data)
+    result = {
+        "line": line_number,
+        "application_id": application_id,
+        "customer_id": letter["customer_id"],
+        "customer_name": letter["customer_name"],
+        "reference": reference_number(letter, issued_at),
+        "file": str(path),
+        "pages": pages,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "render_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    if return_pdf:
+        result["pdf"] = data
+    return result
+
+
+def render_chunk(chunk: list, letters_dir: str, issued_at: datetime, return_pdf: bool) -> list:
+    """Worker entry point - records arrive as (line number, raw JSON line)."""
+    results = []
+    for line_number, line in chunk:
+        try:
+            results.append(render_record(json.loads(line), line_number, Path(letters_dir), issued_at, return_pdf))
+        except Exception as e:
+            results.append({"line": line_number, "error": f"{type(e).__name__}: {e}", "input": line.strip()})
+    return results
+
+
+def iter_jsonl_chunks(path: Path, chunk_size: int):
+    """Yield lists of (line number, raw line); parsing happens in the workers."""
+    with path.open("r", encoding="utf-8") as f:
+        lines = ((number, line) for number, line in enumerate(f, 1) if line.strip())
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def render_stream(pool: Pool, chunks, window: int, letters_dir: Path, issued_at: datetime, return_pdf: bool):
+    """Yield result chunks in input order with at most `window` chunks in flight."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.apply_async(render_chunk, (chunk, str(letters_dir), issued_at, return_pdf)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+class VolumeWriter:
+    """
+    Appends letters to merged PDF volumes of at most volume_size letters.
+    Only the open volume's pages are held in memory.
+    """
+
+    def __init__(self, merged_dir: Path, volume_size: int) -> None:
+        # Optional: only needed for --merge
+        from pypdf import PdfReader, PdfWriter
+
+        self._reader_class = PdfReader
+        self._writer_class = PdfWriter
+        self.merged_dir = merged_dir
+        self.volume_size = volume_size
+        self.volumes = 0
+        self._writer = None
+        self._letters = 0
+        self._pages = 0
+
+    def add(self, pdf: bytes) -> dict:
+        """Append a letter's PDF bytes; returns its volume file and first page (1-based)."""
+        if self._writer is None:
+            self._writer = self._writer_class()
+            self.volumes += 1
+            self._letters = self._pages = 0
+        first_page = self._pages + 1
+        self._writer.append(self._reader_class(io.BytesIO(pdf)))
+        self._pages = len(self._writer.pages)
+        self._letters += 1
+        location = {"volume": str(self._volume_path()), "volume_page": first_page}
+        if self._letters >= self.volume_size:
+            self.close()
+        return location
+
+    def _volume_path(self) -> Path:
+        return self.merged_dir / f"volume_{self.volumes:04d}.pdf"
+
+    def close(self) -> None:
+        if self._writer is not None:
+            with self._volume_path().open("wb") as f:
+                self._writer.write(f)
+            self._writer.close()
+            self._writer = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render sanction letters for approved applications")
+    parser.add_argument("input", type=Path, help="JSONL file of approved applications")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Letters per worker task")
+    parser.add_argument("--merge", action="store_true", help="Also write merged PDF volumes")
+    parser.add_argument("--volume-size", type=int, default=500, help="Letters per merged volume")
+    parser.add_argument("--date", type=datetime.fromisoformat, help="Issue date (default: now), YYYY-MM-DD")
+    args = parser.parse_args()
+
+    issued_at = args.date or datetime.now()
+    letters_dir = args.output / "letters"
+    letters_dir.mkdir(parents=True, exist_ok=True)
+    volumes = None
+    if args.merge:
+        merged_dir = args.output / "merged"
+        merged_dir.mkdir(exist_ok=True)
+        volumes = VolumeWriter(merged_dir, args.volume_size)
+
+    total = errors = pages = duplicates = 0
+    # application_id → first input line; ids are small next to the letters themselves
+    seen_ids = {}
+    start = time.perf_counter()
+    manifest_path = args.output / "manifest.jsonl"
+    with Pool(processes=args.workers) as pool, manifest_path.open("w", encoding="utf-8") as manifest:
+        chunks = iter_jsonl_chunks(args.input, args.chunk_size)
+        for results in render_stream(pool, chunks, args.workers * 2, letters_dir, issued_at, args.merge):
+            for result in results:
+                total += 1
+                if "error" in result:
+                    errors += 1
+                else:
+                    pages += result["pages"]
+                    key = json.dumps(result["application_id"])
+                    first_line = seen_ids.setdefault(key, result["line"])
+                    if first_line != result["line"]:
+                        duplicates += 1
+                        result["duplicate_of_line"] = first_line
+                    if volumes:
+                        result.update(volumes.add(result.pop("pdf")))
+                manifest.write(json.dumps(result) + "\n")
+            manifest.flush()
+
+            if total % (args.chunk_size * 20) < len(results):
+                rate = total / (time.perf_counter() - start)
+                print(f"   {total:,} letters ({rate:,.1f}/s)")
+    if volumes:
+        volumes.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Rendered {total - errors:,} sanction letters ({pages:,} pages) in {elapsed:.1f}s "
+          f"({total / elapsed if elapsed else 0:,.1f}/s)")
+    print(f"   Letters: {letters_dir}")
+    if volumes:
+        print(f"   Merged volumes: {volumes.volumes} in {volumes.merged_dir}")
+    print(f"   Manifest: {manifest_path}")
+    if errors:
+        print(f"⚠️ {errors:,} applications failed - see \"error\" entries in the manifest")
+    if duplicates:
+        print(f"⚠️ {duplicates:,} applications reuse an earlier application_id - "
+              f"see \"duplicate_of_line\" entries in the manifest")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# scripts/gc_storage.py
+"""
+Retention job for stored sanction letters and uploaded salary slips.
+
+Deletes letters unused (stored, reissued or downloaded) for --letters-days
+and salary slips not uploaded again for --slips-days, with their cached
+extraction results. A letter that is downloaded after it was collected is
+rendered again on demand. Meant to run daily from cron while the API is up;
+--dry-run only reports what would be deleted.
+
+Store locations and defaults follow the API's CREDSAATHI_LETTER_STORE_DIR,
+CREDSAATHI_SLIP_STORE_DIR, CREDSAATHI_LETTER_RETENTION_DAYS and
+CREDSAATHI_SLIP_RETENTION_DAYS.
+
+Run from the backend directory:
+    python data/scripts/gc_storage.py --dry-run
+    python data/scripts/gc_storage.py --letters-days 90 --slips-days 180
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.letter_store import LETTER_RETENTION_DAYS, letter_store
+from utils.slip_store import SLIP_RETENTION_DAYS, slip_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired sanction letters and salary slips")
+    parser.add_argument("--letters-days", type=float, default=LETTER_RETENTION_DAYS,
+                        help="Keep letters used within this many days")
+    parser.add_argument("--slips-days", type=float, default=SLIP_RETENTION_DAYS,
+                        help="Keep salary slips uploaded within this many days")
+    parser.add_argument("--dry-run", action="store_true", help="Report only, delete nothing")
+    args = parser.parse_args()
+
+    verb = "Would delete" if args.dry_run else "Deleted"
+
+    start = time.perf_counter()
+    letters = letter_store.collect_garbage(args.letters_days, dry_run=args.dry_run)
+    print(f"Sanction letters ({letter_store.root}, {args.letters_days:g} days):")
+    print(f"   {verb} {letters['deleted']:,} letters and {letters['legacy_deleted']:,} legacy files "
+          f"({letters['deleted_bytes'] / 1024 / 1024:,.1f} MiB), kept {letters['kept']:,}")
+    stats = letter_store.statistics()
+    print(f"   Index: {stats['letter_keys']:,} letter keys → {stats['documents']:,} documents")
+
+    slips = slip_store.collect_garbage(args.slips_days, dry_run=args.dry_run)
+    print(f"Salary slips ({slip_store.root}, {args.slips_days:g} days):")
+    print(f"   {verb} {slips['deleted']:,} slips and {slips['results_deleted']:,} cached results "
+          f"({slips['deleted_bytes'] / 1024 / 1024:,.1f} MiB), kept {slips['kept']:,}")
+    stats = slip_store.statistics()
+    print(f"   Index: {stats['documents']:,} documents, {stats['shared_documents']:,} shared across customers")
+
+    print(f"\n✅ Done in {time.perf_counter() - start:.2f}s" + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+# scripts/generate_salary_slips.py
+"""
+Synthetic salary slip corpus with known ground truth.
+
+Each slip is drawn from a set of layouts (header + two columns, earnings /
+deductions table, compact label list, salary credit advice whose amount has
+no label), currency styles ("Rs. 85,000.00", "Rs.85,000", "₹85,000",
+"INR 85000", "INR85000", "85,000/-", Indian or western digit grouping),
+label wordings and noise (allowances, YTD totals, account numbers, footers).
+Slips are written as text PDFs (reportlab), clean PNG scans or JPEG phone
+photos, and every file gets a line in ground_truth.jsonl with the expected
+fields and the plain text that was rendered.
+
+The base PDF fonts cannot encode ₹; a TrueType font with the glyph is looked
+up (DejaVu Sans, Arial Unicode, Nirmala UI or --font) and when none is found
+₹ slips are rendered with "Rs." instead.
+
+Run from the backend directory:
+    python data/scripts/generate_salary_slips.py --slips 2000
+    python data/scripts/generate_salary_slips.py --slips 500 --formats pdf,png -o /tmp/slips
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+DEFAULT_OUTPUT_DIR = Path(BASE_DIR).parent / "generated_data" / "salary_slips"
+FORMATS = ("pdf", "png", "jpg")
+
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "C:/Windows/Fonts/Nirmala.ttf",
+)
+RUPEE = "\u20b9"
+
+FIRST_NAMES = ["Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Meera",
+               "Aditya", "Neha", "Kunal", "Riya", "Amit", "Divya", "Sanjay"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Reddy", "Nair", "Gupta", "Patel", "Singh", "Das", "Menon",
+              "Khanna", "Desai", "Rao", "Bose", "Mehta", "Kulkarni"]
+EMPLOYERS = ["ACME Industries Pvt Ltd", "Zenith Software Private Limited", "Bharat Steel Limited",
+             "Orbit Analytics LLP", "Sunrise Retail Pvt. Ltd.", "Kaveri Logistics Pvt Ltd",
+             "Northwind Consulting Private Limited", "Ganga Textiles Limited"]
+BANKS = ["HDFC Bank", "State Bank of India", "ICICI Bank", "Axis Bank", "Kotak Mahindra Bank"]
+DESIGNATIONS = ["Analyst", "Senior Engineer", "Sales Executive", "Accountant", "Team Lead", "Manager"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+
+LAYOUTS = ("columns", "table", "compact", "advice")
+CURRENCIES = ("rs", "rs_tight", "rupee", "inr", "inr_tight", "plain", "suffix")
+NET_LABELS = ["Net Pay", "Net Salary", "Take Home Pay", "Net Amount Payable", "Amount Credited"]
+GROSS_LABELS = ["Gross Earnings", "Gross Salary", "Total Earnings", "Gross Pay"]
+NAME_LABELS = ["Employee Name", "Emp Name", "Name of Employee", "Name"]
+ALLOWANCES = ["HRA", "Conveyance", "Special Allowance", "Medical Allowance", "LTA", "Bonus"]
+DEDUCTIONS = ["Provident Fund", "Professional Tax", "Income Tax (TDS)", "ESI", "Loan Recovery"]
+FOOTERS = ["This is a computer generated payslip and does not require a signature.",
+           "Please report discrepancies to payroll within 7 days.",
+           "Figures in Indian Rupees."]
+
+
+def indian(amount: int) -> str:
+    """1234567 -> 12,34,567"""
+    digits = str(amount)
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ",".join([head] + groups + [tail]) if head else ",".join(groups + [tail])
+
+
+def find_rupee_font(path: str = None):
+    """A TrueType font file that has the ₹ glyph, or None."""
+    for candidate in ([path] if path else []) + list(FONT_CANDIDATES):
+        if candidate and os.path.exists(candidate):
+            try:
+                if ord(RUPEE) in TTFont("probe", candidate).face.charToGlyph:
+                    return candidate
+            except Exception:
+                continue
+    return None
+
+
+class SlipStyle:
+    """How amounts and labels are written on one slip."""
+
+    def __init__(self, rng: random.Random, rupee: bool) -> None:
+        self.currency = rng.choice(CURRENCIES if rupee else [c for c in CURRENCIES if c != "rupee"])
+        self.grouping = rng.choice(["indian", "western", "none"])
+        self.decimals = rng.random() < 0.4
+
+    def amount(self, value: int) -> str:
+        if self.grouping == "indian":
+            digits = indian(value)
+        elif self.grouping == "western":
+            digits = f"{value:,}"
+        else:
+            digits = str(value)
+        if self.decimals:
+            digits += ".00"
+        if self.currency == "rs":
+            return f"Rs. {digits}"
+        if self.currency == "rs_tight":
+            return f"Rs.{digits}"
+        if self.currency == "rupee":
+            return f"{RUPEE}{digits}"
+        if self.currency == "inr":
+            return f"INR {digits}"
+        if self.currency == "inr_tight":
+            return f"INR{digits}"
+        if self.currency == "suffix":
+            return f"{digits}/-"
+        return digits
+
+
+def make_slip(rng: random.Random, rupee: bool = True) -> tuple:
+    """
+    One synthetic slip.
+
+    Returns:
+        (rows, truth) - rows is a list of lines, each a list of (x, text)
+        cells with x as a fraction of the page width; truth holds the
+        expected fields plus layout metadata
+    """
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    employer = rng.choice(EMPLOYERS)
+    month, year = rng.randrange(12), rng.choice([2023, 2024, 2025])
+    gross = rng.randrange(25000, 400000)
+    net = int(gross * rng.uniform(0.72, 0.92))
+    basic = int(gross * 0.4)
+    style = SlipStyle(rng, rupee)
+    layout = rng.choice(LAYOUTS)
+    net_label, gross_label = rng.choice(NET_LABELS), rng.choice(GROSS_LABELS)
+    name_label = rng.choice(NAME_LABELS)
+    amount = style.amount
+
+    # Allowances share the rest of the gross; deductions make up gross - net
+    allowances = rng.sample(ALLOWANCES, rng.randint(2, 4))
+    cuts = sorted(rng.sample(range(1, gross - basic), len(allowances) - 1)) if gross - basic > len(allowances) else []
+    allowance_values = [b - a for a, b in zip([0] + cuts, cuts + [gross - basic])]
+    deductions = rng.sample(DEDUCTIONS, rng.randint(2, 3))
+    cuts = sorted(rng.sample(range(1, gross - net), len(deductions) - 1)) if gross - net > len(deductions) else []
+    deduction_values = [b - a for a, b in zip([0] + cuts, cuts + [gross - net])]
+    earnings = [("Basic Salary", basic)] + list(zip(allowances, allowance_values))
+    deduction_rows = list(zip(deductions, deduction_values))
+
+    period = rng.choice([
+        f"Salary Slip for {MONTHS[month]} {year}",
+        f"Payslip for the month of {MONTHS[month][:3]}-{year}",
+        f"Pay Period: {month + 1:02d}/{year}",
+    ])
+    account = f"A/c No: {rng.randrange(10**13, 10**14)}"
+    employee_id = f"Employee ID: E{rng.randrange(99999):05d}"
+
+    rows = []
+    if layout == "columns":
+        rows.append([(0.08, employer)])
+        rows.append([(0.08, period)])
+        rows.append([])
+        rows.append([(0.08, f"{name_label}: {name}"), (0.55, employee_id)])
+        rows.append([(0.08, f"Designation: {rng.choice(DESIGNATIONS)}"), (0.55, f"Bank Name: {rng.choice(BANKS)}")])
+        rows.append([(0.08, account), (0.55, f"PAN: {''.join(rng.choices('ABCDEFGHJKLMNPQRSTUVWXYZ', k=5))}"
+                                              f"{rng.randrange(10000):04d}F")])
+        rows.append([])
+        for (label, value), deduction in zip(earnings, deduction_rows + [None] * len(earnings)):
+            row = [(0.08, f"{label}: {amount(value)}")]
+            if deduction:
+                row.append((0.55, f"{deduction[0]}: {amount(deduction[1])}"))
+            rows.append(row)
+        rows.append([(0.08, f"{gross_label}: {amount(gross)}"),
+                     (0.55, f"Total Deductions: {amount(gross - net)}")])
+        rows.append([(0.08, f"{net_label}: {amount(net)}")])
+    elif layout == "table":
+        rows.append([(0.08, "PAYSLIP"), (0.55, period)])
+        rows.append([(0.08, f"Employer: {employer}")])
+        rows.append([(0.08, f"{name_label} - {name}"), (0.55, employee_id)])
+        rows.append([])
+        rows.append([(0.08, "Earnings"), (0.32, "Amount"), (0.55, "Deductions"), (0.8, "Amount")])
+        for i in range(max(len(earnings), len(deduction_rows))):
+            row = []
+            if i < len(earnings):
+                row += [(0.08, earnings[i][0]), (0.32, amount(earnings[i][1]))]
+            if i < len(deduction_rows):
+                row += [(0.55, deduction_rows[i][0]), (0.8, amount(deduction_rows[i][1]))]
+            rows.append(row)
+        rows.append([(0.08, gross_label), (0.32, amount(gross)), (0.55, "Total Deductions"), (0.8, amount(gross - net))])
+        rows.append([(0.08, f"{net_label} {amount(net)}")])
+    elif layout == "advice":
+        # Bank-style credit advice: the only amount is the net pay, with no label
+        rows.append([(0.08, employer)])
+        rows.append([(0.08, period)])
+        rows.append([(0.08, f"{name_label}: {name}"), (0.55, employee_id)])
+        rows.append([])
+        rows.append([(0.08, f"{amount(net)} has been credited to your account")])
+        rows.append([(0.08, account)])
+    else:
+        rows.append([(0.08, employer)])
+        rows.append([(0.08, period)])
+        rows.append([(0.08, f"{name_label} : {name}")])
+        rows.append([(0.08, f"UAN: 1009{rng.randrange(10**8):08d}")])
+        rows.append([(0.08, f"{gross_label} : {amount(gross)}")])
+        rows.append([(0.08, f"{net_label} : {amount(net)}")])
+
+    # Noise: year-to-date totals (larger than any monthly figure) and footers
+    if layout != "advice" and rng.random() < 0.3:
+        rows.append([(0.08, f"YTD Gross: {amount(gross * (month + 1))}")])
+    if rng.random() < 0.5:
+        rows.append([])
+        rows.append([(0.08, rng.choice(FOOTERS))])
+
+    truth = {
+        "salary": float(net),
+        "net_pay": None if layout == "advice" else float(net),
+        "gross_pay": None if layout == "advice" else float(gross),
+        "employee_name": name, "employer": employer, "pay_period": f"{year}-{month + 1:02d}",
+        "layout": layout, "currency": style.currency, "grouping": style.grouping,
+        "net_label": net_label, "gross_label": gross_label,
+    }
+    return rows, truth
+
+
+def rows_text(rows: list) -> str:
+    """The slip as plain text, columns separated by three spaces."""
+    return "\n".join("   ".join(text for _, text in row) for row in rows)
+
+
+def write_pdf(path: Path, rows: list, font: str = "Helvetica") -> Path:
+    width, height = A4
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    heading = "Helvetica-Bold" if font == "Helvetica" else font
+    y = height - 72
+    for i, row in enumerate(rows):
+        pdf.setFont(heading, 12) if i == 0 else pdf.setFont(font, 10)
+        for x, text in row:
+            pdf.drawString(width * x, y, text)
+        y -= 16
+    pdf.showPage()
+    pdf.save()
+    return path
+
+
+def render_page(rows: list, font_path: str = None, dpi: int = 200) -> Image.Image:
+    """The slip drawn on a white A4 page at the given DPI."""
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    page = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(page)
+    size = int(dpi * 10 / 72)
+    font = ImageFont.truetype(font_path, size) if font_path else ImageFont.load_default(size=size)
+    y = dpi
+    for row in rows:
+        for x, text in row:
+            draw.text((int(width * x), y), text, fill=0, font=font)
+        y += int(size * 1.6)
+    return page
+
+
+def degrade_photo(page: Image.Image, rng: random.Random) -> Image.Image:
+    """Phone-photo look: slight skew, uneven lighting, sensor noise, EXIF-rotated storage."""
+    page = page.rotate(rng.uniform(-3, 3), resample=Image.Resampling.BILINEAR, fillcolor=255)
+    pixels = np.asarray(page, dtype=np.float32) * 0.92
+    gradient = np.linspace(rng.uniform(0.7, 0.85), 1.0, page.width, dtype=np.float32)[None, :]
+    noise = np.random.default_rng(rng.randrange(2**32)).normal(0, 10, pixels.shape).astype(np.float32)
+    return Image.fromarray(np.clip(pixels * gradient + noise, 0, 255).astype(np.uint8)).convert("RGB")
+
+
+def write_image(path: Path, rows: list, rng: random.Random, font_path: str = None) -> Path:
+    page = render_page(rows, font_path)
+    if path.suffix == ".png":
+        page.save(path, "PNG", dpi=(200, 200))
+    else:
+        # Stored sideways with orientation 6 (rotate 90° clockwise to view), as phones do
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        degrade_photo(page, rng).transpose(Image.Transpose.ROTATE_90).save(path, "JPEG", quality=85, exif=exif)
+    return path
+
+
+def generate_corpus(output_dir: Path, slips: int, formats=FORMATS, seed: int = 42,
+                    font_path: str = None) -> Path:
+    """
+    Write `slips` files round-robin over formats plus ground_truth.jsonl.
+
+    Returns:
+        Path of the ground truth file
+    """
+    rng = random.Random(seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pdf_font = "Helvetica"
+    if font_path:
+        pdfmetrics.registerFont(TTFont("SlipSans", font_path))
+        pdf_font = "SlipSans"
+
+    truth_path = output_dir / "ground_truth.jsonl"
+    with truth_path.open("w", encoding="utf-8") as out:
+        for i in range(slips):
+            fmt = formats[i % len(formats)]
+            rows, truth = make_slip(rng, rupee=font_path is not None)
+            path = output_dir / f"slip_{i:05d}.{fmt}"
+            if fmt == "pdf":
+                write_pdf(path, rows, pdf_font)
+            else:
+                write_image(path, rows, rng, font_path)
+            truth.update({"file": path.name, "format": fmt, "text": rows_text(rows)})
+            out.write(json.dumps(truth, ensure_ascii=False) + "\n")
+    return truth_path
+
+
+def load_ground_truth(corpus_dir: Path) -> list:
+    with (corpus_dir / "ground_truth.jsonl").open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic salary slip corpus")
+    parser.add_argument("--slips", type=int, default=1000, help="Files to generate")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma separated: pdf,png,jpg")
+    parser.add_argument("--font", help="TrueType font with the ₹ glyph")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    formats = tuple(fmt.strip() for fmt in args.formats.split(",") if fmt.strip())
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+
+    font_path = find_rupee_font(args.font)
+    if font_path is None:
+        print("⚠️ No font with the ₹ glyph found - ₹ slips are written with Rs.")
+
+    truth_path = generate_corpus(args.output, args.slips, formats, args.seed, font_path)
+    corpus = load_ground_truth(args.output)
+    print(f"✅ {len(corpus):,} salary slips written to {args.output}")
+    print(f"   Ground truth: {truth_path}")
+    for key in ("format", "layout", "currency"):
+        counts = Counter(entry[key] for entry in corpus)
+        print(f"   {key + ':':<10} " + ", ".join(f"{value} {count:,}" for value, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
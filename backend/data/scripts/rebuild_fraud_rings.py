@@ -0,0 +1,61 @@
+# scripts/rebuild_fraud_rings.py
+"""
+Rebuild the fraud ring index offline from the full application history
+and report the largest clusters.
+
+Run from the backend directory:
+    python data/scripts/rebuild_fraud_rings.py --top 20 --min-size 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.fraud_ring import FraudRingIndex
+
+DEFAULT_HISTORY = Path(BASE_DIR, "../fraud_history/applications.jsonl")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild fraud ring clusters from application history")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSONL history log")
+    parser.add_argument("--min-size", type=int, default=2, help="Smallest cluster to report")
+    parser.add_argument("--top", type=int, default=10, help="Number of clusters to print")
+    parser.add_argument("--output", type=Path, help="Write all reported clusters as JSONL")
+    args = parser.parse_args()
+
+    if not args.history.exists():
+        print(f"⚠️ History log not found: {args.history}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    index = FraudRingIndex.rebuild(args.history)
+    elapsed = time.perf_counter() - start
+
+    stats = index.statistics()
+    clusters = index.clusters(min_size=args.min_size)
+
+    print(f"✅ Rebuilt index in {elapsed:.2f}s")
+    print(f"   Applicants: {stats['applicants']}, clusters: {stats['clusters']}, "
+          f"linked clusters: {stats['linked_clusters']}, largest: {stats['largest_cluster']}")
+
+    for cluster in clusters[:args.top]:
+        print(f"\n- {cluster['cluster_size']} applicants, "
+              f"{cluster['cluster_rejection_rate']:.0%} rejected")
+        print(f"  Phones: {', '.join(cluster['phones'])}")
+        print(f"  Shared: {', '.join(cluster['shared_attributes'])}")
+
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as f:
+            for cluster in clusters:
+                f.write(json.dumps(cluster) + "\n")
+        print(f"\n✅ Wrote {len(clusters)} clusters to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# scripts/rescore_applications.py
+"""
+Re-score stored loan applications with the current underwriting and fraud rules.
+
+Runs only the deterministic parts of the Underwriting and Fraud agents (no LLM
+calls) on a process pool. Input is read in chunks and results are streamed to a
+JSONL file in input order, so memory stays flat for millions of records.
+
+Input records carry AgentState fields (phone, credit_score, requested_loan_amount,
+pre_approved_limit, salary_slip_uploaded, monthly_salary, calculated_emi, ...)
+plus the previously recorded loan_status and fraud_risk_score.
+
+Fraud checks only use what was known when the application was made: the
+fraud ring graph is skipped, and salary slip reuse comes from the record's
+salary_slip_reuse_count (taken at upload time), not from the live slip store.
+
+Pass --policy to re-score with a candidate policy file instead of the active one.
+
+Run from the backend directory:
+    python data/scripts/rescore_applications.py applications.jsonl -o rescored.jsonl
+    python data/scripts/rescore_applications.py applications.jsonl -o rescored.jsonl --policy candidate.json
+    python data/scripts/rescore_applications.py history.db --table applications -o rescored.jsonl
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter, deque
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Optional
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from agents.fraud_agent import FraudAgent
+from utils.emi import calculate_emi
+from utils.policy import load_policy, policy_store
+from utils.underwriting import evaluate_underwriting
+
+# Built at import, so forked and spawned workers alike start with an LLM-free agent
+_fraud_agent = FraudAgent(use_llm=False)
+_policy = policy_store.current()
+
+
+def init_worker(policy_path: Optional[Path]) -> None:
+    """
+    Pool initializer: load the --policy file in each worker. A global set in
+    main() only reaches workers under fork, not spawn (macOS/Windows).
+    """
+    global _policy
+    if policy_path:
+        _policy = load_policy(policy_path)
+
+
+def rescore_record(record: dict) -> dict:
+    """
+    Re-run underwriting then fraud scoring for one stored application.
+    """
+    emi = record.get("calculated_emi")
+    if emi is None and record.get("requested_tenure"):
+        emi = calculate_emi(
+            record["requested_loan_amount"],
+            record.get("negotiated_interest_rate") or 10.5,
+            record["requested_tenure"],
+        )
+
+    decision = evaluate_underwriting(
+        credit_score=record.get("credit_score"),
+        requested_loan_amount=record["requested_loan_amount"],
+        pre_approved_limit=record["pre_approved_limit"],
+        salary_slip_uploaded=bool(record.get("salary_slip_uploaded")),
+        monthly_salary=record.get("monthly_salary"),
+        calculated_emi=emi,
+        policy=_policy,
+    )
+
+    # Fraud runs after underwriting and sees its decision, exactly like the graph
+    fraud_input = dict(record)
+    fraud_input["calculated_emi"] = emi
+    fraud_input["loan_status"] = decision["loan_status"]
+    fraud_input["salary_slip_required"] = decision["salary_slip_required"]
+    fraud_input.setdefault("customer_name", "")
+    fraud_input.setdefault("verified_address", "")
+    assessment = _fraud_agent.assess(fraud_input, include_fraud_ring=False, policy=_policy,
+                                     live_document_reuse=False)
+
+    previous_status = record.get("loan_status")
+    new_status = assessment["loan_status"]
+    return {
+        "application_id": record.get("application_id", record.get("session_id")),
+        "phone": record.get("phone"),
+        "previous_status": previous_status,
+        "loan_status": new_status,
+        "reason_code": decision["reason_code"],
+        "previous_fraud_risk_score": record.get("fraud_risk_score"),
+        "fraud_risk_score": assessment["fraud_risk_score"],
+        "fraud_flags": [flag["type"] for flag in assessment["fraud_flags"]],
+        "changed": previous_status != new_status,
+    }
+
+
+def rescore_chunk(chunk: list) -> list:
+    """Worker entry point - records arrive as raw JSON lines or row dicts."""
+    results = []
+    for item in chunk:
+        try:
+            record = json.loads(item) if isinstance(item, str) else item
+            results.append(rescore_record(record))
+        except Exception as e:
+            results.append({"error": f"{type(e).__name__}: {e}", "input": item if isinstance(item, str) else None})
+    return results
+
+
+def iter_jsonl_chunks(path: Path, chunk_size: int):
+    """Yield lists of raw lines; parsing happens in the workers."""
+    with path.open("r", encoding="utf-8") as f:
+        lines = (line for line in f if line.strip())
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_sqlite_chunks(path: Path, table: str, chunk_size: int):
+    """Yield lists of row dicts using fetchmany to keep memory bounded."""
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.execute(f'SELECT * FROM "{table}"')
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def rescore_stream(pool: Pool, chunks, window: int):
+    """
+    Yield result chunks in input order with at most `window` chunks in flight.
+    (Pool.imap would drain the whole input into its task queue up front.)
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.apply_async(rescore_chunk, (chunk,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch re-score historical loan applications")
+    parser.add_argument("input", type=Path, help="JSONL file or SQLite database of application records")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="JSONL file for re-scored decisions")
+    parser.add_argument("--table", default="applications", help="SQLite table name")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Records per worker task")
+    parser.add_argument("--changed-only", action="store_true", help="Only write decisions that changed")
+    parser.add_argument("--policy", type=Path, help="Policy file to score with (default: active policy)")
+    args = parser.parse_args()
+
+    # Load once here too, so a broken policy file fails before the pool starts
+    init_worker(args.policy)
+    print(f"Scoring with policy {_policy.version}")
+
+    if args.input.suffix.lower() in (".db", ".sqlite", ".sqlite3"):
+        chunks = iter_sqlite_chunks(args.input, args.table, args.chunk_size)
+    else:
+        chunks = iter_jsonl_chunks(args.input, args.chunk_size)
+
+    total = changed = errors = 0
+    transitions = Counter()
+    start = time.perf_counter()
+
+    with Pool(processes=args.workers, initializer=init_worker, initargs=(args.policy,)) as pool, args.output.open("w", encoding="utf-8") as out:
+        for results in rescore_stream(pool, chunks, window=args.workers * 2):
+            for result in results:
+                total += 1
+                if "error" in result:
+                    errors += 1
+                elif result["changed"]:
+                    changed += 1
+                    transitions[(result["previous_status"], result["loan_status"])] += 1
+                elif args.changed_only:
+                    continue
+                out.write(json.dumps(result) + "\n")
+
+            if total % (args.chunk_size * 20) < len(results):
+                rate = total / (time.perf_counter() - start)
+                print(f"   {total:,} records ({rate:,.0f}/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Re-scored {total:,} applications in {elapsed:.1f}s "
+          f"({total / elapsed if elapsed else 0:,.0f}/s)")
+    print(f"   Changed decisions: {changed:,}, errors: {errors:,}")
+    for (before, after), count in transitions.most_common():
+        print(f"   {before} → {after}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# scripts/stress_session_turns.py
+"""
+Fire concurrent /chat turns at the API and check per-session serialization.
+
+Runs the FastAPI app in-process (httpx ASGI transport) with the workflow
+replaced by a simulated turn that sleeps --turn-ms in the threadpool and
+appends a numbered reply, so no LLM calls are made. Each of --sessions
+sessions receives --turns concurrent messages at once.
+
+Checked:
+    - no two turns of one session ever run at the same time
+    - every accepted turn's message and reply are in the session history,
+      in pairs (no lost update); messages folded into the summary by the
+      background compaction (graph.memory) are counted, not compared
+    - turns rejected with 429 (queue bound) are not in the history
+Reported: wall time against the serial lower bound, 429s, and lock wait
+percentiles from /sessions/locks. Exits with status 1 on a violation.
+
+Run from the backend directory:
+    python data/scripts/stress_session_turns.py --sessions 1 --turns 50 --max-waiters 64
+    python data/scripts/stress_session_turns.py --sessions 20 --turns 8 --turn-ms 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+# Agents build their LLM clients at import; the simulated turn never calls them
+os.environ.setdefault("GROQ_API_KEY", "stress-test")
+
+import httpx
+from langchain_core.messages import AIMessage, HumanMessage
+
+import main
+from utils.session_locks import session_locks
+
+
+class SimulatedWorkflow:
+    """Stands in for loan_workflow: slow, mutates state, tracks overlap per phone (one per session)."""
+
+    def __init__(self, turn_seconds: float) -> None:
+        self.turn_seconds = turn_seconds
+        self._lock = threading.Lock()
+        self._running = Counter()
+        self.overlaps = 0
+        self.max_parallel = 0
+
+    def invoke(self, state):
+        phone = state["phone"]
+        with self._lock:
+            self._running[phone] += 1
+            if self._running[phone] > 1:
+                self.overlaps += 1
+            self.max_parallel = max(self.max_parallel, sum(self._running.values()))
+        try:
+            time.sleep(self.turn_seconds)
+            reply = f"reply to {state['messages'][-1].content}"
+            state["messages"].append(AIMessage(content=reply))
+            state["last_ai_message"] = reply
+            return state
+        finally:
+            with self._lock:
+                self._running[phone] -= 1
+
+
+async def run_session(client: httpx.AsyncClient, index: int, turns: int) -> dict:
+    session_id = f"stress-{index}"
+    responses = await asyncio.gather(*(
+        client.post("/chat", json={"phone": f"+91980000{index:04d}", "session_id": session_id,
+                                   "message": f"s{index}-m{turn}"})
+        for turn in range(turns)
+    ))
+    codes = Counter(response.status_code for response in responses)
+    accepted = {f"s{index}-m{turn}" for turn, response in enumerate(responses) if response.status_code == 200}
+
+    problems = []
+    state = main.sessions.get(session_id, {})
+    messages = state.get("messages", [])
+    total = len(messages) + state.get("summarized_messages", 0)
+    pairs = list(zip(messages[::2], messages[1::2]))
+    if total != 2 * len(accepted):
+        problems.append(f"{session_id}: {total} messages for {len(accepted)} accepted turns")
+    for human, ai in pairs:
+        if not isinstance(human, HumanMessage) or ai.content != f"reply to {human.content}":
+            problems.append(f"{session_id}: reply out of order after {human.content!r}")
+            break
+    if not {human.content for human, _ in pairs} <= accepted:
+        problems.append(f"{session_id}: history holds turns that were rejected")
+    return {"codes": codes, "problems": problems}
+
+
+async def stress(args) -> int:
+    workflow = SimulatedWorkflow(args.turn_ms / 1000)
+    main.loan_workflow.invoke = workflow.invoke
+    if args.max_waiters is not None:
+        session_locks.max_waiters = args.max_waiters
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress", timeout=None) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_session(client, i, args.turns) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+        lock_stats = (await client.get("/sessions/locks")).json()
+
+    codes = sum((result["codes"] for result in results), Counter())
+    problems = [problem for result in results for problem in result["problems"]]
+    accepted = codes.get(200, 0)
+    longest_session = max(result["codes"].get(200, 0) for result in results)
+
+    print(f"{args.sessions} sessions x {args.turns} concurrent turns, {args.turn_ms:g} ms per turn, "
+          f"max {session_locks.max_waiters} waiters per session")
+    print("   Responses: " + ", ".join(f"{code}: {count:,}" for code, count in sorted(codes.items())))
+    print(f"   Wall time {elapsed:.2f}s (busiest session alone needs {longest_session * args.turn_ms / 1000:.2f}s, "
+          f"all turns one after another {accepted * args.turn_ms / 1000:.2f}s)")
+    print(f"   Turns running at once: max {workflow.max_parallel}")
+    waits = lock_stats["wait_ms"]
+    print(f"   Lock wait ms: p50 {waits['p50']:.1f}, p95 {waits['p95']:.1f}, p99 {waits['p99']:.1f}, "
+          f"max {waits['max']:.1f}; contended {lock_stats['contended']:,}, rejected {lock_stats['rejected']:,}, "
+          f"max queue depth {lock_stats['max_queue_depth']}")
+
+    if workflow.overlaps:
+        problems.append(f"{workflow.overlaps} turns ran concurrently with another turn of the same session")
+    if problems:
+        print("\n⚠️ Serialization violations:")
+        for problem in problems[:20]:
+            print(f"   {problem}")
+        return 1
+    print("\n✅ Turns serialized per session, no lost updates")
+    return 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Stress per-session turn serialization")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--turns", type=int, default=20, help="Concurrent turns per session")
+    parser.add_argument("--turn-ms", type=float, default=20.0, help="Simulated workflow time per turn")
+    parser.add_argument("--max-waiters", type=int, help="Override CREDSAATHI_SESSION_MAX_WAITERS")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(stress(args)))
+
+
+if __name__ == "__main__":
+    main_cli()
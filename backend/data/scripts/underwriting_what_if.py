@@ -0,0 +1,119 @@
+# scripts/underwriting_what_if.py
+"""
+Portfolio what-if analysis for underwriting thresholds.
+
+Applies the vectorized underwriting engine to the whole customer base (or a
+synthetic portfolio) for every combination of minimum credit score and maximum
+EMI ratio, and prints the resulting decision mix.
+
+Run from the backend directory:
+    python data/scripts/underwriting_what_if.py --request-multiple 1.5
+    python data/scripts/underwriting_what_if.py --synthetic 1000000 --verify 20000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.emi import calculate_emi_array
+from utils.underwriting import (
+    REASON_CODES,
+    compare_with_scalar,
+    evaluate_underwriting_batch,
+)
+
+DATA_DIR = os.path.join(BASE_DIR, "../generated_data")
+
+
+def load_customer_base(request_multiple: float) -> dict:
+    """Join customers, CRM and offers into applicant arrays."""
+    with open(os.path.join(DATA_DIR, "customers.json")) as f:
+        customers = {c["name"]: c for c in json.load(f)}
+    with open(os.path.join(DATA_DIR, "crm.json")) as f:
+        crm = json.load(f)
+    with open(os.path.join(DATA_DIR, "offers.json")) as f:
+        offers = json.load(f)
+
+    rows = []
+    for offer in offers:
+        customer = customers.get(crm.get(offer["phone"], {}).get("name"))
+        if customer:
+            rows.append((customer["credit_score"], offer["offer_amount"],
+                         offer["interest_rate"], offer["tenure_months"]))
+
+    score, limit, rate, tenure = (np.array(col, dtype=np.float64) for col in zip(*rows))
+    amount = limit * request_multiple
+    return {
+        "credit_score": score,
+        "requested_loan_amount": amount,
+        "pre_approved_limit": limit,
+        # Salaries are unknown until a slip is uploaded
+        "salary_slip_uploaded": np.zeros(len(rows), dtype=bool),
+        "monthly_salary": np.full(len(rows), np.nan),
+        "calculated_emi": calculate_emi_array(amount, rate, tenure),
+    }
+
+
+def synthetic_portfolio(n: int, seed: int = 7) -> dict:
+    """Random applicants shaped like generate_data.py output."""
+    rng = np.random.default_rng(seed)
+    limit = rng.choice([50000, 100000, 150000, 200000, 300000], n).astype(np.float64)
+    amount = np.round(limit * rng.uniform(0.3, 2.5, n), -3)
+    rate = np.round(rng.uniform(10.0, 15.0, n), 2)
+    tenure = rng.choice([12, 18, 24, 36, 48, 60], n).astype(np.float64)
+    return {
+        "credit_score": rng.integers(550, 901, n).astype(np.float64),
+        "requested_loan_amount": amount,
+        "pre_approved_limit": limit,
+        "salary_slip_uploaded": rng.random(n) < 0.7,
+        "monthly_salary": np.round(rng.uniform(15000, 150000, n), -2),
+        "calculated_emi": calculate_emi_array(amount, rate, tenure),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Underwriting threshold what-if sweep")
+    parser.add_argument("--synthetic", type=int, help="Use N synthetic applicants instead of the customer base")
+    parser.add_argument("--request-multiple", type=float, default=1.5,
+                        help="Requested amount as a multiple of the pre-approved limit (customer base only)")
+    parser.add_argument("--scores", default="650,675,700,725,750", help="Minimum credit scores to sweep")
+    parser.add_argument("--emi-ratios", default="40,50,60", help="Maximum EMI ratios (%%) to sweep")
+    parser.add_argument("--verify", type=int, default=0,
+                        help="Check the first N applicants against the scalar rules")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        inputs = synthetic_portfolio(args.synthetic)
+    else:
+        inputs = load_customer_base(args.request_multiple)
+    n = len(inputs["credit_score"])
+    print(f"Portfolio: {n:,} applicants")
+
+    if args.verify:
+        sample = {name: array[:args.verify] for name, array in inputs.items()}
+        mismatches = compare_with_scalar(sample, evaluate_underwriting_batch(**sample))
+        print(f"{'✅' if mismatches == 0 else '⚠️'} Scalar verification: "
+              f"{mismatches} mismatches in {len(sample['credit_score']):,} applicants")
+
+    header = f"{'min score':>9} {'max emi%':>8} " + " ".join(f"{code:>20}" for code in REASON_CODES)
+    print(header)
+    start = time.perf_counter()
+    for min_score in (float(s) for s in args.scores.split(",")):
+        for max_emi in (float(e) for e in args.emi_ratios.split(",")):
+            result = evaluate_underwriting_batch(
+                **inputs, min_credit_score=min_score, max_emi_ratio=max_emi
+            )
+            counts = np.bincount(result["reason_code"], minlength=len(REASON_CODES))
+            print(f"{min_score:>9.0f} {max_emi:>8.0f} " + " ".join(f"{c / n:>20.1%}" for c in counts))
+    elapsed = time.perf_counter() - start
+    print(f"\nSweep evaluated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
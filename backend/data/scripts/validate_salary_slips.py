@@ -0,0 +1,189 @@
+# scripts/validate_salary_slips.py
+"""
+Re-validate archived salary slips with the current extraction and parser.
+
+Walks a directory tree, validates every PDF/image on a process pool and
+streams one result per file to JSONL or CSV (chosen by the output suffix).
+Completed paths are appended to a checkpoint file, so an interrupted run
+picks up where it stopped when started again with the same arguments.
+A file interrupted between the output write and the checkpoint write is
+validated again (and appears twice in the output).
+
+Run from the backend directory:
+    python data/scripts/validate_salary_slips.py -o validation.jsonl
+    python data/scripts/validate_salary_slips.py /archive/slips -o validation.csv --workers 8
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter, deque
+from multiprocessing import Pool
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, "../.."))
+
+from utils.scanpdf import validate_salary_slip
+
+DEFAULT_SLIP_DIR = Path(BASE_DIR).parent / "uploaded_salary_slips"
+SUPPORTED_SUFFIXES = {".pdf", ".jpg", ".jpeg", ".png"}
+CSV_COLUMNS = ["path", "format", "valid", "salary", "confidence", "employee_name",
+               "employer", "pay_period", "latency_ms", "error"]
+
+
+def iter_slip_files(root: Path):
+    """Supported files under root, depth first, in a stable order."""
+    with os.scandir(root) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_slip_files(Path(entry.path))
+        elif Path(entry.name).suffix.lower() in SUPPORTED_SUFFIXES:
+            yield Path(entry.path)
+
+
+def validate_chunk(paths: list) -> list:
+    """Worker entry point - one result dict per path."""
+    results = []
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            validation = validate_salary_slip(Path(path))
+        except Exception as e:
+            validation = {"valid": False, "salary": None, "confidence": 0.0, "slip": None,
+                          "errors": [f"{type(e).__name__}: {e}"]}
+        slip = validation["slip"] or {}
+        results.append({
+            "path": str(path),
+            "format": Path(path).suffix.lower().lstrip("."),
+            "valid": validation["valid"],
+            "salary": validation["salary"],
+            "confidence": validation["confidence"],
+            "employee_name": slip.get("employee_name"),
+            "employer": slip.get("employer"),
+            "pay_period": slip.get("pay_period"),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "error": "; ".join(validation["errors"]) or None,
+        })
+    return results
+
+
+def validate_stream(pool: Pool, chunks, window: int):
+    """Yield result chunks in input order with at most `window` chunks in flight."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.apply_async(validate_chunk, (chunk,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def chunked(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield [str(path) for path in items[i:i + size]]
+
+
+def load_checkpoint(path: Path) -> set:
+    if not path.exists():
+        return set()
+    with path.open("r", encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def error_kind(error: str) -> str:
+    """Group messages that differ only in details ("Error processing file: ...")."""
+    return error.split(":", 1)[0]
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk re-validate salary slips")
+    parser.add_argument("root", type=Path, nargs="?", default=DEFAULT_SLIP_DIR, help="Directory to walk")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Results file (.jsonl or .csv)")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Files per worker task")
+    parser.add_argument("--fresh", action="store_true", help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+    # Failures are reported per file in the output
+    logging.disable(logging.ERROR)
+
+    checkpoint_path = args.checkpoint or args.output.with_name(args.output.name + ".checkpoint")
+    if args.fresh:
+        checkpoint_path.unlink(missing_ok=True)
+    # Without the earlier output there is nothing to resume
+    done = load_checkpoint(checkpoint_path) if args.output.exists() else set()
+    resuming = bool(done)
+
+    files = [path for path in iter_slip_files(args.root) if str(path) not in done]
+    total = len(files) + len(done)
+    print(f"{total:,} salary slips under {args.root}" + (f", {len(done):,} already validated" if resuming else ""))
+    if not files:
+        print("✅ Nothing left to validate")
+        return
+
+    as_csv = args.output.suffix.lower() == ".csv"
+    latencies = []
+    formats = Counter()
+    valid = 0
+    errors = Counter()
+    start = time.perf_counter()
+
+    with Pool(processes=args.workers) as pool, \
+            args.output.open("a" if resuming else "w", encoding="utf-8", newline="") as out, \
+            checkpoint_path.open("a" if resuming else "w", encoding="utf-8") as checkpoint:
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS) if as_csv else None
+        if writer and not resuming:
+            writer.writeheader()
+
+        processed = 0
+        for results in validate_stream(pool, chunked(files, args.chunk_size), window=args.workers * 2):
+            for result in results:
+                if writer:
+                    writer.writerow(result)
+                else:
+                    out.write(json.dumps(result) + "\n")
+                latencies.append(result["latency_ms"])
+                formats[result["format"]] += 1
+                if result["valid"]:
+                    valid += 1
+                else:
+                    errors[(result["format"], error_kind(result["error"] or "invalid"))] += 1
+            out.flush()
+            checkpoint.write("".join(result["path"] + "\n" for result in results))
+            checkpoint.flush()
+
+            processed += len(results)
+            if processed % (args.chunk_size * 25) < len(results) or processed == len(files):
+                elapsed = time.perf_counter() - start
+                rate = processed / elapsed
+                eta = (len(files) - processed) / rate if rate else 0
+                print(f"   {processed + len(done):,}/{total:,} ({rate:,.1f} files/s, ETA {eta:,.0f}s)")
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"\n✅ Validated {processed:,} files in {elapsed:.1f}s ({processed / elapsed:,.1f} files/s)")
+    print(f"   Valid: {valid:,}, invalid: {processed - valid:,}")
+    print(f"   Latency ms: p50 {percentile(latencies, 0.5):.1f}, p95 {percentile(latencies, 0.95):.1f}, "
+          f"p99 {percentile(latencies, 0.99):.1f}, max {latencies[-1]:.1f}")
+    print("   Formats: " + ", ".join(f"{fmt} {count:,}" for fmt, count in formats.most_common()))
+    if errors:
+        print("   Errors by format:")
+        for (fmt, kind), count in errors.most_common():
+            print(f"      {fmt:<5} {kind}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Conversation Memory Module
+Keeps a session's message history bounded.
+
+The last MEMORY_WINDOW messages stay verbatim in state["messages"]; older
+ones are folded into state["conversation_summary"], a deterministic
+transcript digest (one trimmed line per message, oldest lines dropped past
+SUMMARY_MAX_CHARS). Agents only ever read the latest message, and the loan
+details themselves live in their own state keys, so nothing the workflow
+needs is lost.
+
+Compaction runs after the response is sent (FastAPI BackgroundTasks, under
+the session lock) and only once MEMORY_COMPACT_BATCH messages have piled up
+past the window, so each fold is a small batch and per-session memory stays
+constant however long the chat runs.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+# Messages kept verbatim
+MEMORY_WINDOW = int(os.getenv("CREDSAATHI_MEMORY_WINDOW", "20"))
+
+# Extra messages allowed past the window before a compaction is scheduled
+MEMORY_COMPACT_BATCH = int(os.getenv("CREDSAATHI_MEMORY_COMPACT_BATCH", "10"))
+
+SUMMARY_MAX_CHARS = 2000
+SUMMARY_LINE_CHARS = 160
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def summary_line(message) -> str:
+    """One trimmed transcript line for a message."""
+    speaker = "Customer" if isinstance(message, HumanMessage) else "Agent"
+    text = _WHITESPACE.sub(" ", str(message.content)).strip()
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[:SUMMARY_LINE_CHARS - 1].rstrip() + "…"
+    return f"{speaker}: {text}"
+
+
+def fold_into_summary(summary: Optional[str], messages: List) -> str:
+    """
+    Append messages to a running summary, dropping its oldest lines to stay
+    within SUMMARY_MAX_CHARS. Cost depends on the batch, not the chat length.
+    """
+    lines = summary.split("\n") if summary else []
+    lines.extend(summary_line(message) for message in messages if message.content)
+    size = sum(len(line) + 1 for line in lines)
+    drop = 0
+    while size > SUMMARY_MAX_CHARS and drop < len(lines) - 1:
+        size -= len(lines[drop]) + 1
+        drop += 1
+    return "\n".join(lines[drop:])
+
+
+def needs_compaction(state: Dict) -> bool:
+    return len(state["messages"]) >= MEMORY_WINDOW + MEMORY_COMPACT_BATCH
+
+
+def compact_messages(state: Dict) -> int:
+    """
+    Fold everything but the last MEMORY_WINDOW messages into the summary.
+    Call with the session lock held.
+
+    Returns:
+        Number of messages folded
+    """
+    messages = state["messages"]
+    folded = len(messages) - MEMORY_WINDOW
+    if folded <= 0:
+        return 0
+    state["conversation_summary"] = fold_into_summary(state.get("conversation_summary"), messages[:folded])
+    state["summarized_messages"] = (state.get("summarized_messages") or 0) + folded
+    state["messages"] = messages[folded:]
+    return folded
+
+
+__all__ = [
+    "MEMORY_COMPACT_BATCH",
+    "MEMORY_WINDOW",
+    "compact_messages",
+    "fold_into_summary",
+    "needs_compaction",
+    "summary_line",
+]
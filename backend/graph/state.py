@@ -4,15 +4,23 @@ from langgraph.graph.message import add_messages
 class AgentState(TypedDict):
     """
     This state object is passed between all agents.
-    Each agent reads from it and updates it.
+    Each agent reads from it and returns only the keys it changed
+    (graph.state_update.StateUpdate).
     
     The 'Annotated[list, add_messages]' means messages will be appended,
     not replaced.
     """
     
-    # Chat history 
+    # Chat history: the last MEMORY_WINDOW messages (graph.memory); older
+    # ones are folded into conversation_summary
     messages: Annotated[list, add_messages] 
+    conversation_summary: Optional[str]
+    summarized_messages: int
+    # Content of the latest AI reply, kept by StateUpdate.add_message
+    last_ai_message: Optional[str]
     
+    # API session this state belongs to
+    session_id: str
     phone: str  
     customer_name: Optional[str] 
     customer_id: Optional[int]  
@@ -38,12 +46,23 @@ class AgentState(TypedDict):
     salary_slip_required: bool 
     salary_slip_uploaded: bool  
     monthly_salary: Optional[float]  
+    # SHA-256 of the uploaded slip and how many other customers submitted it
+    salary_slip_hash: Optional[str]
+    salary_slip_reuse_count: Optional[int]
+    # Structured fields parsed from the slip (models.salary_slip.SalarySlip)
+    salary_slip: Optional[dict]
     calculated_emi: Optional[float] 
+    # Closed-form counter-offer terms when the EMI is over the salary cap
+    affordability: Optional[dict]
+    # Approvable alternatives from the offer optimizer after a rejection
+    counter_offers: Optional[list]
     
     # Fraud Detection Agent
     fraud_risk_score: Optional[float]
     fraud_flags: Optional[list]
     fraud_detected: bool
+    fraud_cluster_size: Optional[int]
+    fraud_cluster_rejection_rate: Optional[float]
     
     # Advisor Agent
     advisor_guidance_provided: bool
@@ -64,6 +83,16 @@ class AgentState(TypedDict):
     
     sanction_letter_generated: bool
     sanction_letter_path: Optional[str] 
+    # sha256 of the stored PDF (utils.letter_store), also its download ETag
+    sanction_letter_hash: Optional[str]
+    # Issue date printed on the letter (ISO); re-renders keep it
+    sanction_letter_issued_at: Optional[str]
+    # Background render: job id in sanction_pool, "pending" | "ready" | "failed"
+    sanction_letter_id: Optional[str]
+    sanction_letter_status: Optional[str]
     
     current_agent: str
-    workflow_complete: bool  
\ No newline at end of file
+    workflow_complete: bool
+    
+    # Credit policy version pinned for the current turn
+    policy_version: Optional[str]  
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+State Codec Module
+Compact binary encoding of AgentState for snapshots, persistence and
+cross-process handoff.
+
+Layout:
+    b"CSST" | version (1 byte) | flags (1 byte) | body [| signature]
+    body = msgpack (or JSON with FLAG_JSON) of [fields, absent, extras, messages],
+    zstd-compressed with FLAG_ZSTD
+    signature = HMAC-SHA256 of everything before it, with FLAG_SIGNED
+
+- fields: the STATE_FIELDS values by position, so field names are not
+  repeated in every snapshot. absent lists the positions of fields the
+  state did not have, so they stay absent.
+- extras: any other keys a node has set (e.g. loan_purpose), by name.
+- messages: [type, content, id] for plain human/AI/system messages;
+  anything richer (tool calls, metadata) falls back to LangChain's
+  message_to_dict form, so nothing is dropped.
+
+Snapshots that cross a trust boundary (worker handoff) are signed with a
+shared key; decode_state(data, key=...) refuses unsigned or altered ones
+before parsing anything. Decoded bodies are capped at MAX_SNAPSHOT_BYTES,
+including after decompression.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+from typing import Dict, List, Optional
+
+import orjson
+import ormsgpack
+import zstandard
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, message_to_dict, messages_from_dict
+
+MAGIC = b"CSST"
+CODEC_VERSION = 1
+
+FLAG_ZSTD = 0x01
+FLAG_JSON = 0x02
+FLAG_SIGNED = 0x04
+
+SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+# Largest snapshot accepted, compressed or decompressed (bytes)
+MAX_SNAPSHOT_BYTES = int(os.getenv("CREDSAATHI_SNAPSHOT_MAX_BYTES", str(4 * 1024 * 1024)))
+
+# Compress snapshots by default (zstd level)
+STATE_ZSTD_LEVEL = int(os.getenv("CREDSAATHI_STATE_ZSTD_LEVEL", "3"))
+
+# Append-only: new AgentState keys go at the end with a new CODEC_VERSION
+STATE_FIELDS = (
+    "conversation_summary", "summarized_messages", "last_ai_message",
+    "phone", "customer_name", "customer_id", "age", "city", "current_loan_details",
+    "requested_loan_amount", "requested_tenure", "negotiated_interest_rate",
+    "kyc_verified", "verified_phone", "verified_address",
+    "credit_score", "pre_approved_limit",
+    "salary_slip_required", "salary_slip_uploaded", "monthly_salary",
+    "salary_slip_hash", "salary_slip_reuse_count", "salary_slip",
+    "calculated_emi", "affordability", "counter_offers",
+    "fraud_risk_score", "fraud_flags", "fraud_detected", "fraud_cluster_size", "fraud_cluster_rejection_rate",
+    "advisor_guidance_provided", "advisor_recommendations",
+    "loan_status", "rejection_reason",
+    "sanction_letter_generated", "sanction_letter_path", "sanction_letter_hash",
+    "sanction_letter_id", "sanction_letter_status",
+    "current_agent", "workflow_complete", "policy_version",
+    "session_id", "sanction_letter_issued_at",
+)
+
+_KNOWN_KEYS = frozenset(STATE_FIELDS) | {"messages"}
+
+_MESSAGE_TYPES = {HumanMessage: 0, AIMessage: 1, SystemMessage: 2}
+_MESSAGE_CLASSES = {code: cls for cls, code in _MESSAGE_TYPES.items()}
+_RICH_MESSAGE = 255
+
+
+class StateCodecError(ValueError):
+    """Snapshot is not a state encoding, is corrupt or is from a newer codec."""
+
+
+_local = threading.local()
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    # zstd contexts are not thread-safe; one per thread
+    compressor = getattr(_local, "compressor", None)
+    if compressor is None:
+        compressor = _local.compressor = zstandard.ZstdCompressor(level=STATE_ZSTD_LEVEL)
+    return compressor
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    decompressor = getattr(_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+
+def _is_plain(message) -> bool:
+    if message.additional_kwargs or message.response_metadata or message.name:
+        return False
+    if isinstance(message, AIMessage):
+        return not (message.tool_calls or message.invalid_tool_calls or message.usage_metadata)
+    return True
+
+
+def encode_messages(messages: List) -> List:
+    encoded = []
+    for message in messages:
+        code = _MESSAGE_TYPES.get(type(message))
+        if code is not None and _is_plain(message):
+            encoded.append([code, message.content, message.id])
+        else:
+            encoded.append([_RICH_MESSAGE, message_to_dict(message)])
+    return encoded
+
+
+def decode_messages(encoded: List) -> List:
+    messages = []
+    for item in encoded:
+        if item[0] == _RICH_MESSAGE:
+            messages.extend(messages_from_dict([item[1]]))
+        else:
+            messages.append(_MESSAGE_CLASSES[item[0]](content=item[1], id=item[2]))
+    return messages
+
+
+def _signature(key: bytes, data: bytes) -> bytes:
+    return hmac.new(key, data, hashlib.sha256).digest()
+
+
+def _decompress(payload: bytes, max_size: int) -> bytes:
+    # max_output_size only applies when the frame does not declare its size
+    declared = zstandard.frame_content_size(payload)
+    if declared > max_size:
+        raise StateCodecError(f"Snapshot decompresses to {declared} bytes (limit {max_size})")
+    return _decompressor().decompress(payload, max_output_size=max_size)
+
+
+def missing_fields(state: Dict) -> List[str]:
+    """AgentState keys (as of this codec version) a decoded state does not have."""
+    return [field for field in ("messages",) + STATE_FIELDS if field not in state]
+
+
+def encode_state(state: Dict, compress: bool = True, binary: bool = True, key: Optional[bytes] = None) -> bytes:
+    """
+    Encode a session state.
+
+    Args:
+        compress: zstd-compress the body
+        binary: msgpack body (False: JSON, e.g. for inspecting a snapshot)
+        key: sign the snapshot with this HMAC key
+    """
+    flags = (FLAG_ZSTD if compress else 0) | (0 if binary else FLAG_JSON) | (FLAG_SIGNED if key else 0)
+    fields = [state.get(field) for field in STATE_FIELDS]
+    absent = [i for i, field in enumerate(STATE_FIELDS) if field not in state]
+    extras = {key: value for key, value in state.items() if key not in _KNOWN_KEYS}
+    body = [fields, absent, extras, encode_messages(state.get("messages", []))]
+
+    try:
+        payload = ormsgpack.packb(body) if binary else orjson.dumps(body)
+    except (TypeError, ormsgpack.MsgpackEncodeError, orjson.JSONEncodeError) as e:
+        raise StateCodecError(f"State is not serializable: {e}") from e
+    if compress:
+        payload = _compressor().compress(payload)
+    data = MAGIC + bytes((CODEC_VERSION, flags)) + payload
+    if key:
+        data += _signature(key, data)
+    return data
+
+
+def decode_state(data: bytes, key: Optional[bytes] = None, max_size: int = MAX_SNAPSHOT_BYTES) -> Dict:
+    """
+    Decode a snapshot written by encode_state.
+
+    Args:
+        key: require a valid signature made with this HMAC key
+        max_size: largest snapshot accepted, compressed or decompressed
+
+    Raises:
+        StateCodecError: not a snapshot, too large, unsigned or altered (with
+            key), corrupt, or written by a newer codec
+    """
+    if len(data) < 6 or data[:4] != MAGIC:
+        raise StateCodecError("Not a state snapshot")
+    if len(data) > max_size:
+        raise StateCodecError(f"Snapshot is {len(data)} bytes (limit {max_size})")
+    version, flags = data[4], data[5]
+
+    payload = data[6:]
+    if flags & FLAG_SIGNED:
+        if len(payload) < SIGNATURE_SIZE:
+            raise StateCodecError("Corrupt state snapshot: signature missing")
+        payload, signature = payload[:-SIGNATURE_SIZE], payload[-SIGNATURE_SIZE:]
+        if key is not None and not hmac.compare_digest(signature, _signature(key, data[:-SIGNATURE_SIZE])):
+            raise StateCodecError("Snapshot signature does not match")
+    elif key is not None:
+        raise StateCodecError("Snapshot is not signed")
+
+    if version != CODEC_VERSION:
+        raise StateCodecError(f"Unsupported state codec version {version} (this build reads {CODEC_VERSION})")
+
+    try:
+        if flags & FLAG_ZSTD:
+            payload = _decompress(payload, max_size)
+        fields, absent, extras, messages = orjson.loads(payload) if flags & FLAG_JSON else ormsgpack.unpackb(payload)
+        state = dict(extras)
+        state.update(zip(STATE_FIELDS, fields))
+        for i in absent:
+            del state[STATE_FIELDS[i]]
+        state["messages"] = decode_messages(messages)
+    except (zstandard.ZstdError, ormsgpack.MsgpackDecodeError, orjson.JSONDecodeError,
+            ValueError, TypeError, KeyError, IndexError) as e:
+        raise StateCodecError(f"Corrupt state snapshot: {e}") from e
+    return state
+
+
+__all__ = [
+    "CODEC_VERSION",
+    "MAX_SNAPSHOT_BYTES",
+    "STATE_FIELDS",
+    "StateCodecError",
+    "decode_messages",
+    "decode_state",
+    "encode_messages",
+    "encode_state",
+    "missing_fields",
+]
@@ -0,0 +1,116 @@
+"""
+State Update Module
+Partial updates for LangGraph nodes.
+
+Nodes return only the keys they changed, and only the messages they added,
+instead of mutating the AgentState they were given and returning all of it.
+LangGraph then writes just those channels, and add_messages merges the new
+messages instead of re-reconciling the whole (growing) history on every
+node.
+
+StateUpdate keeps node code readable: reads fall through to the incoming
+state (so a node sees its own writes), writes and new messages are
+collected, and changes() is what the node returns. Adding an AI message
+also records it as last_ai_message, so the API never scans the history
+for the latest reply.
+
+Guard mode (CREDSAATHI_STATE_GUARD=1, for tests and stress runs) wraps every
+node and raises StateMutationError if it changed the incoming state in place
+or returned the whole state.
+"""
+
+import copy
+import os
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List
+
+from langchain_core.messages import AIMessage
+
+# Check every node for in-place state mutation (deep-copies the state per node)
+STATE_GUARD = os.getenv("CREDSAATHI_STATE_GUARD", "0") == "1"
+
+_MISSING = object()
+
+
+class StateMutationError(Exception):
+    """A node changed its input state in place instead of returning an update."""
+
+
+class StateUpdate(MutableMapping):
+    """
+    Read-through view of a node's input state that records writes.
+    """
+
+    def __init__(self, state: Dict) -> None:
+        self._state = state
+        self._changes: Dict[str, Any] = {}
+        self._new_messages: List = []
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "messages" and self._new_messages:
+            return list(self._state["messages"]) + self._new_messages
+        if key in self._changes:
+            return self._changes[key]
+        return self._state[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "messages":
+            raise TypeError("Use add_message() - messages are appended, not replaced")
+        self._changes[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("State keys cannot be removed by a node")
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._state
+        yield from (key for key in self._changes if key not in self._state)
+
+    def __len__(self) -> int:
+        return len(self._state) + sum(1 for key in self._changes if key not in self._state)
+
+    def add_message(self, message) -> None:
+        self._new_messages.append(message)
+        if isinstance(message, AIMessage) and message.content:
+            self._changes["last_ai_message"] = message.content
+
+    def changes(self) -> Dict:
+        """The node's return value: changed keys plus the new messages only."""
+        update = dict(self._changes)
+        if self._new_messages:
+            update["messages"] = list(self._new_messages)
+        return update
+
+
+def _changed_keys(before: Dict, after: Dict) -> List[str]:
+    return sorted(key for key in before.keys() | after.keys()
+                  if before.get(key, _MISSING) != after.get(key, _MISSING))
+
+
+def guard_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a node to fail on in-place mutation when STATE_GUARD is on;
+    returns the node unchanged otherwise.
+    """
+    if not STATE_GUARD:
+        return node
+
+    def guarded(state: Dict) -> Dict:
+        before = copy.deepcopy(dict(state))
+        update = node(state)
+        mutated = _changed_keys(before, dict(state))
+        if mutated:
+            raise StateMutationError(f"Node '{name}' mutated its input state in place: {', '.join(mutated)}")
+        if update is state:
+            raise StateMutationError(f"Node '{name}' returned its whole input state instead of an update")
+        return update
+
+    guarded.__name__ = getattr(node, "__name__", name)
+    return guarded
+
+
+__all__ = [
+    "STATE_GUARD",
+    "StateMutationError",
+    "StateUpdate",
+    "guard_node",
+]
@@ -1,16 +1,14 @@
 from langgraph.graph import StateGraph, END
 from graph.state import AgentState
+from graph.state_update import guard_node
 from agents.master_agent import master_agent_node
 from agents.sales_agent import sales_agent_node
 from agents.verification_agent import verification_agent_node
-<<<<<<< HEAD
-from agents.underwriting_agent import underwriting_agent_node
+from agents.underwritting_agent import underwriting_agent_node
 from agents.fraud_agent import fraud_agent_node
 from agents.advisor_agent import advisor_agent_node
-=======
-from agents.underwritting_agent import underwriting_agent_node
->>>>>>> da183c9503b11cca58f1d3fbc77386e0b8447cd0
 from agents.sanction_generator import sanction_generator_node
+from utils.policy import policy_for
 
 
 def route_after_master(state: AgentState) -> str:
@@ -71,13 +69,13 @@ def route_after_fraud(state: AgentState) -> str:
     - If low risk and approved, go to sanction
     - If low risk but not approved, go to master_final
     """
-    fraud_risk = state.get('fraud_risk_score', 0)
+    fraud_route = policy_for(state).fraud_route(state.get('fraud_risk_score', 0))
     status = state.get('loan_status', 'unknown')
     
-    if fraud_risk >= 70 or status == 'rejected':
+    if fraud_route == 'reject' or status == 'rejected':
         # High risk fraud or already rejected
         return 'advisor'
-    elif fraud_risk >= 40:
+    elif fraud_route == 'manual_review':
         # Medium risk - manual review
         return 'master_final'
     elif status == 'approved':
@@ -117,15 +115,16 @@ def create_loan_workflow():
     
     workflow = StateGraph(AgentState)
     
-    # Add all nodes
-    workflow.add_node("master", master_agent_node)
-    workflow.add_node("sales", sales_agent_node)
-    workflow.add_node("verification", verification_agent_node)
-    workflow.add_node("underwriting", underwriting_agent_node)
-    workflow.add_node("fraud", fraud_agent_node)
-    workflow.add_node("sanction", sanction_generator_node)
-    workflow.add_node("advisor", advisor_agent_node)
-    workflow.add_node("master_final", master_agent_node)  # For final messages
+    # Add all nodes (nodes return partial updates; guard_node checks that
+    # when CREDSAATHI_STATE_GUARD=1)
+    workflow.add_node("master", guard_node("master", master_agent_node))
+    workflow.add_node("sales", guard_node("sales", sales_agent_node))
+    workflow.add_node("verification", guard_node("verification", verification_agent_node))
+    workflow.add_node("underwriting", guard_node("underwriting", underwriting_agent_node))
+    workflow.add_node("fraud", guard_node("fraud", fraud_agent_node))
+    workflow.add_node("sanction", guard_node("sanction", sanction_generator_node))
+    workflow.add_node("advisor", guard_node("advisor", advisor_agent_node))
+    workflow.add_node("master_final", guard_node("master_final", master_agent_node))  # For final messages
     
     workflow.set_entry_point("master")
     
@@ -1,15 +1,44 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import BackgroundTasks, FastAPI, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from models.customer import ChatRequest, ChatResponse
+from graph.memory import compact_messages, needs_compaction
 from graph.state import AgentState
+from graph.state_codec import (
+    CODEC_VERSION,
+    MAX_SNAPSHOT_BYTES,
+    StateCodecError,
+    decode_state,
+    encode_state,
+    missing_fields,
+)
 from graph.workflow import loan_workflow
 from langchain_core.messages import HumanMessage
-import uuid
+from agents.sanction_generator import mark_sanction_letter_ready, submit_sanction_letter
+from utils.job_pool import JobPoolUnavailable, JobQueueFull, extraction_pool, sanction_pool
+from utils.letter_store import letter_store
+from utils.scanpdf import EXTRACTOR_VERSION, extract_salary_details
+from utils.session_locks import SessionBusy, session_locks
+from utils.schedule_export import (
+    EXPORT_FORMATS,
+    iter_bulk_csv,
+    iter_bulk_ndjson,
+    iter_schedule_csv,
+    iter_schedule_json,
+    loan_terms,
+)
+from utils.shadow import shadow_evaluator
+from utils.slip_store import slip_store
+import hmac
+import os
 import re
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Dict, Optional
 from pathlib import Path
-import shutil
 
 app = FastAPI(
     title="CredSaathi Loan Agent API",
@@ -27,66 +56,62 @@ app.add_middleware(
 
 sessions: Dict[str, AgentState] = {}
 
-<<<<<<< HEAD
-def extract_salary_from_file(file_path: Path) -> Optional[float]:
+# Salary slip extraction jobs: job_id → session, declared salary and final response.
+# Entries go once their extraction job has expired, and the oldest beyond SALARY_JOBS_KEEP are dropped.
+SALARY_JOBS_KEEP = int(os.getenv("CREDSAATHI_SALARY_JOBS_KEEP", "1000"))
+salary_jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def remember_salary_job(job_id: str, salary_job: Dict) -> None:
+    salary_jobs[job_id] = salary_job
+    while len(salary_jobs) > SALARY_JOBS_KEEP:
+        salary_jobs.popitem(last=False)
+
+
+@asynccontextmanager
+async def session_turn(session_id: str):
     """
-    Extract monthly salary from PDF / image salary slip.
-    Supports both PDF and image files (JPG, PNG).
-    Returns salary as float if found, else None.
-    
-    Extraction strategy:
-    1. Look for common salary keywords (salary, net pay, take-home, ctc)
-    2. Extract all numbers in salary range (10,000 - 10,000,000)
-    3. Return the largest number found (most likely to be the salary)
+    Hold the session's lock while its state is read, updated and written back.
+    Turns of one session run one at a time; other sessions are not blocked.
     """
-    text = ""
+    try:
+        async with session_locks.hold(session_id):
+            yield
+    except SessionBusy as e:
+        raise HTTPException(status_code=429, detail=f"Session is busy: {e}", headers={"Retry-After": "1"})
+
 
+async def compact_session(session_id: str) -> None:
+    """Background task: fold old messages into the session summary (graph.memory)."""
     try:
-        if file_path.suffix.lower() == ".pdf":
-            import pdfplumber
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-
-        elif file_path.suffix.lower() in [".jpg", ".jpeg", ".png"]:
-            from PIL import Image
-            import pytesseract
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
-        else:
-            return None
-
-        # Remove commas and currency symbols for uniform number extraction
-        cleaned_text = text.replace(",", "").replace("₹", "").replace("Rs", "").replace("Rs.", "")
-        
-        # Extract all numbers between 10,000 and 10,000,000 (reasonable salary range)
-        numbers = re.findall(r"\b\d{5,7}\b", cleaned_text)
-        
-        if numbers:
-            # Convert to integers, filter valid salary range, return max (most likely salary)
-            valid_salaries = [int(n) for n in numbers if 10000 <= int(n) <= 10000000]
-            if valid_salaries:
-                return float(max(valid_salaries))
-        
-        # Fallback: if pattern-based extraction fails, take any large 5+ digit number
-        all_large_numbers = re.findall(r"\d{5,}", cleaned_text)
-        if all_large_numbers:
-            valid = [int(n) for n in all_large_numbers if 10000 <= int(n) <= 10000000]
-            if valid:
-                return float(max(valid))
+        async with session_locks.hold(session_id):
+            state = sessions.get(session_id)
+            if state is not None:
+                compact_messages(state)
+    except SessionBusy:
+        # Turns are queued on this session; a later turn schedules it again
+        pass
 
-    except Exception as e:
-        print(f"Warning: Error extracting salary from {file_path.name}: {str(e)}")
-        return None
 
-    return None
+@app.on_event("startup")
+async def start_extraction_pool():
+    extraction_pool.start()
+    sanction_pool.start()
+
+
+@app.on_event("shutdown")
+async def stop_extraction_pool():
+    extraction_pool.shutdown(wait=False)
+    sanction_pool.shutdown(wait=False)
 
-=======
->>>>>>> da183c9503b11cca58f1d3fbc77386e0b8447cd0
 
 def initialize_state(phone: str, session_id: str) -> AgentState:
     return AgentState(
         messages=[],
+        conversation_summary=None,
+        summarized_messages=0,
+        last_ai_message=None,
+        session_id=session_id,
         phone=phone,
         customer_name=None,
         customer_id=None,
@@ -104,18 +129,30 @@ def initialize_state(phone: str, session_id: str) -> AgentState:
         salary_slip_required=False,
         salary_slip_uploaded=False,
         monthly_salary=None,
+        salary_slip_hash=None,
+        salary_slip_reuse_count=None,
+        salary_slip=None,
         calculated_emi=None,
+        affordability=None,
+        counter_offers=None,
         fraud_risk_score=None,
         fraud_flags=[],
         fraud_detected=False,
+        fraud_cluster_size=None,
+        fraud_cluster_rejection_rate=None,
         advisor_guidance_provided=False,
         advisor_recommendations=None,
         loan_status="initial",
         rejection_reason=None,
         sanction_letter_generated=False,
         sanction_letter_path=None,
+        sanction_letter_hash=None,
+        sanction_letter_issued_at=None,
+        sanction_letter_id=None,
+        sanction_letter_status=None,
         current_agent="master",
-        workflow_complete=False
+        workflow_complete=False,
+        policy_version=None
     )
 
 
@@ -128,51 +165,59 @@ async def root():
         "agents": ["Master", "Sales", "Verification", "Underwriting", "Fraud Detection", "Advisor", "Sanction Generator"],
         "endpoints": {
             "chat": "POST /chat",
-            "upload_salary": "POST /upload-salary-slip",
+            "upload_salary": "POST /upload-salary-slip/{session_id}",
+            "salary_slip_job": "GET /upload-salary-slip/{session_id}/jobs/{job_id}",
+            "job_status": "GET /jobs/{job_id}",
+            "job_stats": "GET /jobs/stats",
+            "session_lock_stats": "GET /sessions/locks",
             "session_status": "GET /session/{session_id}/status",
+            "repayment_schedule": "GET /session/{session_id}/schedule?format=csv|json",
+            "bulk_schedules": "GET /sessions/schedules?format=csv|json",
             "download_letter": "GET /download-sanction-letter/{session_id}",
             "list_sessions": "GET /sessions",
-            "delete_session": "DELETE /session/{session_id}"
+            "session_snapshot": "GET|PUT /session/{session_id}/snapshot (internal handoff, X-Handoff-Key)",
+            "delete_session": "DELETE /session/{session_id}",
+            "shadow_stats": "GET /shadow/stats",
+            "shadow_reload": "POST /shadow/reload"
         }
     }
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, background_tasks: BackgroundTasks):
     session_id = request.session_id or str(uuid.uuid4())
     
-    if session_id not in sessions:
-        sessions[session_id] = initialize_state(request.phone, session_id)
-    
-    state = sessions[session_id]
-    
-    state["messages"].append(HumanMessage(content=request.message))
-    
-    try:
-        updated_state = loan_workflow.invoke(state)
-        sessions[session_id] = updated_state
+    async with session_turn(session_id):
+        if session_id not in sessions:
+            sessions[session_id] = initialize_state(request.phone, session_id)
         
-        ai_messages = [
-            msg.content for msg in updated_state["messages"] 
-            if hasattr(msg, 'content') and msg.content and not isinstance(msg, HumanMessage)
-        ]
-        last_response = ai_messages[-1] if ai_messages else "Processing your request..."
+        state = sessions[session_id]
         
-        requires_action = None
-        if updated_state["loan_status"] == "awaiting_salary_slip":
-            requires_action = "upload_salary_slip"
-        elif updated_state["sanction_letter_generated"]:
-            requires_action = "download_sanction_letter"
+        state["messages"].append(HumanMessage(content=request.message))
         
-        return ChatResponse(
-            response=last_response,
-            session_id=session_id,
-            loan_status=updated_state["loan_status"],
-            requires_action=requires_action
-        )
+        try:
+            updated_state = await run_in_threadpool(loan_workflow.invoke, state)
+            sessions[session_id] = updated_state
+            if needs_compaction(updated_state):
+                background_tasks.add_task(compact_session, session_id)
+            
+            last_response = updated_state.get("last_ai_message") or "Processing your request..."
+            
+            requires_action = None
+            if updated_state["loan_status"] == "awaiting_salary_slip":
+                requires_action = "upload_salary_slip"
+            elif updated_state["sanction_letter_generated"]:
+                requires_action = "download_sanction_letter"
+            
+            return ChatResponse(
+                response=last_response,
+                session_id=session_id,
+                loan_status=updated_state["loan_status"],
+                requires_action=requires_action
+            )
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
 
 @app.post("/upload-salary-slip/{session_id}")
@@ -182,68 +227,210 @@ async def upload_salary_slip(
     monthly_salary: float = Form(...)
 ):
     
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    state = sessions[session_id]
-    
-    upload_dir = Path(__file__).parent / "data" / "uploaded_salary_slips"
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    
-    file_ext = Path(file.filename).suffix
-    saved_filename = f"salary_slip_{state['customer_id']}_{uuid.uuid4().hex[:8]}{file_ext}"
-    file_path = upload_dir / saved_filename
-    
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    state['salary_slip_uploaded'] = True
-    state['monthly_salary'] = monthly_salary
+    async with session_turn(session_id):
+        if session_id not in sessions:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        state = sessions[session_id]
+        
+        # Stored by content hash; the same document is only ever extracted once
+        file_ext = Path(file.filename).suffix
+        # Chunked copy + hashing and the customer log append are file I/O: keep them off the event loop
+        digest, file_path, _, is_new = await run_in_threadpool(slip_store.save_stream, file.file, file_ext)
+        state['salary_slip_hash'] = digest
+        state['salary_slip_reuse_count'] = await run_in_threadpool(slip_store.record_customer, digest, state['phone'])
+        
+        cached = await run_in_threadpool(slip_store.get_result, digest, EXTRACTOR_VERSION)
+        if cached is not None:
+            job_id = uuid.uuid4().hex
+            remember_salary_job(job_id, {"session_id": session_id, "declared_salary": monthly_salary,
+                                         "sha256": digest, "cached": cached, "response": None})
+            return JSONResponse(status_code=202, content={
+                "message": "Salary slip received, already processed",
+                "job_id": job_id,
+                "status": "done",
+                "poll": f"/upload-salary-slip/{session_id}/jobs/{job_id}"
+            })
+        
+        # PDF parsing / OCR runs in the extraction pool; the client polls for the result
+        try:
+            job_id = extraction_pool.submit(
+                extract_salary_details, file_path, kind="salary_slip", meta={"session_id": session_id}
+            )
+        except JobQueueFull:
+            if is_new:
+                file_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=429, detail="Too many salary slips being processed, please retry shortly",
+                                headers={"Retry-After": "5"})
+        except JobPoolUnavailable as e:
+            if is_new:
+                file_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=503, detail=f"Salary slip processing unavailable: {e}",
+                                headers={"Retry-After": "30"})
+        
+        remember_salary_job(job_id, {"session_id": session_id, "declared_salary": monthly_salary,
+                                     "sha256": digest, "response": None})
+        
+        return JSONResponse(status_code=202, content={
+            "message": "Salary slip received, extracting salary",
+            "job_id": job_id,
+            "status": "queued",
+            "poll": f"/upload-salary-slip/{session_id}/jobs/{job_id}"
+        })
+
+
+@app.get("/upload-salary-slip/{session_id}/jobs/{job_id}")
+async def salary_slip_job_result(session_id: str, job_id: str, background_tasks: BackgroundTasks):
+    salary_job = salary_jobs.get(job_id)
+    if salary_job is None or salary_job["session_id"] != session_id:
+        raise HTTPException(status_code=404, detail="Salary slip job not found")
+    if salary_job["response"] is not None:
+        return salary_job["response"]
     
-    state['loan_status'] = 'underwriting'
-    state['current_agent'] = 'underwriting'
+    if "cached" in salary_job:
+        extraction_status, details = "cached", salary_job["cached"]
+    else:
+        job = extraction_pool.status(job_id)
+        if job is None:
+            salary_jobs.pop(job_id, None)
+            raise HTTPException(status_code=404, detail="Salary slip job expired")
+        extraction_status = job["status"]
+        details = job["result"] if extraction_status == "done" else None
+    if extraction_status in ("queued", "running"):
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": extraction_status},
+                            headers={"Retry-After": "1"})
     
-    try:
-        updated_state = loan_workflow.invoke(state)
-        sessions[session_id] = updated_state
+    async with session_turn(session_id):
+        # A concurrent poll may have applied it while this one waited
+        if salary_job["response"] is not None:
+            return salary_job["response"]
+        if session_id not in sessions:
+            raise HTTPException(status_code=404, detail="Session not found")
         
-        ai_messages = [
-            msg.content for msg in updated_state["messages"] 
-            if hasattr(msg, 'content') and msg.content and not isinstance(msg, HumanMessage)
-        ]
-        last_response = ai_messages[-1] if ai_messages else "Processing your salary slip..."
+        # Apply the extraction exactly once, then continue the workflow
+        state = sessions[session_id]
+        if details is not None and extraction_status == "done":
+            await run_in_threadpool(slip_store.put_result, salary_job["sha256"], EXTRACTOR_VERSION, details)
+        extracted_salary = details["salary"] if details else None
+        state['salary_slip'] = details.get("slip") if details else None
         
-        return {
-            "message": "Salary slip uploaded successfully",
-            "status": updated_state["loan_status"],
-            "response": last_response,
-            "requires_action": "download_sanction_letter" if updated_state["sanction_letter_generated"] else None
-        }
+        state['salary_slip_uploaded'] = True
+        state['monthly_salary'] = extracted_salary or salary_job["declared_salary"]
+        
+        state['loan_status'] = 'underwriting'
+        state['current_agent'] = 'underwriting'
+        
+        try:
+            updated_state = await run_in_threadpool(loan_workflow.invoke, state)
+            sessions[session_id] = updated_state
+            if needs_compaction(updated_state):
+                background_tasks.add_task(compact_session, session_id)
+            
+            last_response = updated_state.get("last_ai_message") or "Processing your salary slip..."
+            
+            salary_job["response"] = {
+                "message": "Salary slip uploaded successfully",
+                "job_id": job_id,
+                "extraction_status": extraction_status,
+                "extracted_salary": extracted_salary,
+                "status": updated_state["loan_status"],
+                "response": last_response,
+                "requires_action": "download_sanction_letter" if updated_state["sanction_letter_generated"] else None
+            }
+            return salary_job["response"]
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing salary slip: {str(e)}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error processing salary slip: {str(e)}")
+
+
+@app.get("/jobs/stats")
+async def job_stats():
+    return extraction_pool.statistics()
+
+
+@app.get("/sessions/locks")
+async def session_lock_stats():
+    return session_locks.statistics()
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = extraction_pool.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# Seconds a client should wait before polling a letter that is still rendering
+SANCTION_RETRY_AFTER_SECONDS = 1
 
 
 @app.get("/download-sanction-letter/{session_id}")
-async def download_sanction_letter(session_id: str):
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    state = sessions[session_id]
-    
-    if not state['sanction_letter_generated'] or not state['sanction_letter_path']:
-        raise HTTPException(status_code=404, detail="Sanction letter not yet generated")
-    
-    pdf_path = Path(state['sanction_letter_path'])
-    
-    if not pdf_path.exists():
-        raise HTTPException(status_code=404, detail="Sanction letter file not found")
-    
-    return FileResponse(
-        path=pdf_path,
-        filename=f"sanction_letter_{state['customer_name'].replace(' ', '_')}.pdf",
-        media_type="application/pdf"
-    )
+async def download_sanction_letter(session_id: str, request: Request):
+    async with session_turn(session_id):
+        if session_id not in sessions:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        state = sessions[session_id]
+        
+        if not state['sanction_letter_generated']:
+            raise HTTPException(status_code=404, detail="Sanction letter not yet generated")
+        
+        status = state.get('sanction_letter_status')
+        if status == 'ready' and not (state['sanction_letter_path'] and Path(state['sanction_letter_path']).exists()):
+            # Removed by the retention job: render it again
+            status = 'failed'
+        if status in ('pending', 'failed'):
+            job = sanction_pool.status(state['sanction_letter_id']) if status == 'pending' else None
+            if job is not None and job["status"] in ("failed", "timeout"):
+                state['sanction_letter_status'] = 'failed'
+                raise HTTPException(status_code=500,
+                                    detail=f"Sanction letter generation failed ({job['error']}), request again to retry")
+            if job is None:
+                # Failed earlier or evicted from the pool's history: render it again,
+                # with the original issue date so the reference and date do not change
+                issued_at = state.get('sanction_letter_issued_at')
+                try:
+                    state['sanction_letter_id'] = submit_sanction_letter(
+                        state, datetime.fromisoformat(issued_at) if issued_at else None
+                    )
+                except JobQueueFull:
+                    raise HTTPException(status_code=429, detail="Too many sanction letters being generated, please retry shortly",
+                                        headers={"Retry-After": "5"})
+                except JobPoolUnavailable as e:
+                    raise HTTPException(status_code=503, detail=f"Sanction letter generation unavailable: {e}",
+                                        headers={"Retry-After": "30"})
+                state['sanction_letter_status'] = 'pending'
+                job = {"status": "queued"}
+            if job["status"] != "done":
+                return JSONResponse(status_code=202,
+                                    content={"letter_id": state['sanction_letter_id'], "status": job["status"]},
+                                    headers={"Retry-After": str(SANCTION_RETRY_AFTER_SECONDS)})
+            mark_sanction_letter_ready(state, job["result"]["sha256"], datetime.fromisoformat(job["result"]["issued_at"]))
+        
+        if not state['sanction_letter_path']:
+            raise HTTPException(status_code=404, detail="Sanction letter not yet generated")
+        
+        pdf_path = Path(state['sanction_letter_path'])
+        
+        if not pdf_path.exists():
+            raise HTTPException(status_code=404, detail="Sanction letter file not found")
+        
+        # Stored letters are content-addressed: the hash is a strong validator
+        headers = {"Cache-Control": "private, no-cache"}
+        if state.get('sanction_letter_hash'):
+            letter_store.touch(state['sanction_letter_hash'])
+            headers["ETag"] = f'"{state["sanction_letter_hash"]}"'
+            if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+            if headers["ETag"] in if_none_match or "*" in if_none_match:
+                return Response(status_code=304, headers=headers)
+        
+        return FileResponse(
+            path=pdf_path,
+            filename=f"sanction_letter_{state['customer_name'].replace(' ', '_')}.pdf",
+            media_type="application/pdf",
+            headers=headers
+        )
 
 
 @app.get("/session/{session_id}/status")
@@ -269,20 +456,151 @@ async def get_session_status(session_id: str):
         "salary_slip_required": state["salary_slip_required"],
         "salary_slip_uploaded": state["salary_slip_uploaded"],
         "sanction_letter_generated": state["sanction_letter_generated"],
+        "sanction_letter_status": state.get("sanction_letter_status"),
+        "messages_in_memory": len(state["messages"]),
+        "summarized_messages": state.get("summarized_messages", 0),
         "workflow_complete": state["workflow_complete"],
         "rejection_reason": state["rejection_reason"]
     }
 
 
+@app.get("/session/{session_id}/schedule")
+async def get_repayment_schedule(session_id: str, format: str = Query("csv")):
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format} (use csv or json)")
+    
+    terms = loan_terms(sessions[session_id])
+    if terms is None:
+        raise HTTPException(status_code=409, detail="Loan amount, rate and tenure not agreed yet")
+    
+    if format == "csv":
+        return StreamingResponse(
+            iter_schedule_csv(*terms),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="schedule_{session_id}.csv"'}
+        )
+    return StreamingResponse(iter_schedule_json(*terms, session_id=session_id), media_type="application/json")
+
+
+@app.get("/sessions/schedules")
+async def export_repayment_schedules(format: str = Query("csv"), status: Optional[str] = None):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format} (use csv or json)")
+    
+    # Snapshot the session list; schedules are generated while streaming
+    snapshot = list(sessions.items())
+    
+    def session_terms():
+        for sid, state in snapshot:
+            if status and state["loan_status"] != status:
+                continue
+            terms = loan_terms(state)
+            if terms is not None:
+                yield sid, terms
+    
+    if format == "csv":
+        return StreamingResponse(
+            iter_bulk_csv(session_terms()),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="schedules.csv"'}
+        )
+    return StreamingResponse(iter_bulk_ndjson(session_terms()), media_type="application/x-ndjson")
+
+
 @app.delete("/session/{session_id}")
 async def delete_session(session_id: str):    
-    if session_id in sessions:
-        del sessions[session_id]
-        return {"message": "Session deleted successfully", "session_id": session_id}
+    async with session_turn(session_id):
+        if session_id in sessions:
+            del sessions[session_id]
+            return {"message": "Session deleted successfully", "session_id": session_id}
     
     raise HTTPException(status_code=404, detail="Session not found")
 
 
+# Shared secret of the workers a session may be handed off between; snapshot endpoints are off without it
+HANDOFF_KEY = os.getenv("CREDSAATHI_HANDOFF_KEY", "")
+
+SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+def handoff_key(request: Request) -> bytes:
+    """
+    Snapshot endpoints are an internal worker-to-worker handoff: the caller must
+    present the shared key in X-Handoff-Key, which also signs the snapshots.
+    """
+    if not HANDOFF_KEY:
+        raise HTTPException(status_code=403, detail="Session handoff is not enabled")
+    supplied = request.headers.get("x-handoff-key", "")
+    if not hmac.compare_digest(supplied.encode(), HANDOFF_KEY.encode()):
+        raise HTTPException(status_code=403, detail="Invalid handoff key")
+    return HANDOFF_KEY.encode()
+
+
+async def read_capped_body(request: Request, limit: int) -> bytes:
+    """Request body, refused with 413 as soon as it exceeds limit bytes."""
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail=f"Snapshot larger than {limit} bytes")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail=f"Snapshot larger than {limit} bytes")
+    return bytes(body)
+
+
+@app.get("/session/{session_id}/snapshot")
+async def export_session_snapshot(session_id: str, request: Request, compress: bool = True,
+                                  format: str = Query("msgpack")):
+    """Signed session state in the graph.state_codec encoding (format=json for an inspectable body)."""
+    key = handoff_key(request)
+    if format not in ("msgpack", "json"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format} (use msgpack or json)")
+    
+    async with session_turn(session_id):
+        if session_id not in sessions:
+            raise HTTPException(status_code=404, detail="Session not found")
+        snapshot = encode_state(sessions[session_id], compress=compress, binary=format == "msgpack", key=key)
+    
+    return Response(
+        content=snapshot,
+        media_type="application/octet-stream",
+        headers={
+            "X-State-Codec-Version": str(CODEC_VERSION),
+            "Content-Disposition": f'attachment; filename="session_{session_id}.csst"'
+        }
+    )
+
+
+@app.put("/session/{session_id}/snapshot")
+async def import_session_snapshot(session_id: str, request: Request):
+    """Take over a session from a signed snapshot another worker exported with GET .../snapshot."""
+    key = handoff_key(request)
+    body = await read_capped_body(request, MAX_SNAPSHOT_BYTES)
+    try:
+        state = decode_state(body, key=key)
+    except StateCodecError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    missing = missing_fields(state)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Snapshot is missing state fields: {', '.join(missing)}")
+    if state["session_id"] != session_id:
+        raise HTTPException(status_code=400, detail="Snapshot belongs to a different session")
+    letter_hash = state["sanction_letter_hash"]
+    if letter_hash is not None and not (isinstance(letter_hash, str) and SHA256_HEX.fullmatch(letter_hash)):
+        raise HTTPException(status_code=400, detail="Invalid sanction_letter_hash in snapshot")
+    # Never serve a file path from a snapshot: the letter lives where its hash says
+    state["sanction_letter_path"] = str(letter_store.path(letter_hash)) if letter_hash else None
+    
+    async with session_turn(session_id):
+        sessions[session_id] = state
+    
+    return {"message": "Session restored", "session_id": session_id, "messages": len(state["messages"])}
+
+
 @app.get("/sessions")
 async def list_sessions():    
     return {
@@ -301,6 +619,17 @@ async def list_sessions():
     }
 
 
+
+@app.get("/shadow/stats")
+async def shadow_stats():
+    return shadow_evaluator.statistics()
+
+
+@app.post("/shadow/reload")
+async def shadow_reload():
+    return {"candidates": shadow_evaluator.reload_candidates()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+class SalarySlip(BaseModel):
+    # Monthly figure used for underwriting and where it came from:
+    # net_pay | gross_pay | monthly_salary | ctc | fallback
+    salary: Optional[float] = Field(default=None, gt=0)
+    salary_source: Optional[str] = None
+    net_pay: Optional[float] = Field(default=None, gt=0)
+    gross_pay: Optional[float] = Field(default=None, gt=0)
+    employee_name: Optional[str] = None
+    employer: Optional[str] = None
+    pay_period: Optional[str] = None  # YYYY-MM
+    confidence: Dict[str, float] = Field(default_factory=dict)
@@ -0,0 +1,86 @@
+"""
+Shared fixtures: LLMs, Groq clients and data services are stubbed, and the
+letter and slip stores live in a temporary directory, so tests run offline
+and leave data/ untouched.
+
+Run from the backend directory:
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(BASE_DIR, ".."))
+
+# Before any agent module is imported
+_STORE_DIR = tempfile.mkdtemp(prefix="credsaathi-tests-")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("CREDSAATHI_LETTER_STORE_DIR", os.path.join(_STORE_DIR, "letters"))
+os.environ.setdefault("CREDSAATHI_SLIP_STORE_DIR", os.path.join(_STORE_DIR, "slips"))
+
+import pytest
+
+import agents.advisor_agent as advisor_agent
+import agents.fraud_agent as fraud_agent
+import agents.master_agent as master_agent
+import agents.sales_agent as sales_agent
+import agents.sanction_generator as sanction_generator
+import agents.underwritting_agent as underwritting_agent
+import agents.verification_agent as verification_agent
+from models.customer import CRMData, Customer, Offer
+from services import data_services
+from utils.fraud_ring import FraudRingIndex
+
+STUB_REPLY = "stub reply"
+
+
+class _StubChatModel:
+    def invoke(self, messages):
+        return type("Response", (), {"content": STUB_REPLY})()
+
+
+class _StubGroq:
+    def __init__(self, *args, **kwargs):
+        message = type("Message", (), {"content": STUB_REPLY})()
+        response = type("Response", (), {"choices": [type("Choice", (), {"message": message})()]})()
+        completions = type("Completions", (), {"create": lambda self, **kwargs: response})()
+        self.chat = type("Chat", (), {"completions": completions})()
+
+
+@pytest.fixture
+def stub_services(monkeypatch):
+    """Offline LLMs, CRM/customer/offer/bureau services and an in-memory fraud ring index."""
+    for module in (master_agent, verification_agent, underwritting_agent):
+        monkeypatch.setattr(module, "llm", _StubChatModel())
+    for module in (sales_agent, fraud_agent, advisor_agent):
+        monkeypatch.setattr(module, "Groq", _StubGroq)
+
+    monkeypatch.setattr(sales_agent.SalesAgent, "_process_message", lambda self, message: {
+        "loan_amount": 200000, "tenure_months": 24, "loan_purpose": "medical",
+        "sentiment": "neutral", "next_question": "",
+    })
+    monkeypatch.setattr(data_services.crm_service, "verify_customer",
+                        lambda phone: CRMData(name="Priya Sharma", phone=phone, address="12 MG Road, Pune"))
+    monkeypatch.setattr(data_services.customer_service, "get_customer_by_name",
+                        lambda name: Customer(customer_id=7, name=name, age=30, city="Pune", current_loan_details="None",
+                                              credit_score=780, pre_approved_limit=300000))
+    monkeypatch.setattr(data_services.offer_service, "get_offer",
+                        lambda phone: Offer(phone=phone, offer_amount=300000, interest_rate=11.0, tenure_months=24))
+    monkeypatch.setattr(data_services.credit_bureau_service, "get_credit_score", lambda phone: 780)
+    monkeypatch.setattr(fraud_agent, "fraud_ring_index", FraudRingIndex())
+    # Letters are queued, not rendered
+    monkeypatch.setattr(sanction_generator, "submit_sanction_letter", lambda state, issued_at=None: "letter-job")
+
+
+@pytest.fixture
+def make_state():
+    """Fresh session state (main.initialize_state) with overrides."""
+    from main import initialize_state
+
+    def make(**overrides):
+        state = initialize_state("+919800000001", "test-session")
+        state.update(overrides)
+        return state
+
+    return make
@@ -0,0 +1,23 @@
+"""
+Closed-form affordability solvers agree with the rounded EMI formula.
+"""
+import numpy as np
+
+from utils.emi import ALLOWED_TENURES, calculate_emi_array, max_principal_array
+
+
+def test_max_principal_is_largest_affordable_amount():
+    rng = np.random.default_rng(7)
+    max_emi = np.round(rng.uniform(2000, 100000, 5000), 2)
+    annual_rate = np.round(rng.uniform(0, 24, 5000), 2)
+    annual_rate[:250] = 0
+    tenure = rng.choice(ALLOWED_TENURES, 5000)
+
+    principal = max_principal_array(max_emi, annual_rate, tenure)
+
+    assert np.all(calculate_emi_array(principal, annual_rate, tenure) <= max_emi)
+    assert not np.any(calculate_emi_array(principal + 1, annual_rate, tenure) <= max_emi)
+
+
+def test_max_principal_without_budget_is_zero():
+    assert max_principal_array(0, 10.5, 24) == 0
@@ -0,0 +1,42 @@
+"""
+FraudAgent checks that read live stores: the fraud ring index (replayed on
+first use, not on import) and salary slip reuse (point-in-time for batch
+re-scoring).
+"""
+import json
+
+import agents.fraud_agent as fraud_agent
+from agents.fraud_agent import FraudAgent
+
+
+def test_fraud_ring_index_is_built_on_first_use(monkeypatch, tmp_path):
+    history = tmp_path / "applications.jsonl"
+    events = [
+        {"event": "application", "phone": phone, "attributes": {"address": "12 MG Road, Pune"}}
+        for phone in ("+919800000001", "+919800000002")
+    ]
+    history.write_text("".join(json.dumps(event) + "\n" for event in events), encoding="utf-8")
+    monkeypatch.setattr(fraud_agent, "FRAUD_HISTORY_PATH", history)
+    monkeypatch.setattr(fraud_agent, "fraud_ring_index", None)
+
+    index = fraud_agent.get_fraud_ring_index()
+
+    assert index.cluster_signal("+919800000001")["cluster_size"] == 2
+    assert fraud_agent.get_fraud_ring_index() is index
+
+
+def test_batch_assessment_uses_recorded_document_reuse(monkeypatch, make_state):
+    # Two more customers uploaded the same slip after this application was made
+    monkeypatch.setattr(fraud_agent.slip_store, "other_customers", lambda digest, customer: 2)
+    state = make_state(customer_name="Priya Sharma", verified_address="12 MG Road, Pune", loan_status="approved",
+                       salary_slip_hash="9f2c" * 16, salary_slip_reuse_count=0)
+    agent = FraudAgent(use_llm=False)
+
+    live = agent.assess(state, include_fraud_ring=False)
+    batch = agent.assess(state, include_fraud_ring=False, live_document_reuse=False)
+    recorded = agent.assess({**state, "salary_slip_reuse_count": 1}, include_fraud_ring=False,
+                            live_document_reuse=False)
+
+    assert "document_reuse" in [flag["type"] for flag in live["fraud_flags"]]
+    assert "document_reuse" not in [flag["type"] for flag in batch["fraud_flags"]]
+    assert "document_reuse" in [flag["type"] for flag in recorded["fraud_flags"]]
@@ -0,0 +1,29 @@
+"""
+The salary slip job table (main.salary_jobs) stays bounded.
+"""
+from collections import OrderedDict
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_expired_job_is_evicted(monkeypatch):
+    monkeypatch.setattr(main, "salary_jobs", OrderedDict())
+    main.remember_salary_job("gone", {"session_id": "test-session", "declared_salary": 50000.0,
+                                      "sha256": "9f2c" * 16, "response": None})
+
+    response = TestClient(main.app).get("/upload-salary-slip/test-session/jobs/gone")
+
+    assert response.status_code == 404
+    assert "gone" not in main.salary_jobs
+
+
+def test_oldest_jobs_beyond_limit_are_dropped(monkeypatch):
+    monkeypatch.setattr(main, "salary_jobs", OrderedDict())
+    monkeypatch.setattr(main, "SALARY_JOBS_KEEP", 3)
+
+    for number in range(5):
+        main.remember_salary_job(f"job-{number}", {"session_id": "test-session", "response": None})
+
+    assert list(main.salary_jobs) == ["job-2", "job-3", "job-4"]
@@ -0,0 +1,37 @@
+"""
+Salary amounts the single-pass parser must (and must not) pick up.
+"""
+import pytest
+
+from utils.salary_parser import parse_salary_slip
+
+
+@pytest.mark.parametrize("text", [
+    "Total: Rs.45,000",
+    "Rs.45000 net pay",
+    "Credited Rs.45,000.00 to your account",
+    "Total: ₹45,000",
+    "₹45000 credited",
+    "Total: INR45000",
+    "Total: Rs. 45,000",
+    "Total: INR 45,000",
+])
+def test_unlabelled_currency_amount(text):
+    assert parse_salary_slip(text).salary == 45000
+
+
+@pytest.mark.parametrize("text", [
+    "Ref 12.45000",
+    "Account 998,45000",
+    "Employee ID EMP102345",
+    "Shift hrs45000",
+])
+def test_number_tails_are_not_amounts(text):
+    assert parse_salary_slip(text).salary is None
+
+
+def test_labelled_amount_wins_over_larger_unlabelled_one():
+    slip = parse_salary_slip("Gross Rs.52,000\nNet Pay: Rs.45,000")
+
+    assert slip.net_pay == 45000
+    assert slip.salary == 45000
@@ -0,0 +1,190 @@
+"""
+graph.state_codec round trips, and the internal session handoff
+(GET|PUT /session/{id}/snapshot) refusing bad, forged and oversized snapshots.
+"""
+import ormsgpack
+import pytest
+import zstandard
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+import graph.state_codec as state_codec
+import main
+from graph.state_codec import (
+    CODEC_VERSION,
+    MAGIC,
+    StateCodecError,
+    decode_state,
+    encode_state,
+    missing_fields,
+)
+from utils.letter_store import letter_store
+
+KEY = b"handoff-test-key"
+SESSION_ID = "test-session"
+LETTER_HASH = "ab01" * 16
+
+
+@pytest.fixture
+def state(make_state):
+    """An approved session with plain and tool-calling messages and an extra key."""
+    state = make_state(
+        customer_name="Priya Sharma", customer_id=7, requested_loan_amount=200000.0, requested_tenure=24,
+        current_loan_details={"existing_emi": 4200, "loans": [{"type": "vehicle", "outstanding": 120000}]},
+        loan_status="approved", sanction_letter_status="ready", sanction_letter_hash=LETTER_HASH,
+        sanction_letter_issued_at="2026-10-19T10:42:07", loan_purpose="wedding",
+    )
+    state["messages"] = [
+        SystemMessage(content="You are CredSaathi, a loan sales assistant.", id="m0"),
+        HumanMessage(content="I need 2 lakh for 24 months", id="m1"),
+        AIMessage(content="", id="m2", tool_calls=[
+            {"name": "calculate_emi", "args": {"principal": 200000, "rate": 11.0, "tenure": 24}, "id": "call_1"}
+        ]),
+        AIMessage(content="Your EMI would be ₹9,322.", id="m3"),
+    ]
+    return state
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("binary", [True, False])
+def test_round_trip(state, compress, binary):
+    assert decode_state(encode_state(state, compress, binary)) == state
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("binary", [True, False])
+def test_absent_keys_stay_absent(state, compress, binary):
+    del state["policy_version"], state["sanction_letter_id"]
+
+    decoded = decode_state(encode_state(state, compress, binary))
+
+    assert decoded == state
+    assert sorted(missing_fields(decoded)) == ["policy_version", "sanction_letter_id"]
+
+
+@pytest.mark.parametrize("label", ["truncated", "foreign", "newer version", "corrupt body"])
+def test_bad_snapshot_raises(state, label):
+    snapshot = encode_state(state)
+    data = {
+        "truncated": snapshot[:len(snapshot) // 2],
+        "foreign": b"%PDF-1.7 not a snapshot",
+        "newer version": snapshot[:4] + bytes((CODEC_VERSION + 1,)) + snapshot[5:],
+        "corrupt body": snapshot[:6] + bytes(b ^ 0xFF for b in snapshot[6:]),
+    }[label]
+
+    with pytest.raises(StateCodecError):
+        decode_state(data)
+
+
+def test_signed_round_trip(state):
+    assert decode_state(encode_state(state, key=KEY), key=KEY) == state
+
+
+def test_rejects_forged_snapshot(state):
+    # A client flips its rejected loan to approved and keeps the signature
+    signed = encode_state({**state, "loan_status": "rejected"}, compress=False, binary=False, key=KEY)
+    forged = signed.replace(b'"rejected"', b'"approved"')
+    assert forged != signed
+
+    with pytest.raises(StateCodecError, match="signature"):
+        decode_state(forged, key=KEY)
+
+
+def test_rejects_unsigned_or_wrongly_signed_snapshot(state):
+    with pytest.raises(StateCodecError, match="not signed"):
+        decode_state(encode_state(state), key=KEY)
+    with pytest.raises(StateCodecError, match="signature"):
+        decode_state(encode_state(state, key=b"another key"), key=KEY)
+
+
+@pytest.mark.parametrize("declares_size", [True, False])
+def test_rejects_decompression_bomb(declares_size):
+    body = ormsgpack.packb([[], [], {"padding": "0" * 2_000_000}, []])
+    compressor = zstandard.ZstdCompressor(write_content_size=declares_size)
+    data = MAGIC + bytes((CODEC_VERSION, state_codec.FLAG_ZSTD)) + compressor.compress(body)
+    assert len(data) < 1_000
+
+    with pytest.raises(StateCodecError):
+        decode_state(data, max_size=1_000_000)
+
+
+def test_rejects_oversized_snapshot(state):
+    with pytest.raises(StateCodecError, match="limit"):
+        decode_state(encode_state(state, compress=False), max_size=100)
+
+
+@pytest.fixture
+def handoff(monkeypatch, state):
+    monkeypatch.setattr(main, "HANDOFF_KEY", KEY.decode())
+    monkeypatch.setitem(main.sessions, SESSION_ID, state)
+    return TestClient(main.app)
+
+
+def put_snapshot(client, data, key=KEY.decode()):
+    return client.put(f"/session/{SESSION_ID}/snapshot", content=data, headers={"X-Handoff-Key": key})
+
+
+def test_handoff_disabled_without_key(monkeypatch):
+    monkeypatch.setattr(main, "HANDOFF_KEY", "")
+    client = TestClient(main.app)
+
+    assert client.get(f"/session/{SESSION_ID}/snapshot").status_code == 403
+    assert client.put(f"/session/{SESSION_ID}/snapshot", content=b"").status_code == 403
+
+
+def test_handoff_requires_key(handoff, state):
+    assert handoff.get(f"/session/{SESSION_ID}/snapshot").status_code == 403
+    assert put_snapshot(handoff, encode_state(state, key=KEY), key="guess").status_code == 403
+
+
+def test_handoff_round_trip(handoff, state):
+    response = handoff.get(f"/session/{SESSION_ID}/snapshot", headers={"X-Handoff-Key": KEY.decode()})
+    assert response.status_code == 200
+    del main.sessions[SESSION_ID]
+
+    assert put_snapshot(handoff, response.content).status_code == 200
+    assert main.sessions[SESSION_ID] == {**state, "sanction_letter_path": str(letter_store.path(LETTER_HASH))}
+
+
+def test_handoff_rejects_forged_snapshot(handoff, state):
+    forged = encode_state({**state, "sanction_letter_path": "/etc/passwd"}, key=b"attacker")
+
+    response = put_snapshot(handoff, forged)
+
+    assert response.status_code == 400
+    assert main.sessions[SESSION_ID] is state
+    assert put_snapshot(handoff, encode_state(state)).status_code == 400
+
+
+def test_handoff_never_trusts_letter_path(handoff, state):
+    snapshot = encode_state({**state, "sanction_letter_path": "/etc/passwd"}, key=KEY)
+
+    assert put_snapshot(handoff, snapshot).status_code == 200
+    assert main.sessions[SESSION_ID]["sanction_letter_path"] == str(letter_store.path(LETTER_HASH))
+
+
+def test_handoff_rejects_bad_letter_hash(handoff, state):
+    snapshot = encode_state({**state, "sanction_letter_hash": "../../etc/passwd"}, key=KEY)
+
+    assert put_snapshot(handoff, snapshot).status_code == 400
+
+
+def test_handoff_requires_full_state(handoff, state):
+    del state["loan_status"]
+
+    response = put_snapshot(handoff, encode_state(state, key=KEY))
+
+    assert response.status_code == 400
+    assert "loan_status" in response.json()["detail"]
+
+
+def test_handoff_rejects_other_session(handoff, state):
+    snapshot = encode_state({**state, "session_id": "another-session"}, key=KEY)
+
+    assert put_snapshot(handoff, snapshot).status_code == 400
+
+
+def test_handoff_caps_body_size(handoff, monkeypatch):
+    monkeypatch.setattr(main, "MAX_SNAPSHOT_BYTES", 1_000)
+
+    assert put_snapshot(handoff, b"\0" * 1_001).status_code == 413
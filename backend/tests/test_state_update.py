@@ -0,0 +1,114 @@
+"""
+Every workflow node must return a partial update and leave its input state
+untouched (graph.state_update). Each node runs through guard_node with the
+guard on, which raises StateMutationError otherwise.
+"""
+import copy
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+import graph.state_update as state_update
+from agents.advisor_agent import advisor_agent_node
+from agents.fraud_agent import fraud_agent_node
+from agents.master_agent import master_agent_node
+from agents.sales_agent import sales_agent_node
+from agents.sanction_generator import sanction_generator_node
+from agents.underwritting_agent import underwriting_agent_node
+from agents.verification_agent import verification_agent_node
+from graph.state_update import StateMutationError, StateUpdate, guard_node
+
+# Customer as the master agent leaves it after the greeting
+CUSTOMER = dict(
+    customer_name="Priya Sharma", customer_id=7, age=30, city="Pune", verified_phone="+919800000001",
+    verified_address="12 MG Road, Pune", credit_score=780, pre_approved_limit=300000,
+    policy_version=None,
+)
+TERMS = dict(requested_loan_amount=200000.0, requested_tenure=24, negotiated_interest_rate=11.0,
+             calculated_emi=9321.57)
+
+NODE_CASES = {
+    "master_greeting": (master_agent_node, dict()),
+    "master_approved": (master_agent_node, dict(**CUSTOMER, **TERMS, loan_status="approved")),
+    "master_rejected": (master_agent_node, dict(**CUSTOMER, **TERMS, loan_status="rejected",
+                                                rejection_reason="Credit score below 700")),
+    "sales": (sales_agent_node, dict(**CUSTOMER, loan_status="negotiating")),
+    "verification": (verification_agent_node, dict(**CUSTOMER, **TERMS, loan_status="negotiating")),
+    "underwriting_approve": (underwriting_agent_node, dict(**CUSTOMER, **TERMS, loan_status="underwriting")),
+    "underwriting_emi_reject": (underwriting_agent_node, dict(
+        **CUSTOMER, **{**TERMS, "requested_loan_amount": 550000.0, "calculated_emi": 25635.0},
+        loan_status="underwriting", salary_slip_uploaded=True, monthly_salary=30000.0)),
+    "fraud": (fraud_agent_node, dict(**CUSTOMER, **TERMS, loan_status="approved")),
+    "advisor": (advisor_agent_node, dict(**{**CUSTOMER, "credit_score": 640}, **TERMS, loan_status="rejected",
+                                         rejection_reason="Credit score below 700")),
+    "sanction": (sanction_generator_node, dict(**CUSTOMER, **TERMS, loan_status="approved")),
+}
+
+
+@pytest.fixture
+def guard_on(monkeypatch):
+    monkeypatch.setattr(state_update, "STATE_GUARD", True)
+
+
+@pytest.mark.parametrize("case", sorted(NODE_CASES))
+def test_node_returns_partial_update_without_mutating_state(case, make_state, stub_services, guard_on):
+    node, overrides = NODE_CASES[case]
+    state = make_state(**overrides)
+    state["messages"] = [AIMessage(content="Welcome!"), HumanMessage(content="I need 2 lakh for 24 months")]
+    before = copy.deepcopy(state)
+
+    update = guard_node(case, node)(state)
+
+    assert isinstance(update, dict) and update is not state
+    assert state == before
+    # Only messages the node added, never the history it was given
+    assert all(message not in state["messages"] for message in update.get("messages", []))
+
+
+def test_guard_rejects_in_place_mutation(make_state, guard_on):
+    def mutating_node(state):
+        state["loan_status"] = "approved"
+        return {"loan_status": "approved"}
+
+    with pytest.raises(StateMutationError, match="loan_status"):
+        guard_node("mutating", mutating_node)(make_state())
+
+
+def test_guard_rejects_appended_message(make_state, guard_on):
+    def appending_node(state):
+        state["messages"].append(AIMessage(content="hi"))
+        return {}
+
+    with pytest.raises(StateMutationError, match="messages"):
+        guard_node("appending", appending_node)(make_state())
+
+
+def test_guard_rejects_whole_state_return(make_state, guard_on):
+    with pytest.raises(StateMutationError, match="whole input state"):
+        guard_node("whole", lambda state: state)(make_state())
+
+
+def test_guard_off_returns_node_unchanged(monkeypatch):
+    monkeypatch.setattr(state_update, "STATE_GUARD", False)
+
+    def node(state):
+        return {}
+
+    assert guard_node("node", node) is node
+
+
+def test_state_update_reads_through_and_collects_changes(make_state):
+    state = make_state(loan_status="negotiating")
+    update = StateUpdate(state)
+    update["loan_status"] = "approved"
+    update.add_message(AIMessage(content="Approved!"))
+
+    assert update["loan_status"] == "approved" and state["loan_status"] == "negotiating"
+    assert update["phone"] == state["phone"]
+    assert update.changes() == {
+        "loan_status": "approved",
+        "last_ai_message": "Approved!",
+        "messages": [AIMessage(content="Approved!")],
+    }
+    with pytest.raises(TypeError):
+        update["messages"] = []
@@ -0,0 +1,265 @@
+"""
+Eligibility Index Module
+Precomputed pre-qualification for every known customer, stored in a compact
+memory-mapped file so the Master agent can quote real numbers in its greeting.
+
+File layout (little endian):
+    64-byte header: magic, format version, tenure count, slot capacity,
+                    record count, build time, policy version, tenures
+    capacity fixed-size records forming an open-addressing hash table keyed
+    by the phone number's digits (key 0 marks an empty slot)
+
+A lookup hashes the phone to a slot and probes linearly, touching one or two
+records. The batch job (data/scripts/build_eligibility_index.py) writes a new
+file and swaps it in with os.replace; readers notice the change and remap.
+"""
+
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.emi import calculate_emi_array
+from utils.policy import CompiledPolicy
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent / "data" / "eligibility" / "eligibility.idx"
+
+MAGIC = b"CSEI"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQQd16s8H")
+STANDARD_TENURES = (12, 24, 36, 48, 60)
+MAX_LOAD_FACTOR = 0.7
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+FLAG_ELIGIBLE = 1
+
+
+def record_dtype(n_tenures: int) -> np.dtype:
+    """Packed record: amounts and EMIs in whole rupees, rate in basis points."""
+    return np.dtype([
+        ("key", "<u8"),
+        ("credit_score", "<u2"),
+        ("rate_bp", "<u2"),
+        ("max_tenure", "u1"),
+        ("flags", "u1"),
+        ("reserved", "<u2"),
+        ("instant_ceiling", "<u4"),
+        ("slip_ceiling", "<u4"),
+        ("emi", "<u4", (n_tenures,)),
+    ])
+
+
+def phone_key(phone: str) -> int:
+    """Phone number digits as an integer ("+917835414968" → 917835414968)."""
+    digits = "".join(ch for ch in str(phone) if ch.isdigit())
+    return int(digits) if digits else 0
+
+
+def _home_slot(key: int, bits: int) -> int:
+    return ((key * _GOLDEN) & _MASK64) >> (64 - bits)
+
+
+def compute_eligibility(keys, credit_score, pre_approved_limit, interest_rate, tenure_months,
+                        policy: CompiledPolicy, tenures=STANDARD_TENURES) -> np.ndarray:
+    """
+    Vectorized pre-qualification for arrays of customers.
+
+    Returns:
+        Structured array of records (one per customer, not yet hashed into slots)
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    score = np.nan_to_num(np.asarray(credit_score, dtype=np.float64))
+    limit = np.asarray(pre_approved_limit, dtype=np.float64)
+    rate = np.asarray(interest_rate, dtype=np.float64)
+
+    instant = np.floor(limit * policy.instant_approval_ratio)
+    emi = calculate_emi_array(
+        np.maximum(instant, 1.0)[:, None], rate[:, None], np.asarray(tenures, dtype=np.float64)[None, :]
+    )
+
+    records = np.zeros(len(keys), dtype=record_dtype(len(tenures)))
+    records["key"] = keys
+    records["credit_score"] = np.clip(score, 0, 65535)
+    records["rate_bp"] = np.round(rate * 100)
+    records["max_tenure"] = np.clip(np.asarray(tenure_months), 0, 255)
+    records["flags"] = np.where(score >= policy.min_credit_score, FLAG_ELIGIBLE, 0)
+    records["instant_ceiling"] = instant
+    records["slip_ceiling"] = np.floor(limit * policy.max_loan_ratio)
+    records["emi"] = np.round(emi)
+    return records
+
+
+def place_records(records: np.ndarray) -> np.ndarray:
+    """
+    Hash records into a power-of-two slot table with linear probing.
+
+    All records probe in lock step: each round, one record aiming at each free
+    slot claims it and the rest move one slot on, so the table is built
+    in a few dozen vectorized rounds instead of one Python step per customer.
+    Later duplicates of a key replace earlier ones.
+    """
+    # Keep the last record for each key
+    _, last = np.unique(records["key"][::-1], return_index=True)
+    records = records[len(records) - 1 - last]
+
+    n = len(records)
+    bits = max(int(np.ceil(np.log2(max(n, 1) / MAX_LOAD_FACTOR))), 4)
+    capacity = 1 << bits
+    mask = capacity - 1
+
+    with np.errstate(over="ignore"):
+        position = ((records["key"] * np.uint64(_GOLDEN)) >> np.uint64(64 - bits)).astype(np.int64)
+
+    owner = np.full(capacity, -1, dtype=np.int64)
+    pending = np.arange(n)
+    while pending.size:
+        target = position[pending]
+        free = owner[target] == -1
+        # Colliding claims on one slot: a single writer wins, read it back
+        owner[target[free]] = pending[free]
+        won = free & (owner[target] == pending)
+        pending = pending[~won]
+        position[pending] = (position[pending] + 1) & mask
+
+    table = np.zeros(capacity, dtype=records.dtype)
+    filled = owner >= 0
+    table[filled] = records[owner[filled]]
+    return table
+
+
+def write_eligibility_index(path: Path, table: np.ndarray, policy_version: str,
+                            tenures=STANDARD_TENURES) -> int:
+    """
+    Write a placed table atomically (temp file + os.replace).
+
+    Returns:
+        File size in bytes
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    padded = tuple(tenures) + (0,) * (8 - len(tenures))
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(tenures), len(table), int(np.count_nonzero(table["key"])),
+        time.time(), policy_version.encode("utf-8")[:16], *padded,
+    )
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(header)
+        table.tofile(f)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+class EligibilityIndex:
+    """
+    Read side of the eligibility file. lookup() is O(1) against a memory map;
+    the file is re-checked at most once per check_interval and remapped when
+    the batch job has replaced it.
+    """
+
+    def __init__(self, path: Path, check_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        # (records, bits, tenures, policy_version), swapped in one assignment
+        self._mapped = None
+        self._signature = None
+        self._next_check = 0.0
+        self.tenures = ()
+        self.policy_version = None
+        self.built_at = None
+        self.count = 0
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            stat = self.path.stat()
+        except OSError:
+            if self._signature is not None:
+                print(f"⚠️ Eligibility index {self.path} disappeared")
+            self._mapped, self._signature = None, None
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        try:
+            self._open()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not open eligibility index {self.path}: {e}")
+            self._mapped = None
+        self._signature = signature
+
+    def _open(self) -> None:
+        with self.path.open("rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("truncated header")
+        magic, version, n_tenures, capacity, count, built_at, policy_version, *tenures = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"unsupported format {magic!r} v{version}")
+
+        records = np.memmap(self.path, dtype=record_dtype(n_tenures), mode="r",
+                            offset=HEADER.size, shape=(capacity,))
+        self.tenures = tuple(tenures[:n_tenures])
+        self.policy_version = policy_version.rstrip(b"\0").decode("utf-8")
+        self.built_at = built_at
+        self.count = count
+        self._mapped = (records, capacity.bit_length() - 1, self.tenures, self.policy_version)
+
+    def lookup(self, phone: str) -> Optional[Dict]:
+        """
+        Pre-qualification for a phone number.
+
+        Returns:
+            Dictionary with eligible, credit_score, interest_rate,
+            instant_approval_limit, max_loan_with_salary_slip, max_tenure_months,
+            emi_table (tenure → EMI at the instant approval limit) and
+            policy_version; None if the customer or the index is missing
+        """
+        self._refresh()
+        mapped = self._mapped
+        key = phone_key(phone)
+        if mapped is None or not key:
+            return None
+        records, bits, tenures, policy_version = mapped
+
+        mask = len(records) - 1
+        slot = _home_slot(key, bits)
+        while True:
+            record = records[slot]
+            stored = int(record["key"])
+            if stored == key:
+                break
+            if stored == 0:
+                return None
+            slot = (slot + 1) & mask
+
+        return {
+            "eligible": bool(record["flags"] & FLAG_ELIGIBLE),
+            "credit_score": int(record["credit_score"]),
+            "interest_rate": int(record["rate_bp"]) / 100,
+            "instant_approval_limit": int(record["instant_ceiling"]),
+            "max_loan_with_salary_slip": int(record["slip_ceiling"]),
+            "max_tenure_months": int(record["max_tenure"]),
+            "emi_table": dict(zip(tenures, (int(emi) for emi in record["emi"]))),
+            "policy_version": policy_version,
+        }
+
+
+eligibility_index = EligibilityIndex(Path(os.getenv("CREDSAATHI_ELIGIBILITY_INDEX", DEFAULT_INDEX_PATH)))
+
+
+__all__ = [
+    "EligibilityIndex",
+    "compute_eligibility",
+    "eligibility_index",
+    "phone_key",
+    "place_records",
+    "write_eligibility_index",
+]
@@ -1,8 +1,18 @@
 """
 EMI (Equated Monthly Installment) Calculator Module
 Implements standard Indian loan calculation formulas
+
+Scalar helpers work on one loan; the *_array functions and amortization_schedule
+accept NumPy arrays (or scalars) and broadcast over many loans at once.
 """
 
+from typing import Dict
+
+import numpy as np
+
+# Tenures offered to customers, in months
+ALLOWED_TENURES = tuple(range(12, 121, 12))
+
 def calculate_emi(principal: float, annual_rate: float, tenure_months: int) -> float:
     """
     Calculate EMI using the standard formula:
@@ -96,17 +106,15 @@ def suggest_tenure_for_affordability(principal: float, annual_rate: float, month
         Dictionary with suggested tenure and corresponding EMI
     """
     max_emi = monthly_salary * max_emi_ratio
+    tenure = int(minimum_tenure_array(principal, annual_rate, max_emi))
     
-    # Try tenures from 12 to 120 months
-    for tenure in range(12, 121, 12):
-        emi = calculate_emi(principal, annual_rate, tenure)
-        if emi <= max_emi:
-            return {
-                "suggested_tenure_months": tenure,
-                "suggested_tenure_years": tenure / 12,
-                "resulting_emi": emi,
-                "affordable": True
-            }
+    if tenure:
+        return {
+            "suggested_tenure_months": tenure,
+            "suggested_tenure_years": tenure / 12,
+            "resulting_emi": calculate_emi(principal, annual_rate, tenure),
+            "affordable": True
+        }
     
     # If no tenure works, return max tenure option
     emi = calculate_emi(principal, annual_rate, 120)
@@ -117,3 +125,274 @@ def suggest_tenure_for_affordability(principal: float, annual_rate: float, month
         "affordable": emi <= max_emi,
         "note": "Could not find affordable tenure within 10 years"
     }
+
+
+def affordable_terms(principal: float, annual_rate: float, tenure_months: int,
+                     monthly_salary: float, max_emi_ratio: float = 0.5) -> dict:
+    """
+    Counter-offer terms for a loan whose EMI is over the salary cap.
+    
+    Args:
+        principal: Requested loan amount
+        annual_rate: Annual interest rate
+        tenure_months: Requested tenure
+        monthly_salary: Monthly salary
+        max_emi_ratio: Maximum allowed EMI ratio
+    
+    Returns:
+        Dictionary with the EMI cap, the shortest allowed tenure that makes the
+        requested amount affordable (None if no tenure does) and the largest
+        amount affordable at the requested tenure
+    
+    Example:
+        >>> affordable_terms(500000, 10.5, 24, 30000)
+        {'max_emi': 15000.0, 'affordable_tenure_months': 48, 'affordable_tenure_emi': 12801.69, 'max_principal': 323442.0}
+    """
+    max_emi = monthly_salary * max_emi_ratio
+    tenure = int(minimum_tenure_array(principal, annual_rate, max_emi))
+    return {
+        "max_emi": round(max_emi, 2),
+        "affordable_tenure_months": tenure or None,
+        "affordable_tenure_emi": calculate_emi(principal, annual_rate, tenure) if tenure else None,
+        "max_principal": float(max_principal_array(max_emi, annual_rate, tenure_months)),
+    }
+
+
+def calculate_emi_array(principal, annual_rate, tenure_months) -> np.ndarray:
+    """
+    Vectorized calculate_emi: same formula and rounding, broadcast over arrays.
+    
+    Args:
+        principal: Loan amounts (array or scalar)
+        annual_rate: Annual interest rates in percent (array or scalar)
+        tenure_months: Tenures in months (array or scalar)
+    
+    Returns:
+        Array of monthly EMIs (rounded to the paisa, except 0% loans,
+        which match the scalar principal / tenure)
+    
+    Example:
+        >>> calculate_emi_array([500000, 200000], 10.5, [60, 24])
+        array([10746.95,  9275.21])
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+    tenure_months = np.asarray(tenure_months, dtype=np.float64)
+    
+    if np.any(principal <= 0) or np.any(tenure_months <= 0) or np.any(annual_rate < 0):
+        raise ValueError("Principal, tenure, and rate must be positive values")
+    
+    monthly_rate = annual_rate / 12 / 100
+    growth = (1 + monthly_rate) ** tenure_months
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.round((principal * monthly_rate * growth) / (growth - 1), 2)
+    
+    # 0% interest: straight division, like the scalar path
+    return np.where(monthly_rate == 0, principal / tenure_months, emi)
+
+
+def calculate_total_repayment_array(emi, tenure_months) -> np.ndarray:
+    """Vectorized calculate_total_repayment"""
+    return np.round(np.asarray(emi, dtype=np.float64) * np.asarray(tenure_months, dtype=np.float64), 2)
+
+
+def calculate_total_interest_array(principal, total_repayment) -> np.ndarray:
+    """Vectorized calculate_total_interest"""
+    return np.round(np.asarray(total_repayment, dtype=np.float64) - np.asarray(principal, dtype=np.float64), 2)
+
+
+def amortization_schedule(principal, annual_rate, tenure_months) -> Dict[str, np.ndarray]:
+    """
+    Month-by-month amortization schedule for one or many loans.
+    
+    Each month's interest is charged on the outstanding balance and rounded to the
+    paisa; the rest of the EMI repays principal. The final installment is adjusted
+    so the balance closes at exactly zero. Months are computed in one vectorized
+    step across all loans.
+    
+    Args:
+        principal: Loan amounts (array or scalar)
+        annual_rate: Annual interest rates in percent
+        tenure_months: Tenures in months
+    
+    Returns:
+        Dictionary of arrays shaped (loans, max_tenure): month, emi, interest,
+        principal and balance (months after a loan's tenure are 0).
+        For scalar inputs the leading loans axis is dropped.
+    
+    Example:
+        >>> schedule = amortization_schedule(500000, 10.5, 60)
+        >>> schedule["balance"][-1]
+        0.0
+    """
+    scalar_input = np.ndim(principal) == 0 and np.ndim(annual_rate) == 0 and np.ndim(tenure_months) == 0
+    principal, annual_rate, tenure_months = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=np.float64)),
+        np.atleast_1d(np.asarray(annual_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(tenure_months, dtype=np.int64)),
+    )
+    
+    emi = calculate_emi_array(principal, annual_rate, tenure_months)
+    monthly_rate = annual_rate / 12 / 100
+    loans, months = principal.shape[0], int(tenure_months.max())
+    
+    interest = np.zeros((loans, months))
+    repaid = np.zeros((loans, months))
+    installment = np.zeros((loans, months))
+    balance = np.zeros((loans, months))
+    
+    outstanding = principal.copy()
+    for m in range(months):
+        active = m < tenure_months
+        last = m == tenure_months - 1
+        
+        month_interest = np.round(outstanding * monthly_rate, 2)
+        month_principal = np.where(last, outstanding, np.round(emi - month_interest, 2))
+        month_principal = np.minimum(month_principal, outstanding)
+        
+        interest[:, m] = np.where(active, month_interest, 0.0)
+        repaid[:, m] = np.where(active, month_principal, 0.0)
+        installment[:, m] = np.round(interest[:, m] + repaid[:, m], 2)
+        outstanding = np.where(active, np.round(outstanding - month_principal, 2), outstanding)
+        balance[:, m] = np.where(active, outstanding, 0.0)
+    
+    schedule = {
+        "month": np.broadcast_to(np.arange(1, months + 1), (loans, months)),
+        "emi": installment,
+        "interest": interest,
+        "principal": repaid,
+        "balance": balance,
+    }
+    if scalar_input:
+        return {name: values[0] for name, values in schedule.items()}
+    return schedule
+
+
+def iter_amortization_schedule(principal: float, annual_rate: float, tenure_months: int):
+    """
+    Yield the amortization schedule one month at a time.
+    
+    Same arithmetic as amortization_schedule (NumPy rounding included), but holds
+    only the running balance, so callers can stream very long schedules.
+    
+    Yields:
+        Dictionaries with month, emi, interest, principal and balance
+    
+    Example:
+        >>> next(iter_amortization_schedule(500000, 10.5, 60))
+        {'month': 1, 'emi': 10746.95, 'interest': 4375.0, 'principal': 6371.95, 'balance': 493628.05}
+    """
+    tenure_months = int(tenure_months)
+    emi = float(calculate_emi_array(principal, annual_rate, tenure_months))
+    monthly_rate = annual_rate / 12 / 100
+    outstanding = float(principal)
+    
+    for month in range(1, tenure_months + 1):
+        interest = float(np.round(outstanding * monthly_rate, 2))
+        if month == tenure_months:
+            repaid = outstanding
+        else:
+            repaid = min(float(np.round(emi - interest, 2)), outstanding)
+        outstanding = float(np.round(outstanding - repaid, 2))
+        yield {
+            "month": month,
+            "emi": float(np.round(interest + repaid, 2)),
+            "interest": interest,
+            "principal": repaid,
+            "balance": outstanding,
+        }
+
+
+def minimum_tenure_array(principal, annual_rate, max_emi, allowed_tenures=ALLOWED_TENURES) -> np.ndarray:
+    """
+    Shortest allowed tenure whose EMI fits under max_emi, solved in closed form.
+    
+    Inverting the EMI formula gives the exact number of months
+    N = -log(1 - P * R / E) / log(1 + R), which is rounded up to the next allowed
+    tenure. The EMI at that tenure is then checked with the rounded formula, so the
+    result agrees with calculate_emi(...) <= max_emi.
+    
+    Args:
+        principal: Loan amounts (array or scalar)
+        annual_rate: Annual interest rates in percent
+        max_emi: Largest affordable EMI
+        allowed_tenures: Sorted tenures to choose from
+    
+    Returns:
+        Array of tenures in months (0 where even the longest tenure is unaffordable)
+    
+    Example:
+        >>> minimum_tenure_array([500000, 200000], 10.5, 15000)
+        array([48, 24])
+    """
+    principal, annual_rate, max_emi = np.broadcast_arrays(
+        np.asarray(principal, dtype=np.float64),
+        np.asarray(annual_rate, dtype=np.float64),
+        np.asarray(max_emi, dtype=np.float64),
+    )
+    tenures = np.asarray(allowed_tenures, dtype=np.int64)
+    monthly_rate = annual_rate / 12 / 100
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # EMI never drops to the monthly interest, so E <= P * R has no solution
+        exact = np.where(
+            monthly_rate == 0,
+            principal / max_emi,
+            -np.log1p(-principal * monthly_rate / max_emi) / np.log1p(monthly_rate),
+        )
+    exact = np.where((max_emi > 0) & np.isfinite(exact) & (exact > 0), exact, np.inf)
+    
+    # Round up to an allowed tenure, then step once more if paisa rounding pushed
+    # the EMI over the cap right at the boundary
+    index = np.searchsorted(tenures, exact - 1e-9, side="left")
+    for _ in range(2):
+        valid = index < len(tenures)
+        tenure = tenures[np.minimum(index, len(tenures) - 1)]
+        emi = calculate_emi_array(np.where(principal > 0, principal, 1.0), annual_rate, tenure)
+        index = np.where(valid & (emi > max_emi), index + 1, index)
+    
+    result = np.where(index < len(tenures), tenures[np.minimum(index, len(tenures) - 1)], 0)
+    return result if result.ndim else result[()]
+
+
+def max_principal_array(max_emi, annual_rate, tenure_months) -> np.ndarray:
+    """
+    Largest loan amount (whole rupees) whose EMI fits under max_emi.
+    
+    Present value of the EMI stream: P = E * (1 - (1 + R)^-N) / R, taken at the
+    largest EMI that still rounds (to the paisa) to max_emi and rounded down.
+    One EMI check with the rounded formula then steps back a rupee where
+    floating point overshot, so the result is the largest principal with
+    calculate_emi(...) <= max_emi.
+    
+    Args:
+        max_emi: Largest affordable EMI (array or scalar)
+        annual_rate: Annual interest rates in percent
+        tenure_months: Tenures in months
+    
+    Returns:
+        Array of maximum principals (0 where the cap is not positive)
+    
+    Example:
+        >>> max_principal_array(15000, 10.5, [24, 60])
+        array([323442., 697872.])
+    """
+    max_emi = np.asarray(max_emi, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+    tenure_months = np.asarray(tenure_months, dtype=np.float64)
+    monthly_rate = annual_rate / 12 / 100
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(
+            monthly_rate == 0,
+            tenure_months,
+            -np.expm1(-tenure_months * np.log1p(monthly_rate)) / monthly_rate,
+        )
+    # 0% EMIs are not rounded (see calculate_emi), so their cap is exact
+    emi_cap = np.where(monthly_rate == 0, max_emi, max_emi + 0.005)
+    principal = np.floor(emi_cap * annuity + 1e-6)
+    
+    emi = calculate_emi_array(np.maximum(principal, 1.0), annual_rate, tenure_months)
+    result = np.where(max_emi > 0, np.where(emi > max_emi, principal - 1, principal), 0.0)
+    return result if result.ndim else result[()]
@@ -0,0 +1,247 @@
+"""
+Fraud Ring Detection Module
+Links loan applications that share an address or an employer name.
+
+Applicants (phones) and their attributes are nodes of an entity-link graph kept
+in a union-find structure, so linking a new application and reading its cluster
+signal both run in near-constant (inverse Ackermann) time.
+Every event that changes the graph is appended to a JSONL history log, which can
+be replayed to rebuild the index offline or after a restart. Re-linking an
+application with attributes it already has (every fraud turn does) is not logged.
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Application attributes that link otherwise unrelated applicants
+LINK_ATTRIBUTES = ("address", "employer")
+
+
+def _normalize(value) -> Optional[str]:
+    """Lower-case and strip punctuation so trivially different spellings link."""
+    if value is None:
+        return None
+    text = re.sub(r"[^a-z0-9]+", " ", str(value).lower()).strip()
+    return text or None
+
+
+class FraudRingIndex:
+    """
+    Incremental union-find over applicants and their shared attributes.
+
+    Each cluster root carries the number of applicants in the cluster and how
+    many of them were rejected, so cluster size and rejection rate never
+    require walking the cluster.
+    """
+
+    def __init__(self, history_path: Optional[Path] = None) -> None:
+        self.history_path = Path(history_path) if history_path else None
+        self._parent: Dict[str, str] = {}
+        self._weight: Dict[str, int] = {}      # nodes per root (union by size)
+        self._applicants: Dict[str, int] = {}  # applicant nodes per root
+        self._rejected: Dict[str, int] = {}    # rejected applicants per root
+        self._outcomes: Dict[str, str] = {}    # phone -> latest loan status
+        self._links: Dict[str, set] = {}       # phone -> attribute nodes already linked
+        self._lock = threading.Lock()
+
+    # ---------- union-find primitives ----------
+
+    def _add_node(self, node: str, is_applicant: bool) -> None:
+        if node not in self._parent:
+            self._parent[node] = node
+            self._weight[node] = 1
+            self._applicants[node] = 1 if is_applicant else 0
+            self._rejected[node] = 0
+
+    def _find(self, node: str) -> str:
+        parent = self._parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def _union(self, a: str, b: str) -> str:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return root_a
+        if self._weight[root_a] < self._weight[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._weight[root_a] += self._weight.pop(root_b)
+        self._applicants[root_a] += self._applicants.pop(root_b)
+        self._rejected[root_a] += self._rejected.pop(root_b)
+        return root_a
+
+    # ---------- public API ----------
+
+    def add_application(self, phone: str, attributes: Dict[str, Optional[str]], log: bool = True) -> Dict:
+        """
+        Link an application into the graph and return its cluster signal.
+
+        Args:
+            phone: Applicant phone number (one node per applicant)
+            attributes: Mapping of LINK_ATTRIBUTES names to raw values (None is skipped)
+            log: Append the event to the history log
+
+        Returns:
+            Cluster signal dictionary (see cluster_signal)
+        """
+        applicant = f"phone:{phone}"
+        links = {
+            name: _normalize(attributes.get(name))
+            for name in LINK_ATTRIBUTES
+        }
+        links = {name: value for name, value in links.items() if value}
+
+        with self._lock:
+            self._add_node(applicant, is_applicant=True)
+            known = self._links.setdefault(phone, set())
+            new_links = {name: value for name, value in links.items() if f"{name}:{value}" not in known}
+            for name, value in new_links.items():
+                node = f"{name}:{value}"
+                self._add_node(node, is_applicant=False)
+                self._union(applicant, node)
+                known.add(node)
+            signal = self._signal(applicant)
+            if log and new_links:
+                self._log({"event": "application", "phone": phone, "attributes": new_links})
+
+        return signal
+
+    def record_outcome(self, phone: str, loan_status: str, log: bool = True) -> None:
+        """
+        Record the latest decision for an applicant so cluster rejection rates stay current.
+        """
+        applicant = f"phone:{phone}"
+        with self._lock:
+            self._add_node(applicant, is_applicant=True)
+            previous = self._outcomes.get(phone)
+            if previous == loan_status:
+                return
+            self._outcomes[phone] = loan_status
+
+            root = self._find(applicant)
+            if previous == "rejected":
+                self._rejected[root] -= 1
+            if loan_status == "rejected":
+                self._rejected[root] += 1
+            if log:
+                self._log({"event": "outcome", "phone": phone, "loan_status": loan_status})
+
+    def cluster_signal(self, phone: str) -> Dict:
+        """
+        Get cluster size and rejection rate for an applicant.
+
+        Returns:
+            Dictionary with cluster_size (applicants), rejected_in_cluster and
+            cluster_rejection_rate (0-1). Unknown applicants form a cluster of one.
+        """
+        applicant = f"phone:{phone}"
+        with self._lock:
+            if applicant not in self._parent:
+                return {"cluster_size": 1, "rejected_in_cluster": 0, "cluster_rejection_rate": 0.0}
+            return self._signal(applicant)
+
+    def _signal(self, applicant: str) -> Dict:
+        root = self._find(applicant)
+        size = self._applicants[root]
+        rejected = self._rejected[root]
+        return {
+            "cluster_size": size,
+            "rejected_in_cluster": rejected,
+            "cluster_rejection_rate": rejected / size if size else 0.0,
+        }
+
+    def clusters(self, min_size: int = 2) -> List[Dict]:
+        """
+        Group applicants by cluster (O(n), intended for offline reporting).
+
+        Returns:
+            Clusters with at least min_size applicants, largest first
+        """
+        with self._lock:
+            members: Dict[str, List[str]] = {}
+            attributes: Dict[str, List[str]] = {}
+            for node in self._parent:
+                root = self._find(node)
+                kind, _, value = node.partition(":")
+                if kind == "phone":
+                    members.setdefault(root, []).append(value)
+                else:
+                    attributes.setdefault(root, []).append(node)
+
+            result = [
+                {
+                    "phones": sorted(phones),
+                    "shared_attributes": sorted(attributes.get(root, [])),
+                    "cluster_size": len(phones),
+                    "rejected_in_cluster": self._rejected[root],
+                    "cluster_rejection_rate": self._rejected[root] / len(phones),
+                }
+                for root, phones in members.items()
+                if len(phones) >= min_size
+            ]
+
+        result.sort(key=lambda c: (c["cluster_size"], c["cluster_rejection_rate"]), reverse=True)
+        return result
+
+    def statistics(self) -> Dict:
+        """Summary counters for monitoring."""
+        with self._lock:
+            roots = [node for node, parent in self._parent.items() if node == parent]
+            sizes = [self._applicants[root] for root in roots if self._applicants[root]]
+        return {
+            "applicants": sum(sizes),
+            "clusters": len(sizes),
+            "linked_clusters": sum(1 for size in sizes if size > 1),
+            "largest_cluster": max(sizes, default=0),
+        }
+
+    # ---------- history log ----------
+
+    def _log(self, event: Dict) -> None:
+        if not self.history_path:
+            return
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.history_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def replay(self, events: Iterable[Dict]) -> int:
+        """
+        Apply history events without re-logging them.
+
+        Returns:
+            Number of events applied
+        """
+        count = 0
+        for event in events:
+            if event.get("event") == "application":
+                self.add_application(event["phone"], event.get("attributes", {}), log=False)
+            elif event.get("event") == "outcome":
+                self.record_outcome(event["phone"], event["loan_status"], log=False)
+            else:
+                continue
+            count += 1
+        return count
+
+    @classmethod
+    def rebuild(cls, history_path: Path) -> "FraudRingIndex":
+        """
+        Build an index by replaying the full JSONL history log.
+        New events keep being appended to the same log.
+        """
+        index = cls(history_path=history_path)
+        path = Path(history_path)
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                index.replay(json.loads(line) for line in f if line.strip())
+        return index
+
+
+__all__ = ["FraudRingIndex", "LINK_ATTRIBUTES"]
@@ -0,0 +1,254 @@
+"""
+Background Job Pool Module
+Runs CPU-heavy work (salary slip parsing and OCR, sanction letter rendering)
+in bounded process pools so request handlers return immediately and clients
+poll for the result.
+
+- Admission control: at most max_pending unfinished jobs; submit() raises
+  JobQueueFull beyond that (HTTP 429) and JobPoolUnavailable when the pool
+  is shutting down or cannot be restarted (HTTP 503).
+- Per-job timeouts are enforced inside the worker with an interval timer, so
+  a stuck parse frees its worker instead of blocking it forever. The parent
+  also marks a job timed out if no answer arrives shortly after the deadline.
+- Finished jobs are kept (bounded) for status polling.
+"""
+
+import os
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+# Extra time the parent waits past a job's deadline before giving up on it
+TIMEOUT_GRACE_SECONDS = 2.0
+
+
+class JobQueueFull(Exception):
+    """Too many unfinished jobs - the caller should retry later."""
+
+
+class JobPoolUnavailable(Exception):
+    """The pool is shutting down or its workers could not be started."""
+
+
+class JobTimeout(Exception):
+    """Raised inside a worker when a job exceeds its time budget."""
+
+
+def _raise_timeout(signum, frame):
+    raise JobTimeout()
+
+
+def _run_with_timeout(fn: Callable, args: tuple, kwargs: dict, timeout: Optional[float]):
+    """Worker-side wrapper: interrupt fn after timeout seconds (Unix only)."""
+    if not timeout or not hasattr(signal, "setitimer"):
+        return fn(*args, **kwargs)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _noop() -> None:
+    return None
+
+
+class JobPool:
+    """
+    Bounded ProcessPoolExecutor with admission control, timeouts and job status.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 default_timeout: float = 30.0, keep_finished: int = 1000) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Default: a few jobs queued per worker, beyond that shed load
+        self.max_pending = max_pending or self.max_workers * 4
+        self.default_timeout = default_timeout
+        self.keep_finished = keep_finished
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending = 0
+        self._closed = False
+        self.counters = {"submitted": 0, "rejected": 0, "done": 0, "failed": 0, "timeout": 0}
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def start(self) -> None:
+        """
+        Start the workers now (e.g. at application startup). With the fork start
+        method all workers are created on the first submission, so doing it early
+        forks them before the server has started its own threads.
+        """
+        with self._lock:
+            if not self._closed:
+                self._ensure_executor().submit(_noop)
+
+    def submit(self, fn: Callable, *args, timeout: Optional[float] = None,
+               kind: str = "job", meta: Optional[Dict] = None, **kwargs) -> str:
+        """
+        Queue fn(*args, **kwargs) on a worker process.
+
+        Args:
+            fn: Picklable top-level function
+            timeout: Seconds allowed once the job starts (default: default_timeout)
+            kind: Job type shown in status
+            meta: Extra caller data kept with the job (not sent to the worker)
+
+        Returns:
+            Job id for status()
+
+        Raises:
+            JobQueueFull: max_pending jobs are already unfinished
+            JobPoolUnavailable: pool closed or workers could not be started
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if self._closed:
+                raise JobPoolUnavailable("Job pool is shutting down")
+            if self._pending >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise JobQueueFull(f"{self._pending} jobs pending (limit {self.max_pending})")
+
+            job = {
+                "job_id": job_id,
+                "kind": kind,
+                "status": "queued",
+                "submitted_at": time.time(),
+                "finished_at": None,
+                "timeout": timeout,
+                "result": None,
+                "error": None,
+                "meta": meta or {},
+            }
+            future = self._submit_locked(fn, args, kwargs, timeout)
+            job["_future"] = future
+            self._jobs[job_id] = job
+            self._pending += 1
+            self.counters["submitted"] += 1
+
+        future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+        return job_id
+
+    def _submit_locked(self, fn, args, kwargs, timeout):
+        try:
+            return self._ensure_executor().submit(_run_with_timeout, fn, args, kwargs, timeout)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM while parsing); start a fresh pool once
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            try:
+                return self._ensure_executor().submit(_run_with_timeout, fn, args, kwargs, timeout)
+            except (BrokenProcessPool, OSError) as e:
+                raise JobPoolUnavailable(f"Could not start worker processes: {e}") from e
+
+    def _finish(self, job_id: str, future) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["finished_at"] is not None:
+                return
+            if future.cancelled():
+                status, error = "failed", "cancelled"
+            else:
+                exc = future.exception()
+                if exc is None:
+                    status, error = "done", None
+                    job["result"] = future.result()
+                elif isinstance(exc, JobTimeout):
+                    status, error = "timeout", f"Job exceeded {job['timeout']:g}s"
+                else:
+                    status, error = "failed", f"{type(exc).__name__}: {exc}"
+            self._close_job(job, status, error)
+
+    def _close_job(self, job: Dict, status: str, error: Optional[str]) -> None:
+        job["status"] = status
+        job["error"] = error
+        job["finished_at"] = time.time()
+        self._pending -= 1
+        self.counters[status] += 1
+        self._trim()
+
+    def _trim(self) -> None:
+        # Drop the oldest finished jobs beyond keep_finished
+        excess = len(self._jobs) - self._pending - self.keep_finished
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job["finished_at"] is not None][:excess]:
+            del self._jobs[job_id]
+
+    def _check_deadline(self, job: Dict) -> None:
+        """Parent-side backstop for workers that never answer."""
+        future = job["_future"]
+        if job["finished_at"] is not None or not job["timeout"]:
+            return
+        if future.running() and "started_at" not in job:
+            job["started_at"] = time.time()
+        started = job.get("started_at")
+        if started and time.time() > started + job["timeout"] + TIMEOUT_GRACE_SECONDS:
+            self._close_job(job, "timeout", f"No result after {job['timeout']:g}s")
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """
+        Job status: queued | running | done | failed | timeout (None if unknown).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._check_deadline(job)
+            if job["status"] == "queued" and job["_future"].running():
+                job["status"] = "running"
+            return {key: value for key, value in job.items() if not key.startswith("_")}
+
+    def statistics(self) -> Dict:
+        """Queue depth, limits and outcome counters."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "tracked_jobs": len(self._jobs),
+                **self.counters,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+extraction_pool = JobPool(
+    max_workers=int(os.getenv("CREDSAATHI_EXTRACTION_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("CREDSAATHI_EXTRACTION_MAX_PENDING", "0")) or None,
+    default_timeout=float(os.getenv("CREDSAATHI_EXTRACTION_TIMEOUT", "30")),
+)
+
+sanction_pool = JobPool(
+    max_workers=int(os.getenv("CREDSAATHI_SANCTION_WORKERS", "1")),
+    max_pending=int(os.getenv("CREDSAATHI_SANCTION_MAX_PENDING", "64")),
+    default_timeout=float(os.getenv("CREDSAATHI_SANCTION_TIMEOUT", "60")),
+)
+
+
+__all__ = [
+    "JobPool",
+    "JobPoolUnavailable",
+    "JobQueueFull",
+    "JobTimeout",
+    "extraction_pool",
+    "sanction_pool",
+]
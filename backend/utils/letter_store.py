@@ -0,0 +1,233 @@
+"""
+Sanction Letter Store Module
+Content-addressed storage for rendered sanction letters.
+
+Letters are rendered into memory (reportlab invariant mode, so the same
+letter fields always give the same bytes) and stored once under
+objects/<aa>/<bb>/<hash>.pdf. A letter key - the hash of the fields the
+letter is rendered from and the session it belongs to - maps to the stored
+document, so regenerating a session's letter reuses the existing file
+instead of writing a duplicate, while a new application gets its own,
+newly dated letter. The key → document links (with the issue
+date printed on the letter) are kept in an append-only JSONL log and
+replayed on startup.
+
+Object mtimes record the last use (store, lookup, download); the retention
+job (collect_garbage, data/scripts/gc_storage.py) deletes letters unused
+for longer than the retention period and compacts the key log.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / "data" / "sanction_letters"
+
+# Days a letter is kept after its last use
+LETTER_RETENTION_DAYS = float(os.getenv("CREDSAATHI_LETTER_RETENTION_DAYS", "90"))
+
+
+def letter_key(fields: Dict) -> str:
+    """Stable hash of the fields a letter is rendered from."""
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def iter_object_files(objects_dir: Path) -> Iterator[os.DirEntry]:
+    """Files under a two-level sharded objects/<aa>/<bb>/ tree."""
+    if not objects_dir.is_dir():
+        return
+    for level1 in os.scandir(objects_dir):
+        if not level1.is_dir():
+            continue
+        for level2 in os.scandir(level1.path):
+            if not level2.is_dir():
+                continue
+            for entry in os.scandir(level2.path):
+                if entry.is_file():
+                    yield entry
+
+
+def remove_empty_shards(objects_dir: Path) -> None:
+    if not objects_dir.is_dir():
+        return
+    for level1 in os.scandir(objects_dir):
+        if not level1.is_dir():
+            continue
+        for level2 in os.scandir(level1.path):
+            if level2.is_dir():
+                try:
+                    os.rmdir(level2.path)
+                except OSError:
+                    pass
+        try:
+            os.rmdir(level1.path)
+        except OSError:
+            pass
+
+
+class LetterStore:
+    """
+    Content-addressed sanction letter PDFs and letter key → document index.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.keys_log = self.root / "letters.jsonl"
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Dict] = {}
+        self._load_keys()
+
+    def _load_keys(self) -> None:
+        if not self.keys_log.exists():
+            return
+        with self.keys_log.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._keys[event.pop("key")] = event
+
+    def path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:4] / f"{digest}.pdf"
+
+    def put(self, data: bytes) -> Tuple[str, Path, bool]:
+        """
+        Store a rendered letter.
+
+        Returns:
+            (sha256 hex digest, stored path, True if the content was new)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if path.exists():
+            self.touch(digest)
+            return digest, path, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".letter-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return digest, path, True
+
+    def touch(self, digest: str) -> None:
+        """Mark a letter as used now (retention counts from the last use)."""
+        try:
+            os.utime(self.path(digest))
+        except OSError:
+            pass
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """
+        Letter stored for a letter key, if its file still exists.
+
+        Returns:
+            {"sha256", "issued_at"} or None
+        """
+        entry = self._keys.get(key)
+        if entry is None:
+            return None
+        if not self.path(entry["sha256"]).exists():
+            # Collected by the retention job
+            with self._lock:
+                if self._keys.get(key) is entry:
+                    del self._keys[key]
+            return None
+        self.touch(entry["sha256"])
+        return dict(entry)
+
+    def link(self, key: str, digest: str, issued_at: Optional[str] = None) -> None:
+        """Remember which document a letter key rendered to."""
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is not None and entry["sha256"] == digest:
+                return
+            entry = {"sha256": digest, "issued_at": issued_at}
+            self._keys[key] = entry
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.keys_log.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, **entry}) + "\n")
+
+    def collect_garbage(self, max_age_days: float = LETTER_RETENTION_DAYS, dry_run: bool = False,
+                        now: Optional[float] = None) -> Dict:
+        """
+        Delete letters unused for max_age_days, plus flat legacy
+        sanction_letter_*.pdf files of the same age, then compact the key log.
+
+        Returns:
+            Counts and bytes of kept and deleted files
+        """
+        cutoff = (now or time.time()) - max_age_days * 86400
+        stats = {"kept": 0, "deleted": 0, "deleted_bytes": 0, "legacy_deleted": 0}
+
+        deleted = set()
+        for entry in iter_object_files(self.objects_dir):
+            st = entry.stat()
+            if st.st_mtime >= cutoff or entry.name.startswith("."):
+                stats["kept"] += 1
+                continue
+            stats["deleted"] += 1
+            stats["deleted_bytes"] += st.st_size
+            deleted.add(entry.name[:-len(".pdf")])
+            if not dry_run:
+                os.unlink(entry.path)
+
+        if self.root.is_dir():
+            for entry in os.scandir(self.root):
+                if entry.is_file() and entry.name.startswith("sanction_letter_") and entry.name.endswith(".pdf"):
+                    st = entry.stat()
+                    if st.st_mtime < cutoff:
+                        stats["legacy_deleted"] += 1
+                        stats["deleted_bytes"] += st.st_size
+                        if not dry_run:
+                            os.unlink(entry.path)
+
+        if not dry_run:
+            remove_empty_shards(self.objects_dir)
+            self._compact_keys(deleted)
+        return stats
+
+    def _compact_keys(self, deleted: Iterable[str]) -> None:
+        # Links appended by another process since this one loaded the log are
+        # dropped; that costs one re-render (same bytes, same document) later
+        deleted = set(deleted)
+        with self._lock:
+            self._keys = {key: entry for key, entry in self._keys.items() if entry["sha256"] not in deleted}
+            if not self.keys_log.exists():
+                return
+            tmp_path = self.keys_log.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                for key, entry in self._keys.items():
+                    f.write(json.dumps({"key": key, **entry}) + "\n")
+            os.replace(tmp_path, self.keys_log)
+
+    def statistics(self) -> Dict:
+        with self._lock:
+            return {
+                "letter_keys": len(self._keys),
+                "documents": len({entry["sha256"] for entry in self._keys.values()}),
+            }
+
+
+letter_store = LetterStore(Path(os.getenv("CREDSAATHI_LETTER_STORE_DIR", DEFAULT_STORE_DIR)))
+
+
+__all__ = [
+    "LETTER_RETENTION_DAYS",
+    "LetterStore",
+    "iter_object_files",
+    "letter_key",
+    "letter_store",
+    "remove_empty_shards",
+]
@@ -0,0 +1,165 @@
+"""
+Counter-Offer Optimizer Module
+Finds approvable alternatives when an application is rejected for its amount or EMI.
+
+The search space is every amount step × allowed tenure × rate tier under the
+customer's pre-approved offer. EMIs for the whole grid are computed in one
+vectorized pass, infeasible cells are masked with the underwriting policy
+constraints, and the cells closest to the original request are returned.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.customer import Offer
+from utils.emi import ALLOWED_TENURES, calculate_emi_array
+from utils.policy import CompiledPolicy, policy_store
+
+# Rate tiers: (premium over the offered rate, largest amount as a multiple of the
+# pre-approved limit priced at that tier). Amounts beyond the policy's max loan
+# ratio are never offered.
+RATE_TIERS = ((0.0, 1.0), (0.5, 1.5), (1.0, 2.0))
+
+# Upper bound on amount steps, keeps the grid at a few thousand cells
+MAX_AMOUNT_STEPS = 200
+
+# Closeness weights: amount dominates, then tenure, then price
+TENURE_WEIGHT = 0.25
+RATE_WEIGHT = 0.05
+
+
+def optimize_offers(
+    requested_amount: float,
+    requested_tenure: Optional[int],
+    pre_approved_limit: float,
+    base_rate: float,
+    credit_score: Optional[int],
+    monthly_salary: Optional[float] = None,
+    policy: Optional[CompiledPolicy] = None,
+    top_n: int = 3,
+    rate_tiers=RATE_TIERS,
+) -> List[Dict]:
+    """
+    Best approvable offers ranked by closeness to the request.
+
+    An offer is approvable when the credit score passes, the amount is within the
+    policy's max loan ratio and its rate tier, and - above the instant approval
+    ratio - the EMI fits the salary cap. Without a known salary those amounts are
+    still returned, flagged requires_salary_slip.
+
+    Args:
+        requested_amount: Amount the customer asked for
+        requested_tenure: Tenure the customer asked for (None to ignore tenure)
+        pre_approved_limit: Customer's pre-approved amount
+        base_rate: Customer's offered interest rate
+        credit_score: Bureau score
+        monthly_salary: Verified salary, if any
+        policy: Policy to apply (default: active policy)
+        top_n: Number of offers to return (best one per tenure)
+
+    Returns:
+        List of offer dicts (amount, tenure_months, interest_rate, emi,
+        total_interest, emi_ratio, requires_salary_slip), best first
+    """
+    policy = policy or policy_store.current()
+    if not credit_score or credit_score < policy.min_credit_score:
+        return []
+    if not pre_approved_limit or pre_approved_limit <= 0 or not requested_amount:
+        return []
+
+    # Amount steps in whole thousands up to the policy ceiling
+    ceiling = pre_approved_limit * policy.max_loan_ratio
+    step = max(1000.0, np.ceil(ceiling / MAX_AMOUNT_STEPS / 1000) * 1000)
+    amounts = np.arange(step, ceiling + 1, step)
+    tenures = np.asarray(ALLOWED_TENURES, dtype=np.float64)
+    premiums = np.array([premium for premium, _ in rate_tiers])
+    tier_limits = np.minimum(np.array([ratio for _, ratio in rate_tiers]), policy.max_loan_ratio)
+
+    # Grid axes: (amount, tenure, tier)
+    amount = amounts[:, None, None]
+    rate = base_rate + premiums[None, None, :]
+    emi = calculate_emi_array(amount, rate, tenures[None, :, None])
+
+    loan_ratio = amount / pre_approved_limit
+    feasible = loan_ratio <= tier_limits[None, None, :]
+    needs_salary = loan_ratio > policy.instant_approval_ratio
+    if monthly_salary:
+        emi_ratio = emi / monthly_salary * 100
+        feasible = feasible & (~needs_salary | (emi_ratio <= policy.max_emi_ratio))
+    else:
+        emi_ratio = np.full(emi.shape, np.nan)
+    feasible = np.broadcast_to(feasible, emi.shape)
+
+    # Cheapest feasible tier for each (amount, tenure)
+    tier = np.argmax(feasible, axis=2)
+    any_tier = feasible.any(axis=2)
+    rows, cols = np.indices(tier.shape)
+    cell_rate = rate[0, 0, tier]
+    cell_emi = emi[rows, cols, tier]
+
+    score = np.abs(amounts[:, None] - requested_amount) / requested_amount
+    if requested_tenure:
+        score = score + TENURE_WEIGHT * np.abs(tenures[None, :] - requested_tenure) / requested_tenure
+    score = score + RATE_WEIGHT * premiums[tier]
+    score = np.where(any_tier, score, np.inf)
+
+    # Best amount per tenure, then the top tenures overall
+    best_row = np.argmin(score, axis=0)
+    best_score = score[best_row, np.arange(len(tenures))]
+    order = [col for col in np.argsort(best_score, kind="stable") if np.isfinite(best_score[col])]
+
+    offers = []
+    for col in order[:top_n]:
+        row = best_row[col]
+        offer_emi = float(cell_emi[row, col])
+        tenure = int(tenures[col])
+        ratio = emi_ratio[row, col, tier[row, col]]
+        offers.append({
+            "amount": float(amounts[row]),
+            "tenure_months": tenure,
+            "interest_rate": round(float(cell_rate[row, col]), 2),
+            "emi": offer_emi,
+            "total_interest": round(offer_emi * tenure - float(amounts[row]), 2),
+            "emi_ratio": None if np.isnan(ratio) else round(float(ratio), 1),
+            "requires_salary_slip": bool(needs_salary[row, 0, 0] and not monthly_salary),
+        })
+    return offers
+
+
+def counter_offers_for(state: Dict, offer: Optional[Offer] = None,
+                       policy: Optional[CompiledPolicy] = None, top_n: int = 3) -> List[Dict]:
+    """
+    Counter-offers for an application in AgentState, priced from the customer's
+    pre-approved Offer (falls back to the state's limit and negotiated rate).
+    """
+    return optimize_offers(
+        requested_amount=state.get("requested_loan_amount"),
+        requested_tenure=state.get("requested_tenure"),
+        pre_approved_limit=offer.offer_amount if offer else state.get("pre_approved_limit"),
+        base_rate=offer.interest_rate if offer else (state.get("negotiated_interest_rate") or 10.5),
+        credit_score=state.get("credit_score"),
+        monthly_salary=state.get("monthly_salary") if state.get("salary_slip_uploaded") else None,
+        policy=policy,
+        top_n=top_n,
+    )
+
+
+def format_counter_offers(offers: List[Dict]) -> str:
+    """Bullet lines for chat messages."""
+    lines = []
+    for offer in offers:
+        line = (f"• ₹{offer['amount']:,.0f} over {offer['tenure_months']} months at "
+                f"{offer['interest_rate']}% p.a. - EMI ₹{offer['emi']:,.0f}")
+        if offer["requires_salary_slip"]:
+            line += " (salary slip required)"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+__all__ = [
+    "RATE_TIERS",
+    "counter_offers_for",
+    "format_counter_offers",
+    "optimize_offers",
+]
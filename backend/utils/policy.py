@@ -0,0 +1,253 @@
+"""
+Credit Policy Module
+Loads the declarative policy file (data/policies/*.json) and compiles it into
+decision functions shared by the agents and the graph routers.
+
+Thresholds are bound into closures at load time, so evaluating a decision is a
+handful of local comparisons. PolicyStore watches the file and swaps in a newly
+compiled policy atomically; requests pin the version they started with, so a
+reload never changes the rules halfway through a turn. A version string names
+exactly one set of rules: an edited file that keeps an already-loaded version
+is refused (bump "version" to change the rules).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_POLICY_PATH = Path(__file__).parent.parent / "data" / "policies" / "default.json"
+
+
+class PolicyError(ValueError):
+    """Raised when a policy file is malformed or inconsistent."""
+
+
+def _compile_underwriting(min_credit_score: float, instant_approval_ratio: float,
+                          max_loan_ratio: float, max_emi_ratio: float) -> Callable:
+    """
+    Compile the underwriting rules into a single closure.
+
+    Returns:
+        decide(credit_score, requested_loan_amount, pre_approved_limit,
+               has_salary, calculated_emi, monthly_salary)
+        → (reason_code, loan_ratio, emi_ratio)
+    """
+    def decide(credit_score, requested_loan_amount, pre_approved_limit,
+               has_salary, calculated_emi, monthly_salary) -> Tuple[str, Optional[float], Optional[float]]:
+        if not credit_score or credit_score < min_credit_score:
+            return "LOW_CREDIT_SCORE", None, None
+        loan_ratio = requested_loan_amount / pre_approved_limit
+        if loan_ratio <= instant_approval_ratio:
+            return "INSTANT_APPROVAL", loan_ratio, None
+        if loan_ratio > max_loan_ratio:
+            return "EXCEEDS_MAX_LIMIT", loan_ratio, None
+        if not has_salary:
+            return "SALARY_SLIP_REQUIRED", loan_ratio, None
+        emi_ratio = (calculated_emi / monthly_salary) * 100
+        if emi_ratio <= max_emi_ratio:
+            return "APPROVED_WITH_SALARY", loan_ratio, emi_ratio
+        return "EMI_EXCEEDS_LIMIT", loan_ratio, emi_ratio
+
+    return decide
+
+
+def _compile_fraud(reject_risk_score: float, manual_review_risk_score: float) -> Callable:
+    """
+    Compile fraud routing into a closure: fraud_route(risk) → 'reject' | 'manual_review' | 'pass'.
+    """
+    def fraud_route(fraud_risk) -> str:
+        fraud_risk = fraud_risk or 0
+        if fraud_risk >= reject_risk_score:
+            return "reject"
+        if fraud_risk >= manual_review_risk_score:
+            return "manual_review"
+        return "pass"
+
+    return fraud_route
+
+
+def _compile_verification(salary_slip_min_ratio: float, salary_slip_max_ratio: float) -> Callable:
+    """
+    Compile the salary slip rule: salary_slip_required(loan_ratio) → bool.
+    """
+    def salary_slip_required(loan_ratio: float) -> bool:
+        return salary_slip_min_ratio < loan_ratio <= salary_slip_max_ratio
+
+    return salary_slip_required
+
+
+class CompiledPolicy:
+    """
+    One immutable, validated policy version with its compiled decision functions.
+    """
+
+    def __init__(self, spec: Dict, source: Optional[str] = None, content_hash: Optional[str] = None) -> None:
+        try:
+            self.version = str(spec["version"])
+            underwriting = spec["underwriting"]
+            fraud = spec["fraud"]
+            verification = spec["verification"]
+
+            self.min_credit_score = float(underwriting["min_credit_score"])
+            self.instant_approval_ratio = float(underwriting["instant_approval_ratio"])
+            self.max_loan_ratio = float(underwriting["max_loan_ratio"])
+            self.max_emi_ratio = float(underwriting["max_emi_ratio"])
+            self.reject_risk_score = float(fraud["reject_risk_score"])
+            self.manual_review_risk_score = float(fraud["manual_review_risk_score"])
+            self.salary_slip_min_ratio = float(verification["salary_slip_min_ratio"])
+            self.salary_slip_max_ratio = float(verification["salary_slip_max_ratio"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise PolicyError(f"Invalid policy{f' in {source}' if source else ''}: {e}") from e
+
+        if not 0 < self.instant_approval_ratio <= self.max_loan_ratio:
+            raise PolicyError("instant_approval_ratio must be positive and <= max_loan_ratio")
+        if not 0 < self.max_emi_ratio <= 100:
+            raise PolicyError("max_emi_ratio must be a percentage in (0, 100]")
+        if self.manual_review_risk_score > self.reject_risk_score:
+            raise PolicyError("manual_review_risk_score must be <= reject_risk_score")
+
+        self.source = source
+        self.spec = spec
+        self.content_hash = content_hash
+        self.decide_underwriting = _compile_underwriting(
+            self.min_credit_score, self.instant_approval_ratio,
+            self.max_loan_ratio, self.max_emi_ratio,
+        )
+        self.fraud_route = _compile_fraud(self.reject_risk_score, self.manual_review_risk_score)
+        self.salary_slip_required = _compile_verification(
+            self.salary_slip_min_ratio, self.salary_slip_max_ratio
+        )
+
+    def fraud_status(self, fraud_risk: float, loan_status: str) -> str:
+        """
+        Loan status after the fraud layer: reject, manual review or keep the underwriting decision.
+        """
+        route = self.fraud_route(fraud_risk)
+        if route == "reject":
+            return "rejected"
+        if route == "manual_review":
+            return "manual_review_fraud"
+        return loan_status
+
+    def __repr__(self) -> str:
+        return f"CompiledPolicy(version={self.version!r})"
+
+
+def load_policy(path: Path) -> CompiledPolicy:
+    """Read and compile a policy file."""
+    path = Path(path)
+    raw = path.read_bytes()
+    try:
+        spec = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise PolicyError(f"Invalid policy JSON in {path}: {e}") from e
+    return CompiledPolicy(spec, source=str(path), content_hash=hashlib.sha256(raw).hexdigest())
+
+
+class PolicyStore:
+    """
+    Holds the active policy and hot-reloads it when the file changes.
+
+    current() is lock-free on the hot path: it only stats the file once per
+    check_interval, and a reload replaces the policy reference in a single
+    assignment after the new version compiled successfully. A broken file
+    keeps the previous version active.
+    """
+
+    def __init__(self, path: Path, check_interval: float = 1.0, keep_versions: int = 8) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.keep_versions = keep_versions
+        self._lock = threading.Lock()
+        self._versions: "OrderedDict[str, CompiledPolicy]" = OrderedDict()
+        self._file_signature = None
+        self._next_check = 0.0
+        self._policy: CompiledPolicy = None
+        self.reload(force=True)
+
+    def current(self) -> CompiledPolicy:
+        """Active policy, reloading first if the file changed."""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.reload()
+        return self._policy
+
+    def get(self, version: Optional[str]) -> CompiledPolicy:
+        """
+        Policy a request pinned earlier, falling back to the active one
+        if that version was never loaded or has been evicted.
+        """
+        if version is not None:
+            policy = self._versions.get(version)
+            if policy is not None:
+                return policy
+        return self.current()
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the policy file if it changed.
+
+        Returns:
+            True if a new policy was activated
+        """
+        # Only one thread reloads; others keep serving the current policy
+        if not self._lock.acquire(blocking=force):
+            return False
+        try:
+            signature = None
+            try:
+                stat = self.path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if not force and signature == self._file_signature:
+                    return False
+                policy = load_policy(self.path)
+                known = self._versions.get(policy.version)
+                if known is not None:
+                    if known.content_hash != policy.content_hash:
+                        raise PolicyError(f"Policy file changed but version {policy.version} is already loaded")
+                    # Unchanged content (touched, or reverted to an earlier version): reuse it
+                    policy = known
+            except (OSError, PolicyError) as e:
+                if self._policy is None:
+                    raise
+                print(f"⚠️ Policy reload failed, keeping version {self._policy.version}: {e}")
+                self._file_signature = signature
+                return False
+
+            self._versions[policy.version] = policy
+            self._versions.move_to_end(policy.version)
+            while len(self._versions) > self.keep_versions:
+                self._versions.popitem(last=False)
+            self._file_signature = signature
+            if policy is self._policy:
+                return False
+            self._policy = policy
+            if not force:
+                print(f"✅ Policy {policy.version} loaded from {self.path}")
+            return True
+        finally:
+            self._lock.release()
+
+
+policy_store = PolicyStore(Path(os.getenv("CREDSAATHI_POLICY_PATH", DEFAULT_POLICY_PATH)))
+
+
+def policy_for(state: Dict) -> CompiledPolicy:
+    """Policy pinned for this conversation turn (see master_agent_node)."""
+    return policy_store.get(state.get("policy_version"))
+
+
+__all__ = [
+    "CompiledPolicy",
+    "PolicyError",
+    "PolicyStore",
+    "load_policy",
+    "policy_for",
+    "policy_store",
+]
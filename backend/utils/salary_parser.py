@@ -0,0 +1,282 @@
+"""
+Salary Slip Parser Module
+Single-pass extraction of structured fields from salary slip text.
+
+Every field label (net pay, gross, employee name, employer, pay period, ...)
+is compiled into one keyword trie regex, so the text is swept once: each
+label match reads its value in place and the scan resumes after it.
+Free-standing amounts seen along the way feed the largest-amount fallback,
+and a company line ("... Pvt Ltd") stands in for an unlabelled employer.
+
+The trie's top-level alternatives all start with a literal character, which
+lets the regex engine skip positions that cannot start a label or amount
+instead of trying every alternative at every position.
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from models.salary_slip import SalarySlip
+
+# Valid monthly salary range (₹)
+MIN_SALARY = 10000
+MAX_SALARY = 10000000
+
+NET_PAY_LABELS = (
+    "net pay", "net salary", "net amount payable", "net amount", "take home pay",
+    "take home", "take-home", "amount credited",
+)
+GROSS_PAY_LABELS = ("gross pay", "gross salary", "gross earnings", "total earnings", "gross")
+MONTHLY_SALARY_LABELS = ("monthly salary", "fixed salary", "salary")
+CTC_LABELS = ("annual ctc", "ctc", "cost to company")
+NAME_LABELS = ("employee name", "emp name", "emp. name", "name of the employee", "name of employee", "name")
+EMPLOYER_LABELS = ("employer name", "employer", "company name", "organisation", "organization")
+PERIOD_LABELS = (
+    "salary slip for the month of", "payslip for the month of", "pay slip for the month of",
+    "salary slip for", "payslip for", "pay slip for", "for the month of", "pay period", "month",
+)
+# Labels whose values must not be taken for another field ("Basic Salary", "Bank Name")
+IGNORED_LABELS = ("basic salary", "basic pay", "basic", "bank name", "father's name", "father name")
+COMPANY_SUFFIXES = ("pvt ltd", "pvt. ltd", "private limited", "limited", "ltd", "llp", "inc")
+
+# Salary sources in order of preference, with the confidence each one carries
+SALARY_SOURCES = (
+    ("net_pay", 0.95),
+    ("gross_pay", 0.8),
+    ("monthly_salary", 0.75),
+    ("ctc", 0.6),
+    ("fallback", 0.4),
+)
+LABELLED_CONFIDENCE = 0.9
+COMPANY_LINE_CONFIDENCE = 0.6
+
+MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
+_AMOUNT_VALUE = re.compile(
+    r"[ \t]*(?:\((?:monthly|per month|in rs\.?|inr|₹)\)[ \t]*)?[:\-=]?[ \t]*(?:rs\.?|inr|₹)?[ \t]*"
+    r"(\d[\d,]*)(?:\.\d{1,2})?",
+    re.IGNORECASE
+)
+_TEXT_VALUE = re.compile(r"[ \t]*[:\-][ \t]*([A-Za-z0-9&][^\n:]{0,80})")
+_MONTH_VALUE = re.compile(
+    r"[ \t]*[:\-]?[ \t]*(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?[ \t,'\-/]*(\d{4}|\d{2})\b",
+    re.IGNORECASE
+)
+_NUMERIC_MONTH_VALUE = re.compile(r"[ \t]*[:\-]?[ \t]*(\d{1,2})[/\-](\d{4})\b")
+# Where a name or employer value ends when the next column follows on the same line
+_VALUE_STOP = re.compile(
+    r"\s{2,}|\s+(?:emp(?:loyee)?\.?\s*(?:id|code|no)|designation|department|pan|uan|doj|date|bank|"
+    r"month|pay\s+period|location|grade)\b",
+    re.IGNORECASE
+)
+
+
+def _trie(labels: Iterable[str]) -> Dict[str, dict]:
+    root: Dict[str, dict] = {}
+    for label in labels:
+        node = root
+        for char in label:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return root
+
+
+def _trie_regex(node: Dict[str, dict]) -> str:
+    """Regex for the words below a trie node; longer words are tried first."""
+    branches = [
+        (r"[ \t]+" if char == " " else re.escape(char)) + _trie_regex(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    body = "(?:" + "|".join(branches) + ")"
+    return body + "?" if "" in node else body
+
+
+def _label_key(label: str) -> str:
+    return " ".join(label.split())
+
+
+def _amount(digits: str) -> float:
+    return float(digits.replace(",", ""))
+
+
+# A currency prefix written against the amount ("Rs.45,000", "INR45000")
+_CURRENCY_PREFIX = re.compile(r"(?:^|[^a-z])(?:rs\.?|inr)$")
+
+
+def _continues_previous(lowered: str, start: int) -> bool:
+    """Whether a match at start is the tail of the word or number before it."""
+    previous = lowered[start - 1]
+    if not lowered[start].isdigit():
+        return previous.isalnum() or previous in ",."
+    if previous.isdigit() or (previous in ",." and start > 1 and lowered[start - 2].isdigit()):
+        return True
+    return (previous.isalpha() or previous == ".") and not _CURRENCY_PREFIX.search(lowered, max(0, start - 4), start)
+
+
+def _text_value(text: str, pos: int) -> Tuple[Optional[str], int]:
+    """Name/employer value after a label, cut where the next column starts."""
+    match = _TEXT_VALUE.match(text, pos)
+    if match is None:
+        return None, pos
+    value = match.group(1)
+    stop = _VALUE_STOP.search(value)
+    if stop:
+        value = value[:stop.start()]
+    return value.strip(" \t-,|") or None, match.start(1) + len(value)
+
+
+def _pay_period(text: str, pos: int) -> Tuple[Optional[str], int]:
+    match = _MONTH_VALUE.match(text, pos)
+    if match:
+        year = int(match.group(2))
+        year = year + 2000 if year < 100 else year
+        return f"{year:04d}-{MONTHS[match.group(1).lower()]:02d}", match.end()
+    match = _NUMERIC_MONTH_VALUE.match(text, pos)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return f"{int(match.group(2)):04d}-{int(match.group(1)):02d}", match.end()
+    return None, pos
+
+
+class SalarySlipParser:
+    """
+    Compiled single-pass salary slip parser. Label sets can be overridden.
+    """
+
+    def __init__(self, net_pay_labels: Iterable[str] = NET_PAY_LABELS,
+                 gross_pay_labels: Iterable[str] = GROSS_PAY_LABELS,
+                 monthly_salary_labels: Iterable[str] = MONTHLY_SALARY_LABELS,
+                 ctc_labels: Iterable[str] = CTC_LABELS) -> None:
+        self._kinds: Dict[str, str] = {}
+        for kind, labels in (
+            ("net_pay", net_pay_labels),
+            ("gross_pay", gross_pay_labels),
+            ("ctc", ctc_labels),
+            ("monthly_salary", monthly_salary_labels),
+            ("employee_name", NAME_LABELS),
+            ("employer", EMPLOYER_LABELS),
+            ("pay_period", PERIOD_LABELS),
+            ("ignored", IGNORED_LABELS),
+            ("company", COMPANY_SUFFIXES),
+        ):
+            for label in labels:
+                self._kinds.setdefault(_label_key(label.lower()), kind)
+
+        # One alternative per first character (labels) or digit (amounts)
+        root = _trie(self._kinds)
+        alternatives = [re.escape(char) + _trie_regex(child) + r"\b" for char, child in sorted(root.items())]
+        alternatives += [rf"{digit}[\d,]{{4,}}(?![\d,])" for digit in "0123456789"]
+        pattern = "|".join(alternatives)
+        self._pattern = re.compile(pattern)
+        # For text whose lowercase form changes length (rare non-ASCII)
+        self._pattern_ignorecase = re.compile(pattern, re.IGNORECASE)
+
+    def parse(self, text: str) -> SalarySlip:
+        """
+        Extract a SalarySlip from text in one sweep.
+        """
+        fields: Dict[str, object] = {}
+        confidence: Dict[str, float] = {}
+        largest = None
+        text = text or ""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            search = self._pattern.search
+        else:
+            lowered, search = text, self._pattern_ignorecase.search
+        kinds = self._kinds
+        pos = 0
+
+        while True:
+            match = search(lowered, pos)
+            if match is None:
+                break
+            start, pos = match.span()
+            if start and _continues_previous(lowered, start):
+                # Inside a word or number: not a label or amount of its own
+                if not lowered[start].isdigit():
+                    pos = start + 1
+                continue
+
+            if lowered[start].isdigit():
+                value = _amount(match.group())
+                if MIN_SALARY <= value <= MAX_SALARY and (largest is None or value > largest):
+                    largest = value
+                continue
+
+            kind = kinds[_label_key(match.group().lower())]
+            if kind == "company":
+                line_start = lowered.rfind("\n", 0, start) + 1
+                if lowered.startswith(".", pos):
+                    pos += 1
+                company = text[line_start:pos].strip(" \t-:|")
+                if len(company) > pos - start:
+                    fields.setdefault("company", company)
+            elif kind == "pay_period":
+                period, pos = _pay_period(text, pos)
+                if period:
+                    fields.setdefault(kind, period)
+            elif kind in ("employee_name", "employer"):
+                value, pos = _text_value(text, pos)
+                if value and kind not in fields and not (kind == "employee_name" and value[0].isdigit()):
+                    fields[kind] = value
+            else:
+                # Amount labels, including ignored components whose value is skipped
+                value_match = _AMOUNT_VALUE.match(text, pos)
+                if value_match:
+                    pos = value_match.end()
+                    value = _amount(value_match.group(1))
+                    if kind == "ignored":
+                        if MIN_SALARY <= value <= MAX_SALARY and (largest is None or value > largest):
+                            largest = value
+                        continue
+                    monthly = value / 12 if kind == "ctc" else value
+                    if kind not in fields and MIN_SALARY <= monthly <= MAX_SALARY:
+                        fields[kind] = value
+
+        for name in ("employee_name", "employer", "pay_period", "net_pay", "gross_pay"):
+            if name in fields:
+                confidence[name] = LABELLED_CONFIDENCE
+        if "employer" not in fields and "company" in fields:
+            fields["employer"] = fields["company"]
+            confidence["employer"] = COMPANY_LINE_CONFIDENCE
+        if "net_pay" in fields and "gross_pay" in fields and fields["net_pay"] > fields["gross_pay"]:
+            # Net above gross: one of the two was misread
+            confidence["net_pay"] = confidence["gross_pay"] = 0.5
+
+        fields["ctc"] = fields["ctc"] / 12 if "ctc" in fields else None
+        fields["fallback"] = largest
+        salary, source = None, None
+        for source_name, source_confidence in SALARY_SOURCES:
+            if fields.get(source_name):
+                salary, source = round(fields[source_name], 2), source_name
+                confidence["salary"] = min(source_confidence, confidence.get(source_name, 1.0))
+                break
+
+        return SalarySlip(
+            salary=salary,
+            salary_source=source,
+            net_pay=fields.get("net_pay"),
+            gross_pay=fields.get("gross_pay"),
+            employee_name=fields.get("employee_name"),
+            employer=fields.get("employer"),
+            pay_period=fields.get("pay_period"),
+            confidence=confidence,
+        )
+
+
+salary_slip_parser = SalarySlipParser()
+
+
+def parse_salary_slip(text: str) -> SalarySlip:
+    """Parse salary slip text with the default label sets."""
+    return salary_slip_parser.parse(text)
+
+
+__all__ = [
+    "SalarySlipParser",
+    "parse_salary_slip",
+    "salary_slip_parser",
+]
@@ -4,39 +4,92 @@ Handles extraction of salary information from various salary slip formats.
 Supports PDF and image-based salary slips with OCR fallback.
 """
 
-import re
+import os
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Iterator, Optional, Dict, List, Tuple
 import logging
 
+from utils.salary_parser import SalarySlipParser, salary_slip_parser
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def extract_salary_from_pdf(pdf_path: Path) -> Optional[Dict[str, any]]:
+# Pages read from a PDF at most; salary slips are one or two pages, anything
+# longer (e.g. a bank statement uploaded by mistake) is not read to the end
+PDF_MAX_PAGES = int(os.getenv("CREDSAATHI_PDF_MAX_PAGES", "5"))
+
+# Salary confidence at which incremental PDF reading may stop
+EARLY_STOP_CONFIDENCE = 0.75
+
+# Bump whenever extraction output can change (parser, OCR preprocessing, PDF
+# reading); the slip store only serves cached results of this version
+EXTRACTOR_VERSION = "3"
+
+
+def iter_pdf_text(pdf_path: Path, max_pages: Optional[int] = PDF_MAX_PAGES) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, text) one page at a time, up to max_pages.
+    Pages are only laid out when consumed, so stopping early skips the rest.
+    
+    (Reading a header crop first saves nothing: pdfminer lays out the whole
+    page before any crop applies, and layout is most of the cost.)
+    
+    Args:
+        pdf_path: Path to PDF file
+        max_pages: Page cap (None reads every page)
+    """
+    import pdfplumber
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+        for page_number, page in enumerate(pages, 1):
+            yield page_number, page.extract_text() or ""
+            page.close()
+
+
+def extract_salary_from_pdf(pdf_path: Path, max_pages: Optional[int] = PDF_MAX_PAGES,
+                            early_stop: bool = True) -> Optional[Dict[str, any]]:
     """
     Extract salary information from PDF salary slip.
     
+    Text is read incrementally (see iter_pdf_text) and reading stops as soon
+    as a labelled salary and the employee name have both been seen.
+    
     Args:
         pdf_path: Path to PDF file
+        max_pages: Page cap (None reads every page)
+        early_stop: Stop once salary and name are found
     
     Returns:
         Dictionary with extracted salary data or None if extraction fails
     """
     try:
-        import pdfplumber
-        
         salary_data = {
             "source": "pdf",
             "raw_text": "",
             "salary": None,
-            "confidence": 0.0
+            "confidence": 0.0,
+            "pages_read": 0,
+            "stopped_early": False
         }
         
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                salary_data["raw_text"] += (page.extract_text() or "") + "\n"
+        chunks = []
+        salary_found = name_found = False
+        for page_number, text in iter_pdf_text(pdf_path, max_pages=max_pages):
+            chunks.append(text)
+            salary_data["pages_read"] = page_number
+            if not early_stop:
+                continue
+            slip = salary_slip_parser.parse(text)
+            salary_found = salary_found or slip.confidence.get("salary", 0.0) >= EARLY_STOP_CONFIDENCE
+            name_found = name_found or slip.employee_name is not None
+            if salary_found and name_found:
+                salary_data["stopped_early"] = True
+                logger.info(f"Salary and name found after {page_number} page(s) of {pdf_path.name}")
+                break
         
+        salary_data["raw_text"] = "\n".join(chunks)
         return salary_data
         
     except Exception as e:
@@ -48,6 +101,9 @@ def extract_salary_from_image(image_path: Path) -> Optional[Dict[str, any]]:
     """
     Extract salary information from image-based salary slip using OCR.
     
+    The image is downscaled, binarized and deskewed first (utils.ocr_preprocess);
+    per-stage timings are returned as ocr_timings.
+    
     Args:
         image_path: Path to image file (JPG, PNG)
     
@@ -57,6 +113,7 @@ def extract_salary_from_image(image_path: Path) -> Optional[Dict[str, any]]:
     try:
         from PIL import Image
         import pytesseract
+        from utils.ocr_preprocess import OCR_ROI_CROP, StageTimer, crop_to_keywords, preprocess_for_ocr
         
         salary_data = {
             "source": "image",
@@ -66,7 +123,14 @@ def extract_salary_from_image(image_path: Path) -> Optional[Dict[str, any]]:
         }
         
         image = Image.open(image_path)
+        image, timings = preprocess_for_ocr(image)
+        if OCR_ROI_CROP:
+            image = crop_to_keywords(image, timings)
+        
+        timer = StageTimer(timings)
         salary_data["raw_text"] = pytesseract.image_to_string(image)
+        timer.lap("ocr")
+        salary_data["ocr_timings"] = timings
         
         return salary_data
         
@@ -77,16 +141,16 @@ def extract_salary_from_image(image_path: Path) -> Optional[Dict[str, any]]:
 
 def parse_salary_from_text(text: str, keywords: List[str] = None) -> Optional[float]:
     """
-    Parse salary amount from extracted text using keyword matching and regex patterns.
+    Parse salary amount from extracted text (single pass, see utils.salary_parser).
     
     Supports multiple salary slip formats:
     - Standard format: "Monthly Salary: ₹50,000"
-    - CTC format: "CTC: Rs. 600000"
+    - CTC format: "CTC: Rs. 600000" (annual, returned per month)
     - Take-home format: "Net Pay: 45000"
     
     Args:
         text: Extracted text from salary slip
-        keywords: Optional list of keywords to search for (default: common salary keywords)
+        keywords: Optional net pay labels replacing the defaults (see utils.salary_parser)
     
     Returns:
         Salary amount as float or None if not found
@@ -94,65 +158,28 @@ def parse_salary_from_text(text: str, keywords: List[str] = None) -> Optional[fl
     if not text:
         return None
     
-    if keywords is None:
-        keywords = [
-            "salary", "net pay", "take home", "take-home", 
-            "ctc", "gross", "net salary", "monthly salary",
-            "basic salary", "fixed salary"
-        ]
-    
-    # Normalize text
-    text_lower = text.lower()
-    cleaned_text = text.replace(",", "").replace("₹", "").replace("Rs", "").replace("Rs.", "")
-    
-    # Search for salary after keywords
-    for keyword in keywords:
-        pattern = rf"{keyword}\s*:?\s*[Rs.₹\s]*(\d{{5,7}})"
-        matches = re.findall(pattern, text_lower)
-        if matches:
-            for match in matches:
-                salary = int(match)
-                if 10000 <= salary <= 10000000:  # Valid range
-                    logger.info(f"Found salary {salary} with keyword '{keyword}'")
-                    return float(salary)
-    
-    # Fallback: extract all large numbers and filter by range
-    all_numbers = re.findall(r"\b\d{5,7}\b", cleaned_text)
-    valid_salaries = [int(n) for n in all_numbers if 10000 <= int(n) <= 10000000]
-    
-    if valid_salaries:
-        salary = float(max(valid_salaries))
-        logger.info(f"Found salary {salary} via fallback number extraction")
-        return salary
-    
-    logger.warning("Could not extract salary from text")
-    return None
+    parser = SalarySlipParser(net_pay_labels=keywords) if keywords else salary_slip_parser
+    slip = parser.parse(text)
+    if slip.salary is None:
+        logger.warning("Could not extract salary from text")
+    else:
+        logger.info(f"Found salary {slip.salary:.0f} from {slip.salary_source}")
+    return slip.salary
 
 
-def extract_salary(file_path: Path) -> Optional[float]:
+def extract_salary_details(file_path: Path) -> Optional[Dict[str, any]]:
     """
-    Main extraction function - supports PDF and image files.
-    
-    Workflow:
-    1. Determine file type
-    2. Extract text (native parsing for PDF, OCR for images)
-    3. Parse salary from text
-    4. Validate result
-    
-    Args:
-        file_path: Path to salary slip file
+    Extract text and salary from a salary slip.
     
     Returns:
-        Extracted salary amount or None if extraction fails
+        Dictionary with source, raw_text, salary, confidence and the
+        structured SalarySlip fields (slip), or None if the file could not be read
     """
     if not file_path.exists():
         logger.error(f"File not found: {file_path}")
         return None
     
     suffix = file_path.suffix.lower()
-    salary_data = None
-    
-    # Step 1: Extract text based on file type
     if suffix == ".pdf":
         salary_data = extract_salary_from_pdf(file_path)
     elif suffix in [".jpg", ".jpeg", ".png"]:
@@ -164,9 +191,34 @@ def extract_salary(file_path: Path) -> Optional[float]:
     if not salary_data:
         return None
     
-    # Step 2: Parse salary from extracted text
-    salary = parse_salary_from_text(salary_data["raw_text"])
+    slip = salary_slip_parser.parse(salary_data["raw_text"])
+    salary_data["salary"] = slip.salary
+    salary_data["confidence"] = slip.confidence.get("salary", 0.0)
+    salary_data["slip"] = slip.model_dump()
+    return salary_data
+
+
+def extract_salary(file_path: Path) -> Optional[float]:
+    """
+    Main extraction function - supports PDF and image files.
+    
+    Workflow:
+    1. Determine file type
+    2. Extract text (native parsing for PDF, OCR for images)
+    3. Parse salary from text
+    4. Validate result
+    
+    Args:
+        file_path: Path to salary slip file
+    
+    Returns:
+        Extracted salary amount or None if extraction fails
+    """
+    salary_data = extract_salary_details(file_path)
+    if not salary_data:
+        return None
     
+    salary = salary_data["salary"]
     if salary:
         logger.info(f"Successfully extracted salary ₹{salary:,.0f} from {file_path.name}")
         return salary
@@ -186,6 +238,8 @@ def validate_salary_slip(file_path: Path) -> Dict[str, any]:
         "file": file_path.name,
         "valid": False,
         "salary": None,
+        "confidence": 0.0,
+        "slip": None,
         "errors": []
     }
     
@@ -201,11 +255,16 @@ def validate_salary_slip(file_path: Path) -> Dict[str, any]:
     
     # Try to extract salary
     try:
-        salary = extract_salary(file_path)
-        if salary:
-            result["salary"] = salary
+        salary_data = extract_salary_details(file_path)
+        if salary_data is None:
+            result["errors"].append("Could not read file")
+        elif salary_data["salary"]:
+            result["salary"] = salary_data["salary"]
+            result["confidence"] = salary_data["confidence"]
+            result["slip"] = salary_data["slip"]
             result["valid"] = True
         else:
+            result["slip"] = salary_data["slip"]
             result["errors"].append("Could not extract valid salary from file")
     except Exception as e:
         result["errors"].append(f"Error processing file: {str(e)}")
@@ -0,0 +1,86 @@
+"""
+Repayment Schedule Export Module
+Streams amortization schedules for sessions as CSV, JSON or NDJSON.
+
+Every exporter is a generator over iter_amortization_schedule, so a single
+240-month schedule or a bulk export over thousands of sessions is produced
+piece by piece and never held in memory as a whole document.
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from utils.emi import iter_amortization_schedule
+
+SCHEDULE_COLUMNS = ("month", "emi", "interest", "principal", "balance")
+EXPORT_FORMATS = ("csv", "json")
+
+
+def loan_terms(state: Dict) -> Optional[Tuple[float, float, int]]:
+    """
+    (principal, annual_rate, tenure_months) from a session, or None while the
+    sales conversation has not settled amount, rate and tenure yet.
+    """
+    principal = state.get("requested_loan_amount")
+    rate = state.get("negotiated_interest_rate")
+    tenure = state.get("requested_tenure")
+    if not principal or rate is None or not tenure:
+        return None
+    return float(principal), float(rate), int(tenure)
+
+
+def _csv_row(values) -> str:
+    return ",".join(f"{value:.2f}" if isinstance(value, float) else str(value) for value in values) + "\n"
+
+
+def iter_schedule_csv(principal: float, annual_rate: float, tenure_months: int) -> Iterator[str]:
+    """CSV header, then one line per month."""
+    yield ",".join(SCHEDULE_COLUMNS) + "\n"
+    for row in iter_amortization_schedule(principal, annual_rate, tenure_months):
+        yield _csv_row(row[column] for column in SCHEDULE_COLUMNS)
+
+
+def iter_schedule_json(principal: float, annual_rate: float, tenure_months: int,
+                       session_id: Optional[str] = None) -> Iterator[str]:
+    """
+    One JSON document written incrementally:
+    {"session_id", "principal", "annual_rate", "tenure_months", "schedule": [...]}
+    """
+    head = {"session_id": session_id} if session_id else {}
+    head.update({"principal": principal, "annual_rate": annual_rate, "tenure_months": tenure_months})
+    yield json.dumps(head)[:-1] + ', "schedule": ['
+    separator = ""
+    for row in iter_amortization_schedule(principal, annual_rate, tenure_months):
+        yield separator + json.dumps(row)
+        separator = ", "
+    yield "]}\n"
+
+
+def iter_bulk_csv(terms: Iterable[Tuple[str, Tuple[float, float, int]]]) -> Iterator[str]:
+    """
+    One CSV over many sessions with a leading session_id column.
+    Yields one chunk per session (at most a few hundred lines).
+    """
+    yield "session_id," + ",".join(SCHEDULE_COLUMNS) + "\n"
+    for session_id, (principal, annual_rate, tenure_months) in terms:
+        yield "".join(
+            f"{session_id}," + _csv_row(row[column] for column in SCHEDULE_COLUMNS)
+            for row in iter_amortization_schedule(principal, annual_rate, tenure_months)
+        )
+
+
+def iter_bulk_ndjson(terms: Iterable[Tuple[str, Tuple[float, float, int]]]) -> Iterator[str]:
+    """One JSON document per session per line (NDJSON)."""
+    for session_id, (principal, annual_rate, tenure_months) in terms:
+        yield "".join(iter_schedule_json(principal, annual_rate, tenure_months, session_id=session_id))
+
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "SCHEDULE_COLUMNS",
+    "iter_bulk_csv",
+    "iter_bulk_ndjson",
+    "iter_schedule_csv",
+    "iter_schedule_json",
+    "loan_terms",
+]
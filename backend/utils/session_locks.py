@@ -0,0 +1,115 @@
+"""
+Session Locks Module
+Serializes conversation turns within a session while sessions run in parallel.
+
+Every endpoint that reads and writes back a session's AgentState holds that
+session's lock for the whole turn; the workflow itself runs in the threadpool,
+so other sessions keep being served meanwhile.
+
+- Keyed asyncio locks, created on first use and dropped when the last holder
+  or waiter leaves, so idle sessions cost nothing.
+- Bounded queue: at most max_waiters requests wait behind the running turn;
+  more raise SessionBusy (HTTP 429), as does waiting longer than timeout.
+- Lock waits are recorded (bounded sample) for p50/p95/max reporting.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+
+class SessionBusy(Exception):
+    """Too many requests queued on the session, or the wait timed out."""
+
+
+class SessionLocks:
+    """
+    Per-session asyncio locks with bounded waiters and wait metrics.
+    Used from the event loop only.
+    """
+
+    def __init__(self, max_waiters: int = 4, timeout: float = 30.0, keep_samples: int = 2048) -> None:
+        self.max_waiters = max_waiters
+        self.timeout = timeout
+        self._entries: Dict[str, Dict] = {}
+        self._waits_ms = deque(maxlen=keep_samples)
+        self.counters = {"acquired": 0, "contended": 0, "rejected": 0, "timeout": 0}
+        self.max_queue_depth = 0
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Hold the session's lock for the duration of the block.
+
+        Raises:
+            SessionBusy: max_waiters already queued, or not acquired within timeout
+        """
+        entry = self._entries.get(session_id)
+        if entry is None:
+            entry = self._entries[session_id] = {"lock": asyncio.Lock(), "users": 0}
+        # users = the running turn plus everything queued behind it
+        if entry["users"] > self.max_waiters:
+            self.counters["rejected"] += 1
+            raise SessionBusy(f"{entry['users'] - 1} requests already waiting on this session "
+                              f"(limit {self.max_waiters})")
+
+        entry["users"] += 1
+        self.max_queue_depth = max(self.max_queue_depth, entry["users"] - 1)
+        start = time.perf_counter()
+        try:
+            if entry["lock"].locked():
+                self.counters["contended"] += 1
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await entry["lock"].acquire()
+            except TimeoutError:
+                self.counters["timeout"] += 1
+                raise SessionBusy(f"Session busy for more than {self.timeout:g}s")
+            self.counters["acquired"] += 1
+            self._waits_ms.append((time.perf_counter() - start) * 1000)
+            try:
+                yield
+            finally:
+                entry["lock"].release()
+        finally:
+            entry["users"] -= 1
+            if entry["users"] == 0 and self._entries.get(session_id) is entry:
+                del self._entries[session_id]
+
+    def statistics(self) -> Dict:
+        """Outcome counters, queue depth and lock wait percentiles."""
+        waits = sorted(self._waits_ms)
+
+        def percentile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 3) if waits else 0.0
+
+        return {
+            "active_sessions": len(self._entries),
+            "queued": sum(max(entry["users"] - 1, 0) for entry in self._entries.values()),
+            "max_waiters": self.max_waiters,
+            "max_queue_depth": self.max_queue_depth,
+            **self.counters,
+            "wait_ms": {
+                "samples": len(waits),
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+
+session_locks = SessionLocks(
+    max_waiters=int(os.getenv("CREDSAATHI_SESSION_MAX_WAITERS", "4")),
+    timeout=float(os.getenv("CREDSAATHI_SESSION_LOCK_TIMEOUT", "30")),
+)
+
+
+__all__ = [
+    "SessionBusy",
+    "SessionLocks",
+    "session_locks",
+]
@@ -0,0 +1,175 @@
+"""
+Shadow Policy Evaluation Module
+Re-decides live underwriting and fraud decisions with candidate policies
+(data/policies/candidates/*.json) on a background thread.
+
+Agents only enqueue the decision inputs: submit() never blocks, and when the
+bounded queue is full the sample is dropped and counted instead of slowing
+down /chat. Disagreements are logged with reason codes, and per-candidate
+agreement counters are exposed for monitoring.
+"""
+
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.policy import CompiledPolicy, PolicyError, load_policy
+from utils.underwriting import evaluate_underwriting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CANDIDATES_DIR = Path(__file__).parent.parent / "data" / "policies" / "candidates"
+
+
+class ShadowEvaluator:
+    """
+    Bounded background queue that replays live decisions against candidate policies.
+    """
+
+    def __init__(self, candidates_dir: Path, max_queue: int = 1000, recent_disagreements: int = 100) -> None:
+        self.candidates_dir = Path(candidates_dir)
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        self._candidates: List[CompiledPolicy] = []
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._recent = deque(maxlen=recent_disagreements)
+        self._stats_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.submitted = 0
+        self.shed = 0
+        self.reload_candidates()
+
+    def reload_candidates(self) -> int:
+        """
+        Load every candidate policy file. Broken files are skipped with a warning.
+
+        Returns:
+            Number of active candidates
+        """
+        candidates = []
+        if self.candidates_dir.is_dir():
+            for path in sorted(self.candidates_dir.glob("*.json")):
+                try:
+                    candidates.append(load_policy(path))
+                except (OSError, PolicyError) as e:
+                    logger.warning(f"Skipping shadow policy {path.name}: {e}")
+        # Single assignment - the worker picks up the new list on its next sample
+        self._candidates = candidates
+        return len(candidates)
+
+    def submit(self, stage: str, inputs: Dict, live: Dict) -> bool:
+        """
+        Queue a live decision for shadow evaluation without blocking.
+
+        Args:
+            stage: "underwriting" or "fraud"
+            inputs: Decision inputs (see _evaluate)
+            live: Live decision with loan_status (and reason_code for underwriting)
+
+        Returns:
+            False if no candidates are configured or the sample was shed
+        """
+        if not self._candidates:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait({"stage": stage, "inputs": inputs, "live": live})
+        except queue.Full:
+            with self._stats_lock:
+                self.shed += 1
+            return False
+        with self._stats_lock:
+            self.submitted += 1
+        return True
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="shadow-policy", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            sample = self._queue.get()
+            try:
+                for candidate in self._candidates:
+                    self._compare(candidate, sample)
+            except Exception as e:
+                logger.error(f"Shadow evaluation failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _evaluate(candidate: CompiledPolicy, stage: str, inputs: Dict) -> Dict:
+        if stage == "underwriting":
+            decision = evaluate_underwriting(**inputs, policy=candidate)
+            return {"loan_status": decision["loan_status"], "reason_code": decision["reason_code"]}
+        if stage == "fraud":
+            route = candidate.fraud_route(inputs["fraud_risk_score"])
+            return {
+                "loan_status": candidate.fraud_status(inputs["fraud_risk_score"], inputs["loan_status"]),
+                "reason_code": f"FRAUD_{route.upper()}",
+            }
+        raise ValueError(f"Unknown shadow stage: {stage}")
+
+    def _compare(self, candidate: CompiledPolicy, sample: Dict) -> None:
+        stage, live = sample["stage"], sample["live"]
+        shadow = self._evaluate(candidate, stage, sample["inputs"])
+        agreed = shadow["loan_status"] == live["loan_status"]
+
+        key = f"{candidate.version}:{stage}"
+        with self._stats_lock:
+            counters = self._counters.setdefault(key, {"evaluated": 0, "agreed": 0, "disagreed": 0})
+            counters["evaluated"] += 1
+            counters["agreed" if agreed else "disagreed"] += 1
+            if not agreed:
+                self._recent.append({
+                    "candidate": candidate.version,
+                    "stage": stage,
+                    "live_status": live["loan_status"],
+                    "live_reason_code": live.get("reason_code"),
+                    "shadow_status": shadow["loan_status"],
+                    "shadow_reason_code": shadow["reason_code"],
+                })
+
+        if not agreed:
+            logger.info(
+                f"Shadow disagreement [{candidate.version}/{stage}]: "
+                f"live={live['loan_status']} ({live.get('reason_code')}) "
+                f"shadow={shadow['loan_status']} ({shadow['reason_code']})"
+            )
+
+    def statistics(self) -> Dict:
+        """Agreement-rate counters per candidate and stage, plus queue health."""
+        with self._stats_lock:
+            candidates = {
+                key: {
+                    **counters,
+                    "agreement_rate": counters["agreed"] / counters["evaluated"] if counters["evaluated"] else None,
+                }
+                for key, counters in self._counters.items()
+            }
+            recent = list(self._recent)
+        return {
+            "candidates": [candidate.version for candidate in self._candidates],
+            "submitted": self.submitted,
+            "shed": self.shed,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "agreement": candidates,
+            "recent_disagreements": recent,
+        }
+
+
+shadow_evaluator = ShadowEvaluator(
+    Path(os.getenv("CREDSAATHI_SHADOW_POLICY_DIR", DEFAULT_CANDIDATES_DIR))
+)
+
+
+__all__ = ["ShadowEvaluator", "shadow_evaluator"]
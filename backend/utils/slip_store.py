@@ -0,0 +1,216 @@
+"""
+Salary Slip Store Module
+Content-addressed storage for uploaded salary slips.
+
+Uploads are hashed (SHA-256) while they are streamed to disk and stored once
+under objects/<aa>/<bb>/<hash><ext>, so a re-upload of the same document costs
+one hash and no extra disk. Extraction results (text, salary, confidence) are
+cached per hash and extractor version (utils.scanpdf.EXTRACTOR_VERSION), so
+repeat uploads skip PDF parsing and OCR entirely, and a parser change never
+serves results the old parser produced. The in-memory copy is an LRU of
+RESULT_CACHE_SIZE entries; the rest are read back from disk.
+
+Each hash also remembers which customers submitted it; the Fraud agent uses
+that to flag one slip being reused across applicants. The customer links are
+kept in an append-only JSONL log and replayed on startup.
+
+Object mtimes record the last upload; the retention job (collect_garbage,
+data/scripts/gc_storage.py) deletes slips and cached results older than the
+retention period. Customer links are kept, so reuse is still detected after
+the file itself is gone.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Set, Tuple
+
+from utils.letter_store import iter_object_files, remove_empty_shards
+
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / "data" / "uploaded_salary_slips"
+
+# Days an uploaded slip is kept after its last upload
+SLIP_RETENTION_DAYS = float(os.getenv("CREDSAATHI_SLIP_RETENTION_DAYS", "180"))
+
+# Extraction results kept in memory (least recently used are dropped)
+RESULT_CACHE_SIZE = int(os.getenv("CREDSAATHI_SLIP_RESULT_CACHE", "1024"))
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class SlipStore:
+    """
+    Content-addressed salary slip files, extraction cache and hash → customers map.
+    """
+
+    def __init__(self, root: Path, result_cache_size: int = RESULT_CACHE_SIZE) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.results_dir = self.root / "results"
+        self.customers_log = self.root / "customers.jsonl"
+        self.result_cache_size = result_cache_size
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._customers: Dict[str, Set[str]] = {}
+        self._load_customers()
+
+    def _load_customers(self) -> None:
+        if not self.customers_log.exists():
+            return
+        with self.customers_log.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._customers.setdefault(event["sha256"], set()).add(event["customer"])
+
+    def _object_path(self, digest: str, suffix: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:4] / f"{digest}{suffix.lower()}"
+
+    def save_stream(self, stream: BinaryIO, suffix: str) -> Tuple[str, Path, int, bool]:
+        """
+        Copy an upload to the store, hashing it on the way.
+
+        Args:
+            stream: Readable binary file object (e.g. UploadFile.file)
+            suffix: Original file extension (".pdf", ".png", ...)
+
+        Returns:
+            (sha256 hex digest, stored path, size in bytes, True if the content was new)
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+
+            digest = sha.hexdigest()
+            path = self._object_path(digest, suffix)
+            if path.exists():
+                os.utime(path)
+                return digest, path, size, False
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, path)
+            tmp_name = None
+            return digest, path, size, True
+        finally:
+            if tmp_name is not None:
+                os.unlink(tmp_name)
+
+    def _result_path(self, digest: str, version: str) -> Path:
+        return self.results_dir / digest[:2] / f"{digest}.v{version}.json"
+
+    def _remember_result(self, key: Tuple[str, str], result: Dict) -> None:
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+
+    def get_result(self, digest: str, version: str) -> Optional[Dict]:
+        """Cached extraction result for a document hash and extractor version, if any."""
+        key = (digest, version)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+        try:
+            with self._result_path(digest, version).open("r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        self._remember_result(key, result)
+        return result
+
+    def put_result(self, digest: str, version: str, result: Dict) -> None:
+        """Cache an extraction result (memory and disk)."""
+        self._remember_result((digest, version), result)
+        path = self._result_path(digest, version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+    def record_customer(self, digest: str, customer: str) -> int:
+        """
+        Link a document hash to the customer who uploaded it.
+
+        Returns:
+            Number of other customers who submitted the same document
+        """
+        with self._lock:
+            customers = self._customers.setdefault(digest, set())
+            if customer not in customers:
+                customers.add(customer)
+                self.root.mkdir(parents=True, exist_ok=True)
+                with self.customers_log.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps({"sha256": digest, "customer": customer}) + "\n")
+            return len(customers) - 1
+
+    def other_customers(self, digest: str, customer: str) -> int:
+        """How many customers other than this one submitted the document."""
+        customers = self._customers.get(digest, ())
+        return len(customers) - (customer in customers)
+
+    def collect_garbage(self, max_age_days: float = SLIP_RETENTION_DAYS, dry_run: bool = False,
+                        now: Optional[float] = None) -> Dict:
+        """
+        Delete slips not uploaded again for max_age_days and their cached results.
+
+        Returns:
+            Counts and bytes of kept and deleted files
+        """
+        cutoff = (now or time.time()) - max_age_days * 86400
+        stats = {"kept": 0, "deleted": 0, "deleted_bytes": 0, "results_deleted": 0}
+        for entry in iter_object_files(self.objects_dir):
+            st = entry.stat()
+            if st.st_mtime >= cutoff:
+                stats["kept"] += 1
+                continue
+            stats["deleted"] += 1
+            stats["deleted_bytes"] += st.st_size
+            digest = entry.name.split(".", 1)[0]
+            # Results of every extractor version for this document
+            result_paths = list((self.results_dir / digest[:2]).glob(f"{digest}.*json"))
+            stats["results_deleted"] += len(result_paths)
+            if not dry_run:
+                os.unlink(entry.path)
+                for result_path in result_paths:
+                    result_path.unlink(missing_ok=True)
+                with self._lock:
+                    for key in [key for key in self._results if key[0] == digest]:
+                        del self._results[key]
+        if not dry_run:
+            remove_empty_shards(self.objects_dir)
+        return stats
+
+    def statistics(self) -> Dict:
+        with self._lock:
+            shared = sum(1 for customers in self._customers.values() if len(customers) > 1)
+            return {
+                "documents": len(self._customers),
+                "shared_documents": shared,
+                "cached_results": len(self._results),
+            }
+
+
+slip_store = SlipStore(Path(os.getenv("CREDSAATHI_SLIP_STORE_DIR", DEFAULT_STORE_DIR)))
+
+
+__all__ = ["RESULT_CACHE_SIZE", "SLIP_RETENTION_DAYS", "SlipStore", "slip_store"]
@@ -0,0 +1,217 @@
+"""
+Underwriting Rules Module
+Deterministic credit policy shared by the Underwriting agent and batch re-scoring.
+No LLM calls - narration of the decision is left to the agent.
+
+evaluate_underwriting() decides one application; evaluate_underwriting_batch()
+applies the same rules to NumPy arrays of applicants for portfolio what-if analysis.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.policy import CompiledPolicy, policy_store
+
+# Integer codes used by the vectorized engine (index into these tuples)
+LOAN_STATUSES = ("approved", "rejected", "awaiting_salary_slip")
+REASON_CODES = (
+    "LOW_CREDIT_SCORE",
+    "INSTANT_APPROVAL",
+    "EXCEEDS_MAX_LIMIT",
+    "SALARY_SLIP_REQUIRED",
+    "APPROVED_WITH_SALARY",
+    "EMI_EXCEEDS_LIMIT",
+)
+STATUS_BY_REASON = {
+    "LOW_CREDIT_SCORE": "rejected",
+    "INSTANT_APPROVAL": "approved",
+    "EXCEEDS_MAX_LIMIT": "rejected",
+    "SALARY_SLIP_REQUIRED": "awaiting_salary_slip",
+    "APPROVED_WITH_SALARY": "approved",
+    "EMI_EXCEEDS_LIMIT": "rejected",
+}
+
+
+def evaluate_underwriting(
+    credit_score: Optional[int],
+    requested_loan_amount: float,
+    pre_approved_limit: float,
+    salary_slip_uploaded: bool = False,
+    monthly_salary: Optional[float] = None,
+    calculated_emi: Optional[float] = None,
+    policy: Optional[CompiledPolicy] = None,
+) -> Dict:
+    """
+    Apply the underwriting business rules to one application.
+
+    Business Rules (thresholds from the active policy, defaults shown):
+    1. Credit score must be >= 700 (reject if less)
+    2. If loan amount <= pre-approved limit → Instant approval
+    3. If loan amount <= 2x pre-approved limit → Need salary slip
+       - Approve only if EMI <= 50% of monthly salary
+    4. If loan amount > 2x pre-approved limit → Reject
+
+    Returns:
+        Dictionary with loan_status, reason_code, rejection_reason,
+        loan_ratio, emi_ratio and salary_slip_required
+    """
+    policy = policy or policy_store.current()
+    reason_code, loan_ratio, emi_ratio = policy.decide_underwriting(
+        credit_score,
+        requested_loan_amount,
+        pre_approved_limit,
+        bool(salary_slip_uploaded and monthly_salary),
+        calculated_emi,
+        monthly_salary,
+    )
+
+    rejection_reason = None
+    if reason_code == "LOW_CREDIT_SCORE":
+        rejection_reason = f"Credit score ({credit_score}/900) is below minimum requirement of {policy.min_credit_score:.0f}"
+    elif reason_code == "EXCEEDS_MAX_LIMIT":
+        rejection_reason = f"Requested amount (₹{requested_loan_amount:,.0f}) exceeds {policy.max_loan_ratio:g}x pre-approved limit (₹{pre_approved_limit * policy.max_loan_ratio:,.0f})"
+    elif reason_code == "EMI_EXCEEDS_LIMIT":
+        rejection_reason = f"Monthly EMI (₹{calculated_emi:,.0f}) exceeds {policy.max_emi_ratio:g}% of your salary (₹{monthly_salary:,.0f})"
+
+    return {
+        "loan_status": STATUS_BY_REASON[reason_code],
+        "reason_code": reason_code,
+        "rejection_reason": rejection_reason,
+        "loan_ratio": loan_ratio,
+        "emi_ratio": emi_ratio,
+        "salary_slip_required": reason_code in ("SALARY_SLIP_REQUIRED", "APPROVED_WITH_SALARY", "EMI_EXCEEDS_LIMIT"),
+        "policy_version": policy.version,
+    }
+
+
+def evaluate_underwriting_batch(
+    credit_score,
+    requested_loan_amount,
+    pre_approved_limit,
+    salary_slip_uploaded=None,
+    monthly_salary=None,
+    calculated_emi=None,
+    policy: Optional[CompiledPolicy] = None,
+    min_credit_score: Optional[float] = None,
+    instant_approval_ratio: Optional[float] = None,
+    max_loan_ratio: Optional[float] = None,
+    max_emi_ratio: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Apply the underwriting rules to whole arrays of applicants in one vectorized pass.
+    Same rule order and arithmetic as evaluate_underwriting(); thresholds default to
+    the policy and can be overridden individually for what-if sweeps.
+    
+    Args:
+        credit_score: Credit scores (NaN or 0 for missing)
+        requested_loan_amount: Requested amounts
+        pre_approved_limit: Pre-approved limits
+        salary_slip_uploaded: Booleans (default: none uploaded)
+        monthly_salary: Salaries (NaN or 0 for missing)
+        calculated_emi: EMIs (NaN for missing)
+    
+    Returns:
+        Dictionary of arrays: loan_status (index into LOAN_STATUSES),
+        reason_code (index into REASON_CODES), loan_ratio and emi_ratio
+        (NaN where the rule did not need them, matching None in the scalar path)
+    """
+    policy = policy or policy_store.current()
+    if min_credit_score is None:
+        min_credit_score = policy.min_credit_score
+    if instant_approval_ratio is None:
+        instant_approval_ratio = policy.instant_approval_ratio
+    if max_loan_ratio is None:
+        max_loan_ratio = policy.max_loan_ratio
+    if max_emi_ratio is None:
+        max_emi_ratio = policy.max_emi_ratio
+
+    score = np.nan_to_num(np.asarray(credit_score, dtype=np.float64), nan=0.0)
+    amount = np.asarray(requested_loan_amount, dtype=np.float64)
+    limit = np.asarray(pre_approved_limit, dtype=np.float64)
+    n = np.broadcast(score, amount, limit).shape
+
+    if salary_slip_uploaded is None:
+        uploaded = np.zeros(n, dtype=bool)
+    else:
+        uploaded = np.asarray(salary_slip_uploaded, dtype=bool)
+    salary = np.full(n, np.nan) if monthly_salary is None else np.asarray(monthly_salary, dtype=np.float64)
+    emi = np.full(n, np.nan) if calculated_emi is None else np.asarray(calculated_emi, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loan_ratio = amount / limit
+        emi_ratio = (emi / salary) * 100
+
+    low_score = ~(score >= min_credit_score)
+    instant = ~low_score & (loan_ratio <= instant_approval_ratio)
+    over_limit = ~low_score & ~instant & (loan_ratio > max_loan_ratio)
+    slip_band = ~low_score & ~instant & ~over_limit
+    has_salary = uploaded & (np.nan_to_num(salary) != 0)
+    awaiting = slip_band & ~has_salary
+    affordable = slip_band & has_salary & (emi_ratio <= max_emi_ratio)
+    unaffordable = slip_band & has_salary & ~(emi_ratio <= max_emi_ratio)
+
+    reason_code = np.select(
+        [low_score, instant, over_limit, awaiting, affordable, unaffordable],
+        np.arange(len(REASON_CODES)),
+    ).astype(np.int8)
+    # Reason code → status: approved, rejected, awaiting_salary_slip
+    status_by_reason = np.array([1, 0, 1, 2, 0, 1], dtype=np.int8)
+
+    return {
+        "loan_status": status_by_reason[reason_code],
+        "reason_code": reason_code,
+        "loan_ratio": np.where(low_score, np.nan, loan_ratio),
+        "emi_ratio": np.where(affordable | unaffordable, emi_ratio, np.nan),
+    }
+
+
+def compare_with_scalar(batch_inputs: Dict[str, np.ndarray], batch_result: Dict[str, np.ndarray],
+                        policy: Optional[CompiledPolicy] = None) -> int:
+    """
+    Re-run every applicant through evaluate_underwriting() and count disagreements
+    with the vectorized result. Used to verify the engine against the scalar path
+    (both must use the same policy).
+    
+    Returns:
+        Number of applicants whose status, reason code or ratios differ
+    """
+    def value(name, i):
+        array = batch_inputs.get(name)
+        if array is None:
+            return None
+        item = array[i].item()
+        return None if isinstance(item, float) and np.isnan(item) else item
+
+    mismatches = 0
+    for i in range(len(batch_result["reason_code"])):
+        decision = evaluate_underwriting(
+            credit_score=value("credit_score", i),
+            requested_loan_amount=value("requested_loan_amount", i),
+            pre_approved_limit=value("pre_approved_limit", i),
+            salary_slip_uploaded=bool(value("salary_slip_uploaded", i)),
+            monthly_salary=value("monthly_salary", i),
+            calculated_emi=value("calculated_emi", i),
+            policy=policy,
+        )
+        same = (
+            decision["loan_status"] == LOAN_STATUSES[batch_result["loan_status"][i]]
+            and decision["reason_code"] == REASON_CODES[batch_result["reason_code"][i]]
+        )
+        for ratio in ("loan_ratio", "emi_ratio"):
+            batch_value = batch_result[ratio][i].item()
+            if decision[ratio] is None:
+                same = same and np.isnan(batch_value)
+            else:
+                same = same and decision[ratio] == batch_value
+        mismatches += not same
+    return mismatches
+
+
+__all__ = [
+    "evaluate_underwriting",
+    "evaluate_underwriting_batch",
+    "compare_with_scalar",
+    "LOAN_STATUSES",
+    "REASON_CODES",
+]